@@ -0,0 +1,104 @@
+"""
+Speekium 音频缓冲区
+为 sounddevice 输入回调提供预分配的 float32 缓冲区，避免每个音频块都分配内存
+"""
+
+import numpy as np
+
+
+class AudioBuffer:
+    """预分配的单声道录音缓冲区（写游标 + 固定容量）"""
+
+    def __init__(self, max_samples: int):
+        """
+        Args:
+            max_samples: 最大采样点数（超出部分会被丢弃）
+        """
+        self._data = np.empty(max_samples, dtype=np.float32)
+        self._pos = 0
+
+    def __len__(self) -> int:
+        return self._pos
+
+    @property
+    def capacity(self) -> int:
+        """缓冲区容量（采样点数）"""
+        return len(self._data)
+
+    @property
+    def is_full(self) -> bool:
+        """缓冲区是否已写满"""
+        return self._pos >= len(self._data)
+
+    def clear(self):
+        """重置写游标（不释放内存，便于复用）"""
+        self._pos = 0
+
+    def write(self, chunk: np.ndarray) -> int:
+        """
+        写入一个音频块（可在音频回调线程中调用，不分配内存）
+
+        Args:
+            chunk: 一维音频数据（可以是 indata[:, 0] 这样的视图）
+
+        Returns:
+            实际写入的采样点数
+        """
+        n = min(len(chunk), len(self._data) - self._pos)
+        if n > 0:
+            self._data[self._pos : self._pos + n] = chunk[:n]
+            self._pos += n
+        return n
+
+    def view(self) -> np.ndarray:
+        """已写入数据的视图（不复制，缓冲区复用后内容会变化）"""
+        return self._data[: self._pos]
+
+    def to_array(self) -> np.ndarray:
+        """已写入数据的独立副本"""
+        return self._data[: self._pos].copy()
+
+
+class ChunkRing:
+    """单生产者/单消费者的定长音频块环形队列
+
+    音频回调线程只做 push（拷贝进预分配槽位），VAD 推理等耗时处理
+    放在消费线程里用 pop_into 取出，避免在实时音频线程中执行 Python 重活。
+    """
+
+    def __init__(self, num_chunks: int, chunk_size: int):
+        """
+        Args:
+            num_chunks: 槽位数量（消费者落后超过该数量时丢弃最旧的块）
+            chunk_size: 每个音频块的采样点数
+        """
+        self._slots = np.empty((num_chunks, chunk_size), dtype=np.float32)
+        # 只有生产者写 _written，只有消费者写 _read（单个 int 赋值在 GIL 下是原子的）
+        self._written = 0
+        self._read = 0
+
+    def __len__(self) -> int:
+        """待消费的块数"""
+        return min(self._written - self._read, len(self._slots))
+
+    def push(self, chunk: np.ndarray):
+        """写入一个音频块（在音频回调线程中调用，不分配内存）"""
+        self._slots[self._written % len(self._slots)] = chunk
+        self._written += 1
+
+    def pop_into(self, out: np.ndarray) -> bool:
+        """
+        取出最旧的待消费块，拷贝到 out
+
+        Returns:
+            是否取到了数据
+        """
+        written = self._written
+        if written == self._read:
+            return False
+        # 消费者落后太多：跳过已被覆盖的块
+        if written - self._read > len(self._slots):
+            self._read = written - len(self._slots)
+        np.copyto(out, self._slots[self._read % len(self._slots)])
+        self._read += 1
+        return True
@@ -24,6 +24,69 @@ BLOCKED_PATTERNS = [
 ]
 
 
+# Streaming: sentence segmentation for LLM -> TTS pipelining
+# CJK terminators and newlines end a sentence immediately; Latin terminators
+# only when followed by whitespace (so "3.5" and "example.com" stay intact)
+SENTENCE_END_PATTERN = re.compile(r"[。！？\n]|[.!?](?=\s)")
+MIN_SENTENCE_LENGTH = 10  # Shorter fragments are merged with the next sentence
+MAX_SENTENCE_LENGTH = 80  # Upper bound for the growing merge target (progressive chunking)
+ABBREVIATIONS = frozenset({"mr", "mrs", "ms", "dr", "st", "vs", "etc", "e.g", "i.e"})
+
+
+class SentenceBuffer:
+    """Accumulate streamed LLM tokens and emit complete sentences for TTS
+
+    With max_length set, chunking is progressive: the first chunk is emitted as
+    soon as it reaches min_length (fast first audio), then the merge target
+    doubles after each emit up to max_length, so later sentences are grouped
+    into fewer, longer TTS requests.
+    """
+
+    def __init__(self, min_length: int = MIN_SENTENCE_LENGTH, max_length: int | None = None):
+        self.min_length = min_length
+        self.max_length = max_length
+        self.target_length = min_length
+        self.buffer = ""
+        self._scan_pos = 0  # Where the next terminator search resumes
+
+    def _is_abbreviation(self, start: int, end: int) -> bool:
+        """Check whether the period ending at `end` belongs to an abbreviation"""
+        if self.buffer[end - 1] != ".":
+            return False
+        words = self.buffer[start : end - 1].split()
+        return bool(words) and words[-1].lower() in ABBREVIATIONS
+
+    def feed(self, text: str) -> list[str]:
+        """Add streamed text, return the sentences completed by it"""
+        self.buffer += text
+        sentences = []
+        start = 0
+        for match in SENTENCE_END_PATTERN.finditer(self.buffer, self._scan_pos):
+            end = match.end()
+            if self._is_abbreviation(start, end):
+                continue
+            sentence = self.buffer[start:end].strip()
+            if len(sentence) < self.target_length:
+                continue
+            sentences.append(sentence)
+            start = end
+            if self.max_length is not None:
+                self.target_length = min(self.target_length * 2, self.max_length)
+        if start:
+            self.buffer = self.buffer[start:]
+        # Only scan new text next time; the last character is rescanned because
+        # a Latin terminator matches only once the following whitespace arrives
+        self._scan_pos = max(0, len(self.buffer) - 1)
+        return sentences
+
+    def flush(self) -> str:
+        """Return and clear whatever text is left in the buffer"""
+        rest = self.buffer.strip()
+        self.buffer = ""
+        self._scan_pos = 0
+        return rest
+
+
 def validate_input(text: str, max_length: int = MAX_INPUT_LENGTH) -> str:
     """
     Validate and sanitize user input
@@ -102,9 +165,80 @@ class LLMBackend(ABC):
         pass
 
 
+CLAUDE_STREAM_READ_LIMIT = 1 << 20  # stdout line limit; init/result frames can exceed 64 KB
+
+
 class ClaudeBackend(LLMBackend):
     """Claude Code CLI backend"""
 
+    def __init__(self, system_prompt: str, max_history: int = 10):
+        super().__init__(system_prompt, max_history)
+        # CLI process started ahead of the next turn (prompt is sent via stdin)
+        self._warm_process: asyncio.subprocess.Process | None = None
+        self._warm_loop: asyncio.AbstractEventLoop | None = None
+
+    def _stream_command(self) -> list[str]:
+        """CLI arguments for a streaming turn; the prompt itself is written to stdin"""
+        return [
+            "claude",
+            "-p",
+            "--dangerously-skip-permissions",
+            "--no-session-persistence",
+            "--system-prompt",
+            self.system_prompt,
+            "--input-format",
+            "stream-json",
+            "--output-format",
+            "stream-json",
+            "--include-partial-messages",
+            "--verbose",
+        ]
+
+    async def _spawn_stream_process(self) -> asyncio.subprocess.Process:
+        return await asyncio.create_subprocess_exec(
+            *self._stream_command(),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=CLAUDE_STREAM_READ_LIMIT,
+        )
+
+    async def prewarm(self):
+        """Start the CLI for the next turn now, so its startup is off the critical path"""
+        if self._warm_process is not None and self._warm_process.returncode is None:
+            return
+        try:
+            self._warm_process = await self._spawn_stream_process()
+            self._warm_loop = asyncio.get_running_loop()
+            logger.debug("claude_prewarmed", pid=self._warm_process.pid)
+        except OSError as e:
+            self._warm_process = None
+            logger.warning("claude_prewarm_failed", error=str(e))
+
+    async def _take_stream_process(self) -> asyncio.subprocess.Process:
+        """Hand out the prewarmed process if it is still usable, otherwise spawn one"""
+        process, self._warm_process = self._warm_process, None
+        if process is not None and process.returncode is None:
+            if self._warm_loop is asyncio.get_running_loop():
+                return process
+            # Spawned on another (finished) event loop: its pipes are unusable here
+            self._terminate(process)
+        return await self._spawn_stream_process()
+
+    @staticmethod
+    def _terminate(process: asyncio.subprocess.Process):
+        try:
+            process.terminate()
+        except ProcessLookupError:
+            pass  # Already exited
+
+    def close(self):
+        """Terminate the idle prewarmed CLI process, if any"""
+        process, self._warm_process = self._warm_process, None
+        if process is not None and process.returncode is None:
+            self._terminate(process)
+            logger.debug("claude_prewarm_closed", pid=process.pid)
+
     def chat(self, message: str) -> str:
         logger.info("llm_processing", backend="claude")
 
@@ -160,31 +294,24 @@ class ClaudeBackend(LLMBackend):
         else:
             full_message = message
 
-        cmd = [
-            "claude",
-            "-p",
-            full_message,
-            "--dangerously-skip-permissions",
-            "--no-session-persistence",
-            "--system-prompt",
-            self.system_prompt,
-            "--output-format",
-            "stream-json",
-            "--include-partial-messages",
-            "--verbose",
-        ]
-
-        process = await asyncio.create_subprocess_exec(
-            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-        )
+        process = await self._take_stream_process()
+        request = {
+            "type": "user",
+            "message": {"role": "user", "content": [{"type": "text", "text": full_message}]},
+        }
+        process.stdin.write((json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"))
+        await process.stdin.drain()
+        process.stdin.close()
 
-        buffer = ""
+        sentences = SentenceBuffer(max_length=MAX_SENTENCE_LENGTH)
         full_response = ""
-        sentence_endings = re.compile(r"([。！？\n])")
 
         async for line in process.stdout:
+            # Only text deltas matter here; skip init/assistant/result frames unparsed
+            if b"content_block_delta" not in line:
+                continue
             try:
-                data = json.loads(line.decode("utf-8"))
+                data = json.loads(line)  # json accepts UTF-8 bytes directly
 
                 if data.get("type") == "stream_event":
                     event = data.get("event", {})
@@ -192,30 +319,21 @@ class ClaudeBackend(LLMBackend):
                         delta = event.get("delta", {})
                         if delta.get("type") == "text_delta":
                             text = delta.get("text", "")
-                            buffer += text
                             full_response += text
 
-                            while True:
-                                match = sentence_endings.search(buffer)
-                                if match:
-                                    end_pos = match.end()
-                                    sentence = buffer[:end_pos].strip()
-                                    buffer = buffer[end_pos:]
-                                    if sentence:
-                                        logger.debug("sentence_generated", sentence=sentence)
-                                        yield sentence
-                                else:
-                                    break
+                            for sentence in sentences.feed(text):
+                                logger.debug("sentence_generated", sentence=sentence)
+                                yield sentence
             except json.JSONDecodeError:
                 continue
             except Exception as e:
                 logger.warning("parse_error", error=str(e))
                 continue
 
-        if buffer.strip():
-            logger.debug("buffer_output", text=buffer.strip())
-            full_response += buffer.strip()
-            yield buffer.strip()
+        rest = sentences.flush()
+        if rest:
+            logger.debug("buffer_output", text=rest)
+            yield rest
 
         await process.wait()
 
@@ -223,6 +341,9 @@ class ClaudeBackend(LLMBackend):
         self.add_message("user", message)
         self.add_message("assistant", full_response)
 
+        # Get the next turn's CLI process starting while the user listens
+        await self.prewarm()
+
 
 class OllamaBackend(LLMBackend):
     """Ollama backend for local LLMs"""
@@ -350,9 +471,8 @@ class OllamaBackend(LLMBackend):
             import httpx
 
             messages = self._build_messages(message)
-            buffer = ""
+            sentences = SentenceBuffer(max_length=MAX_SENTENCE_LENGTH)
             full_response = ""
-            sentence_endings = re.compile(r"([。！？\n])")
 
             async with (
                 httpx.AsyncClient() as client,
@@ -370,27 +490,18 @@ class OllamaBackend(LLMBackend):
                         data = json.loads(line)
                         content = data.get("message", {}).get("content", "")
                         if content:
-                            buffer += content
                             full_response += content
 
-                            while True:
-                                match = sentence_endings.search(buffer)
-                                if match:
-                                    end_pos = match.end()
-                                    sentence = buffer[:end_pos].strip()
-                                    buffer = buffer[end_pos:]
-                                    if sentence:
-                                        logger.debug("sentence_generated", sentence=sentence)
-                                        yield sentence
-                                else:
-                                    break
+                            for sentence in sentences.feed(content):
+                                logger.debug("sentence_generated", sentence=sentence)
+                                yield sentence
                     except json.JSONDecodeError:
                         continue
 
-            if buffer.strip():
-                logger.debug("buffer_output", text=buffer.strip())
-                full_response += buffer.strip()
-                yield buffer.strip()
+            rest = sentences.flush()
+            if rest:
+                logger.debug("buffer_output", text=rest)
+                yield rest
 
             # Save to history
             self.add_message("user", message)
@@ -486,9 +597,8 @@ class OpenAIBackend(LLMBackend):
             import httpx
 
             messages = self._build_messages(message)
-            buffer = ""
+            sentences = SentenceBuffer(max_length=MAX_SENTENCE_LENGTH)
             full_response = ""
-            sentence_endings = re.compile(r"([。！？\n])")
 
             payload = {
                 "model": self.model,
@@ -527,27 +637,18 @@ class OpenAIBackend(LLMBackend):
                         data = json.loads(data_str)
                         content = data["choices"][0]["delta"].get("content", "")
                         if content:
-                            buffer += content
                             full_response += content
 
-                            while True:
-                                match = sentence_endings.search(buffer)
-                                if match:
-                                    end_pos = match.end()
-                                    sentence = buffer[:end_pos].strip()
-                                    buffer = buffer[end_pos:]
-                                    if sentence:
-                                        logger.debug("sentence_generated", sentence=sentence)
-                                        yield sentence
-                                else:
-                                    break
+                            for sentence in sentences.feed(content):
+                                logger.debug("sentence_generated", sentence=sentence)
+                                yield sentence
                     except (json.JSONDecodeError, KeyError):
                         continue
 
-            if buffer.strip():
-                logger.debug("buffer_output", text=buffer.strip())
-                full_response += buffer.strip()
-                yield buffer.strip()
+            rest = sentences.flush()
+            if rest:
+                logger.debug("buffer_output", text=rest)
+                yield rest
 
             # Save to history
             self.add_message("user", message)
@@ -618,6 +719,155 @@ class ZhipuBackend(OpenAIBackend):
         super().__init__(system_prompt, api_key, base_url, model, max_history)
 
 
+ANTHROPIC_API_VERSION = "2023-06-01"  # Value for the anthropic-version request header
+
+
+class AnthropicBackend(LLMBackend):
+    """Anthropic Messages API backend - streams in-process over HTTP, no CLI subprocess"""
+
+    def __init__(
+        self,
+        system_prompt: str,
+        api_key: str,
+        model: str = "claude-haiku-4-5",
+        base_url: str = "https://api.anthropic.com/v1",
+        max_history: int = 10,
+        max_tokens: int = 1024,
+    ):
+        super().__init__(system_prompt, max_history)
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.max_tokens = max_tokens
+        # Reused across turns so the TLS connection stays warm
+        self._client = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+
+    def _headers(self) -> dict[str, str]:
+        return {
+            "x-api-key": self.api_key,
+            "anthropic-version": ANTHROPIC_API_VERSION,
+            "content-type": "application/json",
+        }
+
+    def _build_payload(self, message: str, stream: bool) -> dict:
+        return {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "system": self.system_prompt,
+            "messages": [*self.history, {"role": "user", "content": message}],
+            "stream": stream,
+        }
+
+    def _get_async_client(self):
+        """Return the shared AsyncClient for the running event loop"""
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(timeout=120)
+            self._client_loop = loop
+        return self._client
+
+    def chat(self, message: str) -> str:
+        logger.info("llm_processing", backend="anthropic", model=self.model)
+
+        # Security: Validate input
+        try:
+            message = validate_input(message)
+        except ValueError as e:
+            logger.warning("input_validation_failed", error=str(e))
+            return f"Error: {e}"
+
+        try:
+            import httpx
+
+            response = httpx.post(
+                f"{self.base_url}/messages",
+                json=self._build_payload(message, stream=False),
+                headers=self._headers(),
+                timeout=120,
+            )
+
+            if response.status_code != 200:
+                logger.error(
+                    "anthropic_api_error", status_code=response.status_code, body=response.text
+                )
+                response.raise_for_status()
+
+            result = response.json()
+            content = "".join(
+                block.get("text", "") for block in result["content"] if block["type"] == "text"
+            )
+            logger.info(
+                "llm_response_received", backend="anthropic", response_preview=content[:100]
+            )
+
+            # Save to history
+            self.add_message("user", message)
+            self.add_message("assistant", content)
+
+            return content
+        except Exception as e:
+            logger.error("anthropic_api_error", error=str(e), error_type=type(e).__name__)
+            return f"Error: {e}"
+
+    async def chat_stream(self, message: str) -> AsyncIterator[str]:
+        logger.info("llm_processing", backend="anthropic", model=self.model)
+
+        try:
+            client = self._get_async_client()
+            sentences = SentenceBuffer(max_length=MAX_SENTENCE_LENGTH)
+            full_response = ""
+
+            async with client.stream(
+                "POST",
+                f"{self.base_url}/messages",
+                json=self._build_payload(message, stream=True),
+                headers=self._headers(),
+            ) as response:
+                if response.status_code != 200:
+                    logger.error("anthropic_stream_error", status_code=response.status_code)
+                    response.raise_for_status()
+
+                # Server-sent events: only the "data:" lines carry the payload
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+
+                    try:
+                        data = json.loads(line[6:])
+                    except json.JSONDecodeError:
+                        continue
+
+                    if data.get("type") == "message_stop":
+                        break
+                    if data.get("type") != "content_block_delta":
+                        continue
+
+                    delta = data.get("delta", {})
+                    if delta.get("type") == "text_delta":
+                        text = delta.get("text", "")
+                        full_response += text
+
+                        for sentence in sentences.feed(text):
+                            logger.debug("sentence_generated", sentence=sentence)
+                            yield sentence
+
+            rest = sentences.flush()
+            if rest:
+                logger.debug("buffer_output", text=rest)
+                yield rest
+
+            # Save to history
+            self.add_message("user", message)
+            self.add_message("assistant", full_response)
+
+        except Exception as e:
+            logger.error("anthropic_stream_error", error=str(e), error_type=type(e).__name__)
+            yield f"Error: {e}"
+
+
 def create_backend(backend_type: str, system_prompt: str, **kwargs) -> LLMBackend:
     """Factory function to create LLM backend"""
     backends = {
@@ -627,6 +877,7 @@ def create_backend(backend_type: str, system_prompt: str, **kwargs) -> LLMBacken
         "openrouter": OpenRouterBackend,
         "custom": CustomBackend,
         "zhipu": ZhipuBackend,
+        "anthropic": AnthropicBackend,
     }
 
     if backend_type not in backends:
@@ -83,6 +83,12 @@ DEFAULT_CONFIG: dict[str, Any] = {
             "api_key": "",
             "model": "glm-4-flash",
         },
+        {
+            "name": "anthropic",
+            "base_url": "https://api.anthropic.com/v1",
+            "api_key": "",
+            "model": "claude-haiku-4-5",
+        },
     ],
     # TTS Configuration
     "tts_backend": "edge",
@@ -153,14 +159,14 @@ class ConfigManager:
     def save(config: dict[str, Any]) -> None:
         """Save configuration file"""
         print(f"💾 正在保存配置文件: {CONFIG_PATH}", file=sys.stderr)
+        # Write a sibling temp file and rename it over the config, so a concurrent
+        # load() never sees a half-written file (and falls back to defaults)
+        tmp_path = f"{CONFIG_PATH}.tmp"
         try:
-            with open(CONFIG_PATH, "w", encoding="utf-8") as f:
+            with open(tmp_path, "w", encoding="utf-8") as f:
                 json.dump(config, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, CONFIG_PATH)
             print(f"✅ 配置文件保存成功", file=sys.stderr)
-            # Verify file was actually written
-            if os.path.exists(CONFIG_PATH):
-                file_size = os.path.getsize(CONFIG_PATH)
-                print(f"📊 文件大小: {file_size} 字节", file=sys.stderr)
         except Exception as e:
             print(f"❌ 配置文件保存失败: {e}", file=sys.stderr)
             raise
@@ -147,7 +147,8 @@ def configure_logging(
     ]
 
     if format == "json":
-        # JSON format for production
+        # JSON format for production (tracebacks from logger.exception become one string field)
+        processors.append(structlog.processors.format_exc_info)
         processors.append(structlog.processors.JSONRenderer())
     else:
         # Human-readable format for development
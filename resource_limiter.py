@@ -25,6 +25,7 @@ import functools
 import platform
 import signal
 import sys
+import time
 from typing import Any, Callable, TypeVar
 
 from logger import get_logger
@@ -45,6 +46,11 @@ class ResourceLimiter:
     FILE_SIZE_LIMIT = 100 * 1024 * 1024  # 100MB
     FILE_DESCRIPTOR_LIMIT = 1024  # 最大文件描述符数
 
+    # 资源使用缓存（避免周期性日志重复调用 getrusage）
+    USAGE_CACHE_TTL = 1.0  # 秒
+    _last_usage: dict[str, Any] = {}
+    _last_usage_ts: float = float("-inf")
+
     @staticmethod
     def set_limits() -> bool:
         """
@@ -247,8 +253,8 @@ class ResourceLimiter:
                 f"Async operation '{operation_name}' timed out after {seconds} seconds"
             ) from err
 
-    @staticmethod
-    def get_current_usage() -> dict[str, Any]:
+    @classmethod
+    def get_current_usage(cls) -> dict[str, Any]:
         """
         获取当前资源使用情况
 
@@ -258,21 +264,28 @@ class ResourceLimiter:
         Note:
             - Unix/Linux: 返回详细资源使用情况
             - Windows: 返回空字典
+            - 结果缓存 USAGE_CACHE_TTL 秒，期间不重复调用 getrusage
         """
         if platform.system() == "Windows":
             return {}
 
+        now = time.monotonic()
+        if now - cls._last_usage_ts < cls.USAGE_CACHE_TTL:
+            return dict(cls._last_usage)
+
         try:
             import resource
 
             usage = resource.getrusage(resource.RUSAGE_SELF)
 
-            return {
+            cls._last_usage = {
                 "memory_mb": usage.ru_maxrss / 1024,  # KB to MB (Linux)
                 "cpu_time_user": usage.ru_utime,
                 "cpu_time_system": usage.ru_stime,
                 "cpu_time_total": usage.ru_utime + usage.ru_stime,
             }
+            cls._last_usage_ts = now
+            return dict(cls._last_usage)
         except Exception as e:
             logger.warning("resource_usage_unavailable", error=str(e), error_type=type(e).__name__)
             return {}
@@ -12,15 +12,15 @@ to improve cold start time.
 
 import asyncio
 import atexit
+import hashlib
 import os
 import platform
 import re
-import stat
+import shutil
 import sys
 import tempfile
 import time
-from collections import deque
-from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, deque
 from typing import TYPE_CHECKING
 
 # Lazy-loaded modules (imported on-demand for cold start optimization)
@@ -55,12 +55,9 @@ def create_secure_temp_file(suffix: str = ".tmp") -> str:
     Returns:
         Path to the temporary file
     """
-    # Create temp file with delete=False (we'll manage cleanup manually)
+    # mkstemp already creates the file with 0600 permissions (owner read/write only)
     fd, path = tempfile.mkstemp(suffix=suffix)
 
-    # Set secure permissions: 0600 (owner read/write only)
-    os.chmod(path, stat.S_IRUSR | stat.S_IWUSR)
-
     # Close the file descriptor
     os.close(fd)
 
@@ -70,6 +67,23 @@ def create_secure_temp_file(suffix: str = ".tmp") -> str:
     return path
 
 
+def release_temp_file(path: str):
+    """
+    Delete a temporary file and stop tracking it
+
+    Args:
+        path: Path returned by create_secure_temp_file
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    try:
+        _temp_files.remove(path)
+    except ValueError:
+        pass
+
+
 def cleanup_temp_files():
     """Clean up all temporary files created by this session"""
     for path in _temp_files:
@@ -107,10 +121,18 @@ CLEAR_HISTORY_KEYWORDS = [
     "清空对话",
     "重新开始",
 ]  # Keywords to trigger history clear
+CLEAR_HISTORY_RESPONSES = {
+    "zh": "好的，已清空对话记录，重新开始。",
+    "en": "OK, conversation cleared. Let's start fresh.",
+    "ja": "会話履歴をクリアしました。",
+    "ko": "대화 기록을 지웠습니다.",
+    "yue": "好，已清空對話記錄。",
+}  # Fixed phrases, spoken from the TTS cache
 
 # ===== Basic Config =====
 SAMPLE_RATE = 16000
 ASR_MODEL = "iic/SenseVoiceSmall"  # SenseVoice model
+ASR_NUM_THREADS = max(4, os.cpu_count() or 1)  # Torch intra-op threads for CPU inference
 USE_STREAMING = True  # Stream output (speak while generating)
 
 # ===== TTS Backend =====
@@ -119,6 +141,15 @@ USE_STREAMING = True  # Stream output (speak while generating)
 TTS_BACKEND = "edge"
 TTS_RATE = "+0%"  # Speed for Edge TTS: negative=slower, positive=faster, 0%=normal
 
+EDGE_TTS_HOST = "speech.platform.bing.com"  # Edge TTS WebSocket endpoint
+TTS_PREFETCH = 2  # Max concurrent Edge TTS requests while streaming a response
+
+# Players that can decode MP3 from stdin, tried in order (first found on PATH wins)
+STREAMING_PLAYERS = [
+    ["mpv", "--no-cache", "--no-terminal", "--really-quiet", "--", "fd://0"],
+    ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", "-i", "pipe:0"],
+]
+
 # ===== Edge TTS Voices (online, auto-selected based on detected language) =====
 DEFAULT_LANGUAGE = "zh"
 EDGE_TTS_VOICES = {
@@ -267,9 +298,26 @@ VAD_CONSECUTIVE_THRESHOLD = (
 VAD_PRE_BUFFER = 0.3  # Pre-buffer duration (seconds) to capture speech start
 MIN_SPEECH_DURATION = 0.4  # Minimum speech duration (seconds) - increased
 SILENCE_AFTER_SPEECH = 0.8  # Silence duration to stop recording (seconds)
+TRAILING_SILENCE_PAD = 0.2  # Silence kept after the last voiced chunk when trimming (seconds)
 MAX_RECORDING_DURATION = 30  # Maximum recording duration (seconds)
 INTERRUPT_CHECK_DURATION = 1.5  # Duration to check for speech continuation after pause (seconds)
 INITIAL_SPEECH_TIMEOUT = 60  # Maximum time to wait for initial speech to start (seconds)
+PTT_MAX_DURATION = 120  # Push-to-talk recording buffer capacity (seconds)
+MIN_ASR_DURATION = 0.3  # Shorter recordings (e.g. an accidental PTT tap) skip ASR (seconds)
+
+# VAD chunk counts for the default config (precomputed at import)
+CHUNK_SIZE = 512  # Silero VAD requires 512 samples @ 16kHz
+SILENCE_CHUNKS = int(SILENCE_AFTER_SPEECH * SAMPLE_RATE / CHUNK_SIZE)
+MIN_SPEECH_CHUNKS = int(MIN_SPEECH_DURATION * SAMPLE_RATE / CHUNK_SIZE)
+PRE_BUFFER_CHUNKS = int(VAD_PRE_BUFFER * SAMPLE_RATE / CHUNK_SIZE)
+MAX_RECORDING_CHUNKS = int(MAX_RECORDING_DURATION * SAMPLE_RATE / CHUNK_SIZE)
+TRAILING_PAD_SAMPLES = int(TRAILING_SILENCE_PAD * SAMPLE_RATE)
+MIN_ASR_SAMPLES = int(MIN_ASR_DURATION * SAMPLE_RATE)
+VAD_RING_CHUNKS = 64  # Audio callback -> VAD consumer queue depth (~2 s)
+VAD_POLL_MS = 20  # How often the consumer drains the queue and runs VAD
+PLAYBACK_BLOCK = 4096  # Samples written per call; interrupts are checked between blocks
+PCM_CACHE_SIZE = 32  # Decoded TTS clips kept in memory for repeated sentences
+
 
 # ===== System Prompt (optimized for voice output) =====
 SYSTEM_PROMPT = """You are Speekium, an intelligent voice assistant. Follow these rules:
@@ -450,6 +498,10 @@ class VoiceAssistant:
             RecordingMode.CONTINUOUS
         )  # Default: continuous conversation mode
         self.interrupt_audio_buffer = []  # Buffer for interrupt audio
+        self._ptt_buffer = None  # Preallocated push-to-talk buffer (created on first use)
+        self._vad_buffer = None  # Preallocated VAD recording buffer (created on first use)
+        self._out_stream = None  # Long-lived playback stream (opened on first use)
+        self._pcm_cache = OrderedDict()  # cache key -> (samples, samplerate), LRU order
         self._tts_backend = None  # Cache TTS backend setting
 
         # Use ConfigLoader for centralized config management
@@ -467,6 +519,9 @@ class VoiceAssistant:
         import threading
 
         self.recording_interrupt_event = threading.Event()
+        # One ASR inference at a time: AutoModel.generate is not documented as
+        # thread-safe, and each call already uses ASR_NUM_THREADS torch threads
+        self._asr_lock = threading.Lock()
 
         # VAD configuration (load from config file)
         vad_config = config.get("vad", {})
@@ -483,6 +538,19 @@ class VoiceAssistant:
             "vad_max_recording_duration", MAX_RECORDING_DURATION
         )
 
+        # Chunk counts derived from the VAD config (fixed for the instance lifetime)
+        self.vad_silence_chunks = int(self.vad_silence_duration * SAMPLE_RATE / CHUNK_SIZE)
+        self.vad_min_speech_chunks = int(self.vad_min_speech_duration * SAMPLE_RATE / CHUNK_SIZE)
+        self.vad_pre_buffer_chunks = int(self.vad_pre_buffer * SAMPLE_RATE / CHUNK_SIZE)
+        self.vad_max_recording_chunks = int(
+            self.vad_max_recording_duration * SAMPLE_RATE / CHUNK_SIZE
+        )
+
+    @property
+    def tts_backend(self):
+        """TTS backend name as last read from config (get_tts_backend() re-reads it)."""
+        return self._tts_backend
+
     def get_tts_backend(self):
         """Get current TTS backend from config (refreshes on each call)."""
         self._tts_backend = self.config_loader.get_tts_backend()
@@ -637,7 +705,15 @@ class VoiceAssistant:
                     quantize = "fp16"
                     logger.info("asr_quantization_enabled", quantize=quantize)
 
-                self.asr_model = AutoModel(model=ASR_MODEL, device=device, quantize=quantize)
+                # ncpu: FunASR defaults to 4 torch threads regardless of core count
+                # disable_update: skip the PyPI version check on every load
+                self.asr_model = AutoModel(
+                    model=ASR_MODEL,
+                    device=device,
+                    quantize=quantize,
+                    ncpu=ASR_NUM_THREADS,
+                    disable_update=True,
+                )
                 load_time = time.time() - load_start
                 logger.info("model_loaded", model="SenseVoice", load_time_ms=int(load_time * 1000))
 
@@ -710,11 +786,15 @@ class VoiceAssistant:
                 max_retries = 5
                 for attempt in range(max_retries):
                     try:
+                        # onnx=True: Silero's ONNXRuntime wrapper pins the session to a
+                        # single intra/inter-op thread, which suits a tiny graph run every
+                        # 32 ms far better than torch's shared (ASR-sized) thread pool
                         self.vad_model, _ = torch.hub.load(  # nosec B614
                             repo_or_dir="snakers4/silero-vad",
                             model="silero_vad",
                             force_reload=False,
                             trust_repo=True,
+                            onnx=True,
                         )
                         logger.info("model_loaded", model="VAD", attempt=attempt + 1)
                         break
@@ -743,6 +823,16 @@ class VoiceAssistant:
                         raise Exception(f"VAD model loading failed: {error_str}") from e
 
                 logger.info("model_loaded", model="VAD")
+
+                # Warmup: the first inference initializes the session/kernels,
+                # pay that here instead of on the first chunk of the first turn
+                try:
+                    self.vad_model(torch.zeros(CHUNK_SIZE), SAMPLE_RATE)
+                    self.vad_model.reset_states()
+                    logger.info("vad_warmup_completed")
+                except Exception as e:
+                    # Warmup failure is not critical
+                    logger.warning("vad_warmup_failed", error=str(e)[:100])
             except Exception as e:
                 # 记录 VAD 加载错误
                 error_tracker = get_error_tracker()
@@ -790,11 +880,13 @@ class VoiceAssistant:
                 else None
             )
             backend_type_map = {
+                "ClaudeBackend": "claude",
                 "OllamaBackend": "ollama",
                 "OpenAIBackend_Official": "openai",
                 "OpenRouterBackend": "openrouter",
                 "CustomBackend": "custom",
                 "ZhipuBackend": "zhipu",
+                "AnthropicBackend": "anthropic",
             }
             current_backend = backend_type_map.get(current_backend_type, "")
 
@@ -824,6 +916,9 @@ class VoiceAssistant:
             needs_recreate = True
 
         if needs_recreate:
+            # Release the old backend's prewarmed CLI process (ClaudeBackend)
+            if hasattr(self.llm_backend, "close"):
+                self.llm_backend.close()
             set_component("LLM")
             logger.info(
                 "backend_initializing",
@@ -901,6 +996,8 @@ class VoiceAssistant:
         import sounddevice as sd
         import torch
 
+        from audio_buffer import AudioBuffer, ChunkRing
+
         model = self.load_vad()
         model.reset_states()  # Reset VAD state
 
@@ -921,26 +1018,47 @@ class VoiceAssistant:
             logger.info("tts_in_progress", status="vad_paused")
             return None  # Don't start recording if TTS is in progress
 
-        chunk_size = 512  # Silero VAD requires 512 samples @ 16kHz
-        frames = []
+        # Preallocated recording buffer (max duration), reused across recordings
+        max_chunks = self.vad_max_recording_chunks
+        capacity = max_chunks * CHUNK_SIZE
+        if self._vad_buffer is None or self._vad_buffer.capacity != capacity:
+            self._vad_buffer = AudioBuffer(capacity)
+        buffer = self._vad_buffer
+        buffer.clear()
+        buffered_chunks = 0
 
         # Use captured audio from interrupt if available
         if speech_already_started and self.interrupt_audio_buffer:
-            frames = self.interrupt_audio_buffer.copy()
+            for chunk in self.interrupt_audio_buffer:
+                buffer.write(chunk)
+            buffered_chunks = len(self.interrupt_audio_buffer)
             self.interrupt_audio_buffer = []  # Clear the buffer
-            logger.debug("audio_buffer_used", chunks=len(frames))
+            logger.debug("audio_buffer_used", chunks=buffered_chunks)
 
         is_speaking = speech_already_started  # Start in speaking mode if interrupted
         silence_chunks = 0
-        speech_chunks = len(frames)  # Count buffered frames as speech
-        consecutive_speech = self.vad_consecutive_threshold if speech_already_started else 0
-        max_silence_chunks = int(self.vad_silence_duration * SAMPLE_RATE / chunk_size)
-        min_speech_chunks = int(self.vad_min_speech_duration * SAMPLE_RATE / chunk_size)
-        max_chunks = int(self.vad_max_recording_duration * SAMPLE_RATE / chunk_size)
+        speech_chunks = buffered_chunks  # Count buffered frames as speech
+        voiced_end = len(buffer)  # Buffer length after the last voiced chunk
+        # Read config once; the callback then only touches closure cells
+        vad_threshold = self.vad_threshold
+        consecutive_threshold = self.vad_consecutive_threshold
+        consecutive_speech = consecutive_threshold if speech_already_started else 0
+        max_silence_chunks = self.vad_silence_chunks
+        min_speech_chunks = self.vad_min_speech_chunks
 
         # Pre-buffer: keep audio before speech starts to avoid clipping
-        pre_buffer_size = int(self.vad_pre_buffer * SAMPLE_RATE / chunk_size)
-        pre_buffer = deque(maxlen=pre_buffer_size)
+        pre_buffer = deque(maxlen=self.vad_pre_buffer_chunks)
+
+        # Preallocated VAD input: the tensor shares memory with the scratch array
+        vad_input = np.empty(CHUNK_SIZE, dtype=np.float32)
+        vad_tensor = torch.from_numpy(vad_input)
+
+        # The audio callback only copies chunks into this ring; VAD runs in the
+        # polling loop below, off PortAudio's real-time thread
+        ring = ChunkRing(VAD_RING_CHUNKS, CHUNK_SIZE)
+
+        def callback(indata, frame_count, time_info, status):
+            ring.push(indata[:, 0])
 
         recording_done = False
         # Track start time for initial speech detection timeout
@@ -948,27 +1066,24 @@ class VoiceAssistant:
 
         start_time = time.time()
 
-        def callback(indata, frame_count, time_info, status):
+        def process_chunk():
+            """Run VAD on the chunk in vad_input and update the recording state."""
             nonlocal is_speaking, silence_chunks, speech_chunks, consecutive_speech, recording_done
-
-            if recording_done:
-                return
+            nonlocal voiced_end
 
             try:
-                audio_chunk = indata[:, 0].copy()
-
                 # VAD detection
-                audio_tensor = torch.from_numpy(audio_chunk).float()
-                speech_prob = model(audio_tensor, SAMPLE_RATE).item()
+                speech_prob = model(vad_tensor, SAMPLE_RATE).item()
 
-                if speech_prob > self.vad_threshold:
+                if speech_prob > vad_threshold:
                     # Speech detected
                     consecutive_speech += 1
 
-                    if not is_speaking and consecutive_speech >= self.vad_consecutive_threshold:
+                    if not is_speaking and consecutive_speech >= consecutive_threshold:
                         is_speaking = True
-                        # Add pre-buffer to frames to avoid clipping speech start
-                        frames.extend(pre_buffer)
+                        # Add pre-buffer to the recording to avoid clipping speech start
+                        for chunk in pre_buffer:
+                            buffer.write(chunk)
                         pre_buffer.clear()
                         logger.info("speech_detected")
                         # Call callback if provided
@@ -977,19 +1092,20 @@ class VoiceAssistant:
 
                     if is_speaking:
                         # Only reset silence count on consecutive speech
-                        if consecutive_speech >= self.vad_consecutive_threshold:
+                        if consecutive_speech >= consecutive_threshold:
                             silence_chunks = 0
                         speech_chunks += 1
-                        frames.append(audio_chunk)
+                        buffer.write(vad_input)
+                        voiced_end = len(buffer)
                     else:
                         # Not confirmed speaking yet, fill pre-buffer
-                        pre_buffer.append(audio_chunk)
+                        pre_buffer.append(vad_input.copy())
                 else:
                     # Silence
                     consecutive_speech = 0  # Reset consecutive speech count
 
                     if is_speaking:
-                        frames.append(audio_chunk)
+                        buffer.write(vad_input)
                         silence_chunks += 1
 
                         # Stop recording after enough silence
@@ -1001,10 +1117,10 @@ class VoiceAssistant:
                             logger.info("speech_ended")
                     else:
                         # Not speaking yet, fill pre-buffer
-                        pre_buffer.append(audio_chunk)
+                        pre_buffer.append(vad_input.copy())
 
                 # Max duration reached
-                if len(frames) >= max_chunks:
+                if buffer.is_full:
                     recording_done = True
                     logger.warning("max_recording_duration")
 
@@ -1016,13 +1132,17 @@ class VoiceAssistant:
             samplerate=SAMPLE_RATE,
             channels=1,
             dtype=np.float32,
-            blocksize=chunk_size,
+            blocksize=CHUNK_SIZE,
             callback=callback,
         ):
             config_check_counter = 0
             while not recording_done:
+                while not recording_done and ring.pop_into(vad_input):
+                    process_chunk()
+                if recording_done:
+                    break
+
                 # Check for interrupt signal (e.g., mode change)
-                # Check every 10ms for faster response
                 if self.recording_interrupt_event.is_set():
                     logger.info("recording_interrupted")
                     recording_done = True
@@ -1038,9 +1158,9 @@ class VoiceAssistant:
 
                 # Also check config file for recording mode changes
                 # This ensures mode changes are detected even if interrupt command is queued
-                # Check every 5 iterations = 250ms interval (50ms sleep * 5)
+                # Check every 12 iterations = 240ms interval (20ms sleep * 12)
                 config_check_counter += 1
-                if config_check_counter % 5 == 0:
+                if config_check_counter % 12 == 0:
                     try:
                         from config_manager import ConfigManager
 
@@ -1054,12 +1174,15 @@ class VoiceAssistant:
                     except Exception:
                         pass  # Ignore config read errors to avoid breaking VAD loop
 
-                sd.sleep(50)  # Sleep for 50ms
+                sd.sleep(VAD_POLL_MS)
 
-        if not frames or speech_chunks < min_speech_chunks:
+        if not len(buffer) or speech_chunks < min_speech_chunks:
             return None
 
-        audio = np.concatenate(frames)
+        # Drop the end-of-speech silence (SILENCE_AFTER_SPEECH) beyond a short pad:
+        # ASR cost scales with input length and the silence carries no text
+        end = min(len(buffer), voiced_end + TRAILING_PAD_SAMPLES)
+        audio = buffer.view()[:end].copy()
         logger.info("recording_complete", duration=len(audio) / SAMPLE_RATE)
         return audio
 
@@ -1069,26 +1192,28 @@ class VoiceAssistant:
         通过 mode_manager.start_recording() 和 stop_recording() 控制
         """
         # Lazy imports for cold start optimization
-        import numpy as np
         import sounddevice as sd
 
+        from audio_buffer import AudioBuffer
+
         logger.info("ptt_mode_activated")
 
-        chunk_size = 512
-        frames = []
+        if self._ptt_buffer is None:
+            self._ptt_buffer = AudioBuffer(PTT_MAX_DURATION * SAMPLE_RATE)
+        buffer = self._ptt_buffer
+        buffer.clear()
 
         def callback(indata, frame_count, time_info, status):
-            # 只有在录音状态时才记录音频
+            # 只有在录音状态时才记录音频（直接写入预分配缓冲区）
             if self.mode_manager.is_recording:
-                audio_chunk = indata[:, 0].copy()
-                frames.append(audio_chunk)
+                buffer.write(indata[:, 0])
 
         # 启动音频流
         with sd.InputStream(
             samplerate=SAMPLE_RATE,
             channels=1,
             dtype="float32",
-            blocksize=chunk_size,
+            blocksize=CHUNK_SIZE,
             callback=callback,
         ):
             # 等待开始录音
@@ -1099,56 +1224,53 @@ class VoiceAssistant:
             while self.mode_manager.is_recording:
                 sd.sleep(50)
 
-        # 检查是否有录音数据
-        if not frames:
+        # 检查是否有录音数据（过短的录音在复制之前直接丢弃）
+        if not len(buffer):
             logger.warning("no_audio_data")
             return None
+        if len(buffer) < MIN_ASR_SAMPLES:
+            logger.info("ptt_recording_too_short", duration=len(buffer) / SAMPLE_RATE)
+            return None
+
+        if buffer.is_full:
+            logger.warning("ptt_max_duration", max_seconds=PTT_MAX_DURATION)
 
-        audio = np.concatenate(frames)
+        audio = buffer.to_array()
         logger.info("ptt_recording_complete", duration=len(audio) / SAMPLE_RATE)
         return audio
 
     def transcribe(self, audio):
         """Transcribe audio and detect language. Returns (text, language)."""
+        # Too short to contain a word: skip the model entirely
+        if audio is None or audio.size < MIN_ASR_SAMPLES:
+            logger.info("asr_skipped_short_audio", samples=0 if audio is None else audio.size)
+            return "", DEFAULT_LANGUAGE
+
         t0 = time.time()
         set_component("ASR")
         logger.info("asr_processing", audio_duration=len(audio) / SAMPLE_RATE)
 
-        t1 = time.time()
-        model = self.load_asr()
-        t2 = time.time()
-        logger.debug("asr_timing", step="load_asr", ms=int((t2 - t1) * 1000))
-
-        # Lazy imports for cold start optimization
+        # Lazy import for cold start optimization
         import numpy as np
-        from scipy.io.wavfile import write as write_wav
 
-        # Security: Use secure temp file
-        t3 = time.time()
-        tmp_file = create_secure_temp_file(suffix=".wav")
-        t4 = time.time()
-        logger.debug("asr_timing", step="create_temp_file", ms=int((t4 - t3) * 1000))
+        # FunASR accepts a 16kHz float32 ndarray directly, so skip the
+        # int16 conversion + temp WAV write + re-decode round-trip
+        if audio.dtype != np.float32:
+            audio = audio.astype(np.float32)
 
-        try:
-            t5 = time.time()
-            audio_int16 = (audio * 32767).astype(np.int16)
-            t6 = time.time()
-            logger.debug("asr_timing", step="convert_to_int16", ms=int((t6 - t5) * 1000))
-
-            t7 = time.time()
-            write_wav(tmp_file, SAMPLE_RATE, audio_int16)
-            t8 = time.time()
-            logger.debug("asr_timing", step="write_wav_file", ms=int((t8 - t7) * 1000))
-
-            t9 = time.time()
-            result = model.generate(input=tmp_file)
-            t10 = time.time()
-            logger.debug("asr_timing", step="model_generate", ms=int((t10 - t9) * 1000))
-
-            raw_text = result[0]["text"] if result else ""
-        finally:
-            if tmp_file and os.path.exists(tmp_file):
-                os.remove(tmp_file)
+        # Segments transcribed in parallel (record_with_interruption) queue up here
+        with self._asr_lock:
+            t1 = time.time()
+            model = self.load_asr()
+            t2 = time.time()
+            logger.debug("asr_timing", step="load_asr", ms=int((t2 - t1) * 1000))
+
+            t3 = time.time()
+            result = model.generate(input=audio)
+            t4 = time.time()
+        logger.debug("asr_timing", step="model_generate", ms=int((t4 - t3) * 1000))
+
+        raw_text = result[0]["text"] if result else ""
 
         # Extract language from SenseVoice tags like <|zh|>, <|en|>, <|yue|>
         lang_match = re.search(r"<\|(zh|en|ja|ko|yue)\|>", raw_text)
@@ -1165,35 +1287,60 @@ class VoiceAssistant:
         )
         return text, language
 
-    def detect_speech_start(self, timeout=1.5):
-        """Check if speech starts within timeout. Returns True if speech detected."""
+    def detect_speech_start(self, timeout=1.5, keep_audio=False):
+        """Check if speech starts within timeout. Returns True if speech detected.
+
+        Args:
+            timeout: Seconds to listen for speech
+            keep_audio: If True, hand the chunks that triggered detection (plus
+                        pre-buffer) to the next record_with_vad via
+                        interrupt_audio_buffer, so the start of speech is not lost
+        """
         # Lazy imports for cold start optimization
         import sounddevice as sd
         import torch
         import numpy as np
 
+        from audio_buffer import ChunkRing
+
         model = self.load_vad()
         model.reset_states()
 
-        chunk_size = 512
         speech_detected = False
         consecutive_speech = 0
         check_done = False
 
+        # Preallocated VAD input: the tensor shares memory with the scratch
+        # array (no per-chunk allocation)
+        vad_input = np.empty(CHUNK_SIZE, dtype=np.float32)
+        vad_tensor = torch.from_numpy(vad_input)
+
+        # Use the configured thresholds (same as record_with_vad), read once
+        vad_threshold = self.vad_threshold
+        consecutive_threshold = self.vad_consecutive_threshold
+
+        # Recent chunks, handed over to the next recording when speech is detected
+        recent = deque(maxlen=self.vad_pre_buffer_chunks + consecutive_threshold)
+
+        # Callback only queues chunks; VAD runs in the polling loop below
+        ring = ChunkRing(VAD_RING_CHUNKS, CHUNK_SIZE)
+
         def callback(indata, frame_count, time_info, status):
-            nonlocal speech_detected, consecutive_speech, check_done
+            ring.push(indata[:, 0])
 
-            if check_done:
-                return
+        def process_chunk():
+            nonlocal speech_detected, consecutive_speech, check_done
 
             try:
-                audio_chunk = indata[:, 0].copy()
-                audio_tensor = torch.from_numpy(audio_chunk).float()
-                speech_prob = model(audio_tensor, SAMPLE_RATE).item()
+                if keep_audio:
+                    recent.append(vad_input.copy())
+                speech_prob = model(vad_tensor, SAMPLE_RATE).item()
 
-                if speech_prob > VAD_THRESHOLD:
+                if speech_prob > vad_threshold:
                     consecutive_speech += 1
-                    if consecutive_speech >= VAD_CONSECUTIVE_THRESHOLD:
+                    if consecutive_speech >= consecutive_threshold:
+                        if keep_audio:
+                            self.interrupt_audio_buffer = list(recent)
                         speech_detected = True
                         check_done = True
                 else:
@@ -1206,84 +1353,97 @@ class VoiceAssistant:
             samplerate=SAMPLE_RATE,
             channels=1,
             dtype=np.float32,
-            blocksize=chunk_size,
+            blocksize=CHUNK_SIZE,
             callback=callback,
         ):
             elapsed = 0
             while not check_done and elapsed < timeout_ms:
-                sd.sleep(50)
-                elapsed += 50
+                sd.sleep(VAD_POLL_MS)
+                elapsed += VAD_POLL_MS
+                while not check_done and ring.pop_into(vad_input):
+                    process_chunk()
 
         return speech_detected
 
     async def transcribe_async(self, audio):
-        """Async wrapper for transcribe using thread executor."""
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            result = await loop.run_in_executor(executor, self.transcribe, audio)
-        return result
+        """Async wrapper for transcribe using the default thread executor."""
+        return await asyncio.to_thread(self.transcribe, audio)
+
+    async def _record_in_thread(self, func, *args, **kwargs):
+        """Run a blocking recorder in a worker thread and stop it if we are cancelled
+
+        Cancelling the await (e.g. chat_once's timeout) does not stop the thread: it
+        would keep its InputStream open and share vad_model's state and _vad_buffer
+        with the next recording. On cancellation, raise the interrupt flag the
+        recorders poll and wait for the thread to return before re-raising.
+        """
+        task = asyncio.ensure_future(asyncio.to_thread(func, *args, **kwargs))
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            was_set = self.recording_interrupt_event.is_set()
+            self.recording_interrupt_event.set()
+            try:
+                await task
+            except Exception:
+                pass  # The recording is being abandoned anyway
+            finally:
+                if not was_set:
+                    self.recording_interrupt_event.clear()
+            raise
 
     async def record_with_interruption(self):
-        """Record with support for interruption - if user continues speaking, keep recording."""
-        # Lazy import for cold start optimization
-        import numpy as np
+        """Record with support for interruption - if user continues speaking, keep recording.
 
-        all_segments = []
+        Each segment (speech up to a pause) is transcribed as soon as it is
+        recorded, while the user may still be talking, so only the last segment's
+        ASR is left on the critical path. Pauses are natural cut points, so the
+        segment transcripts are simply joined.
+        """
+        segment_tasks = []
 
         # Check if we're coming from a barge-in interrupt
         speech_already_started = self.was_interrupted
         self.was_interrupted = False  # Reset the flag
 
         while True:
-            # Record a segment
-            segment = self.record_with_vad(speech_already_started=speech_already_started)
-            speech_already_started = False  # Only applies to first segment
+            # Record a segment off the event loop so pending ASR tasks keep running
+            segment = await self._record_in_thread(
+                self.record_with_vad, speech_already_started=speech_already_started
+            )
+            speech_already_started = False  # Only applies to the next segment
 
             if segment is None:
                 # No speech detected
-                if not all_segments:
+                if not segment_tasks:
                     return None, None
                 break
 
-            all_segments.append(segment)
-
-            # Start ASR in background
-            combined_audio = np.concatenate(all_segments)
-            asr_task = asyncio.create_task(self.transcribe_async(combined_audio))
+            # Start ASR for this segment in background
+            segment_tasks.append(asyncio.create_task(self.transcribe_async(segment)))
 
             # Check if user wants to continue speaking
             logger.info("waiting_for_input")
 
             # Run speech detection in executor (it's blocking)
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor() as executor:
-                has_more_speech = await loop.run_in_executor(
-                    executor, self.detect_speech_start, INTERRUPT_CHECK_DURATION
-                )
+            has_more_speech = await self._record_in_thread(
+                self.detect_speech_start, INTERRUPT_CHECK_DURATION, keep_audio=True
+            )
 
-            if has_more_speech:
-                # User is continuing, cancel ASR and keep recording
-                asr_task.cancel()
-                try:
-                    await asr_task
-                except asyncio.CancelledError:
-                    pass
-                logger.info("recording_continued")
-                continue
-            else:
-                # No more speech, wait for ASR result
-                try:
-                    text, language = await asr_task
-                    return text, language
-                except asyncio.CancelledError:
-                    break
+            if not has_more_speech:
+                break
 
-        # Final transcription if we have segments but exited loop
-        if all_segments:
-            combined_audio = np.concatenate(all_segments)
-            return self.transcribe(combined_audio)
+            # User is continuing, keep recording (earlier segments keep transcribing)
+            logger.info("recording_continued")
+            # Continue from the audio detect_speech_start already captured
+            speech_already_started = True
 
-        return None, None
+        results = await asyncio.gather(*segment_tasks)
+        texts = [text for text, _ in results if text]
+        # Use the language of the most recent segment that produced text
+        language = next((lang for text, lang in reversed(results) if text), results[-1][1])
+        separator = "" if language in ("zh", "yue", "ja") else " "
+        return separator.join(texts), language
 
     def detect_text_language(self, text):
         """Detect language from text content using character analysis and common words."""
@@ -1401,6 +1561,30 @@ class VoiceAssistant:
         # Always use Edge TTS
         return await self._generate_audio_edge(text, detected_lang)
 
+    async def warm_llm(self):
+        """Load the LLM backend and let it prepare for the first turn (e.g. start the Claude CLI)."""
+        backend = self.load_llm()
+        if backend is not None and hasattr(backend, "prewarm"):
+            await backend.prewarm()
+        return backend
+
+    async def warm_tts(self):
+        """Preload edge_tts and resolve the Edge TTS endpoint before the first utterance.
+
+        edge_tts opens a new WebSocket per Communicate and closes its connector
+        afterwards, so the connection itself cannot be pooled; the module import
+        and the DNS lookup are what can be paid ahead of time.
+        """
+        try:
+            import edge_tts  # noqa: F401
+
+            loop = asyncio.get_running_loop()
+            await loop.getaddrinfo(EDGE_TTS_HOST, 443)
+            logger.info("tts_warmed", host=EDGE_TTS_HOST)
+        except Exception as e:
+            # Warmup failure is not critical
+            logger.warning("tts_warmup_failed", error=str(e))
+
     async def _generate_audio_edge(self, text, language):
         """Generate audio using Edge TTS (online)."""
         # Lazy import for cold start optimization
@@ -1428,10 +1612,92 @@ class VoiceAssistant:
             logger.error("edge_tts_error", error=str(e))
             return None
 
+    def _get_output_stream(self, samplerate):
+        """Return the long-lived output stream, reopening it if the sample rate changes."""
+        stream = self._out_stream
+        if stream is not None and stream.samplerate == samplerate:
+            return stream
+        if stream is not None:
+            stream.close()
+            self._out_stream = None
+
+        import sounddevice as sd
+
+        stream = sd.OutputStream(samplerate=samplerate, channels=1, dtype="float32")
+        stream.start()
+        self._out_stream = stream
+        return stream
+
+    def pcm_cache_key(self, text):
+        """Cache key for the decoded audio of ``text`` in the current voice and rate."""
+        voice = EDGE_TTS_VOICES.get(
+            self.detect_text_language(text), EDGE_TTS_VOICES[DEFAULT_LANGUAGE]
+        )
+        return hashlib.blake2b(f"{voice}|{TTS_RATE}|{text}".encode(), digest_size=8).digest()
+
+    def _decode_audio(self, tmp_file, cache_key=None):
+        """Decode an audio file to mono float32, reusing cached PCM when cache_key hits."""
+        if cache_key is not None:
+            cached = self._pcm_cache.get(cache_key)
+            if cached is not None:
+                self._pcm_cache.move_to_end(cache_key)
+                return cached
+
+        import numpy as np
+        import soundfile as sf
+
+        # libsndfile >= 1.1 decodes MP3 (Edge TTS) as well as WAV (Piper)
+        data, sr = sf.read(tmp_file, dtype="float32", always_2d=True)
+        samples = np.ascontiguousarray(data[:, 0] if data.shape[1] == 1 else data.mean(axis=1))
+
+        if cache_key is not None:
+            self._pcm_cache[cache_key] = (samples, sr)
+            if len(self._pcm_cache) > PCM_CACHE_SIZE:
+                self._pcm_cache.popitem(last=False)
+        return samples, sr
+
+    def play_file_on_stream(self, tmp_file, stop_event=None, cache_key=None):
+        """Decode an audio file and write it to the output stream (blocking).
+
+        Returns True if ``stop_event`` was set before playback finished. Raises
+        only if nothing was played yet (decode, stream open or first write failed),
+        so callers can fall back to a player process without repeating audio.
+        """
+        samples, sr = self._decode_audio(tmp_file, cache_key)
+        stream = self._get_output_stream(sr)
+        for start in range(0, len(samples), PLAYBACK_BLOCK):
+            if stop_event is not None and stop_event.is_set():
+                # Drop whatever is still queued in the device buffer
+                stream.abort()
+                stream.start()
+                return True
+            try:
+                stream.write(samples[start : start + PLAYBACK_BLOCK])
+            except Exception as e:
+                # Reopen the stream for the next clip
+                self._out_stream = None
+                try:
+                    stream.close()
+                except Exception:
+                    pass
+                if start == 0:
+                    raise
+                # Part of the clip was heard: stop here rather than replay it elsewhere
+                logger.warning("output_stream_write_failed", error=str(e)[:100])
+                return False
+        return False
+
     async def play_audio(self, tmp_file, delete=True):
         """Play audio file (async, cross-platform), optionally delete after."""
         if tmp_file and os.path.exists(tmp_file):
             try:
+                # Preferred: one persistent OutputStream, no player process per sentence
+                try:
+                    await asyncio.to_thread(self.play_file_on_stream, tmp_file)
+                    return
+                except Exception as e:
+                    logger.warning("output_stream_playback_failed", error=str(e)[:100])
+
                 system = platform.system()
                 if system == "Darwin":  # macOS
                     cmd = ["afplay", tmp_file]
@@ -1460,7 +1726,7 @@ class VoiceAssistant:
                 await process.wait()
             finally:
                 if delete:
-                    os.remove(tmp_file)
+                    release_temp_file(tmp_file)
 
     def load_audio_file(self, file_path):
         """Load audio file and return numpy array at SAMPLE_RATE.
@@ -1502,11 +1768,90 @@ class VoiceAssistant:
 
         return False  # Never interrupted in current implementation
 
+    def _find_streaming_player(self):
+        """Return the command of the first stdin-capable player on PATH, or None."""
+        for cmd in STREAMING_PLAYERS:
+            if shutil.which(cmd[0]):
+                return cmd
+        return None
+
+    async def _stream_audio_edge(self, text, language, player_cmd):
+        """Stream Edge TTS MP3 chunks straight into the player's stdin.
+
+        Playback starts with the first audio chunk instead of after the whole
+        file has been synthesized and written to disk.
+        """
+        # Lazy import for cold start optimization
+        import edge_tts
+
+        voice = EDGE_TTS_VOICES.get(language, EDGE_TTS_VOICES[DEFAULT_LANGUAGE])
+        communicate = edge_tts.Communicate(text, voice, rate=TTS_RATE)
+        process = await asyncio.create_subprocess_exec(
+            *player_cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    process.stdin.write(chunk["data"])
+                    await process.stdin.drain()
+        except Exception as e:
+            error_tracker = get_error_tracker()
+            error_tracker.capture(
+                e,
+                level="error",
+                context={
+                    "language": language,
+                    "text_length": len(text),
+                    "function": "_stream_audio_edge",
+                },
+            )
+            logger.error("edge_tts_stream_error", error=str(e))
+        finally:
+            try:
+                process.stdin.close()
+            except Exception:
+                pass
+            await process.wait()
+
     async def speak(self, text, language=None):
-        """TTS speak a single sentence."""
+        """TTS speak a single sentence (streamed to the player when possible)."""
+        player_cmd = self._find_streaming_player()
+        if player_cmd:
+            detected_lang = self.detect_text_language(text)
+            await self._stream_audio_edge(text, detected_lang, player_cmd)
+            return
+
         tmp_file = await self.generate_audio(text, language)
         await self.play_audio(tmp_file)
 
+    async def speak_cached(self, text, language=None):
+        """Speak a fixed phrase from the on-disk TTS cache, synthesizing it only once."""
+        from tts_cache import get_tts_cache
+
+        detected_lang = self.detect_text_language(text)
+        voice = EDGE_TTS_VOICES.get(detected_lang, EDGE_TTS_VOICES[DEFAULT_LANGUAGE])
+        cache = get_tts_cache()
+
+        # Cache lookups rewrite the access-time index and put() copies the MP3 and
+        # scans the cache dir for eviction: keep that file I/O off the event loop
+        cached_file = await asyncio.to_thread(cache.get, text, detected_lang, voice)
+        if cached_file is None:
+            tmp_file = await self._generate_audio_edge(text, detected_lang)
+            if tmp_file is None:
+                return
+            await asyncio.to_thread(cache.put, text, tmp_file, detected_lang, voice)
+            cached_file = await asyncio.to_thread(cache.get, text, detected_lang, voice)
+            if cached_file is None:
+                # Caching failed, play the freshly generated file instead
+                await self.play_audio(tmp_file)
+                return
+            release_temp_file(tmp_file)
+
+        await self.play_audio(cached_file, delete=False)
+
     async def chat_once(self):
         """Single conversation turn"""
         from resource_limiter import with_timeout
@@ -1534,15 +1879,8 @@ class VoiceAssistant:
             if keyword in text:
                 backend.clear_history()
                 # Respond in detected language
-                clear_messages = {
-                    "zh": "好的，已清空对话记录，重新开始。",
-                    "en": "OK, conversation cleared. Let's start fresh.",
-                    "ja": "会話履歴をクリアしました。",
-                    "ko": "대화 기록을 지웠습니다.",
-                    "yue": "好，已清空對話記錄。",
-                }
-                msg = clear_messages.get(language, clear_messages["en"])
-                await self.speak(msg, language)
+                msg = CLEAR_HISTORY_RESPONSES.get(language, CLEAR_HISTORY_RESPONSES["en"])
+                await self.speak_cached(msg, language)
                 return True
 
         if USE_STREAMING:
@@ -1552,6 +1890,26 @@ class VoiceAssistant:
             interrupted = False
             generation_done = False
 
+            def discard_tts(tts_task):
+                """Cancel a pending TTS task, or delete the audio file it produced."""
+                if not tts_task.done():
+                    tts_task.cancel()
+                elif not tts_task.cancelled() and tts_task.exception() is None:
+                    audio_file = tts_task.result()
+                    if audio_file:
+                        release_temp_file(audio_file)
+
+            # Bound how many Edge TTS requests run ahead of playback
+            tts_slots = asyncio.Semaphore(TTS_PREFETCH)
+
+            async def synthesize(sentence):
+                async with tts_slots:
+                    return await with_timeout(
+                        self.generate_audio(sentence, language),
+                        seconds=30,
+                        operation_name="TTS_streaming",
+                    )
+
             async def generate_worker():
                 nonlocal generation_done
                 try:
@@ -1559,19 +1917,11 @@ class VoiceAssistant:
                         if interrupted:
                             break
                         if sentence:
+                            # Start TTS immediately so the request overlaps with
+                            # LLM streaming and with playback of earlier sentences
                             # TTS 生成添加 30 秒超时保护
-                            try:
-                                audio_file = await with_timeout(
-                                    self.generate_audio(sentence, language),
-                                    seconds=30,
-                                    operation_name="TTS_streaming",
-                                )
-                                if audio_file:
-                                    await audio_queue.put(audio_file)
-                            except TimeoutError:
-                                logger.error("tts_streaming_timeout", timeout_seconds=30)
-                                # 继续处理下一句，不中断整个流
-                                continue
+                            tts_task = asyncio.create_task(synthesize(sentence))
+                            await audio_queue.put(tts_task)
                 finally:
                     generation_done = True
                     await audio_queue.put(None)
@@ -1579,30 +1929,35 @@ class VoiceAssistant:
             async def play_worker():
                 nonlocal interrupted
                 while True:
-                    audio_file = await audio_queue.get()
-                    if audio_file is None:
+                    tts_task = await audio_queue.get()
+                    if tts_task is None:
                         break
                     if interrupted:
                         # Clean up remaining audio files
-                        if os.path.exists(audio_file):
-                            os.remove(audio_file)
+                        discard_tts(tts_task)
+                        continue
+                    try:
+                        audio_file = await tts_task
+                    except TimeoutError:
+                        logger.error("tts_streaming_timeout", timeout_seconds=30)
+                        # 继续处理下一句，不中断整个流
+                        continue
+                    if not audio_file:
                         continue
                     # Play audio without interruption
                     was_interrupted = await self.play_audio_with_barge_in(audio_file)
                     if was_interrupted:
                         interrupted = True
-                        # Drain remaining queue
-                        while not audio_queue.empty():
-                            try:
-                                remaining = audio_queue.get_nowait()
-                                if remaining and os.path.exists(remaining):
-                                    os.remove(remaining)
-                            except asyncio.QueueEmpty:
-                                break
                         break
 
             await asyncio.gather(generate_worker(), play_worker())
 
+            # Drop TTS work queued after playback stopped
+            while not audio_queue.empty():
+                tts_task = audio_queue.get_nowait()
+                if tts_task is not None:
+                    discard_tts(tts_task)
+
             if interrupted:
                 # User interrupted, set flag for immediate recording
                 self.was_interrupted = True
@@ -1683,10 +2038,14 @@ class VoiceAssistant:
 
         print(f"{'=' * 60}\n", file=sys.stderr)
 
-        # Preload models (will download if needed)
-        self.load_vad()
-        self.load_asr()
-        self.load_llm()
+        # Preload models (will download if needed); they are independent, so load
+        # VAD and ASR in parallel threads while the LLM and TTS warm up
+        await asyncio.gather(
+            asyncio.to_thread(self.load_vad),
+            asyncio.to_thread(self.load_asr),
+            self.warm_llm(),
+            self.warm_tts(),
+        )
 
         logger.info("ready_for_input")
 
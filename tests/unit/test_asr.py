@@ -25,10 +25,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from speekium import (
     ASR_MODEL,
+    ASR_NUM_THREADS,
     DEFAULT_LANGUAGE,
     SAMPLE_RATE,
     VoiceAssistant,
+    _temp_files,
     create_secure_temp_file,
+    release_temp_file,
 )
 
 
@@ -67,7 +70,11 @@ class TestASRModelLoading:
         # Verify
         assert model is not None
         assert assistant.asr_model is mock_model
-        mock_automodel.assert_called_once_with(model=ASR_MODEL, device="cpu")
+        mock_automodel.assert_called_once()
+        kwargs = mock_automodel.call_args.kwargs
+        assert kwargs["model"] == ASR_MODEL
+        assert kwargs["ncpu"] == ASR_NUM_THREADS
+        assert kwargs["disable_update"] is True
 
     @patch("funasr.AutoModel")
     def test_load_asr_cached(self, mock_automodel):
@@ -93,56 +100,52 @@ class TestASRModelLoading:
         assistant.load_asr()
 
         # Verify CPU device is used
-        mock_automodel.assert_called_with(model=ASR_MODEL, device="cpu")
+        assert mock_automodel.call_args.kwargs["device"] == "cpu"
 
 
 class TestAudioTranscription:
     """测试音频转录功能"""
 
     @patch("funasr.AutoModel")
-    @patch("speekium.create_secure_temp_file")
-    @patch("scipy.io.wavfile.write")
-    @patch("os.path.exists")
-    @patch("os.remove")
-    def test_transcribe_success(
-        self, mock_remove, mock_exists, mock_write_wav, mock_temp_file, mock_automodel
-    ):
+    def test_transcribe_success(self, mock_automodel):
         """测试成功转录音频"""
         # Setup mocks
         mock_model = MagicMock()
         mock_model.generate.return_value = [{"text": "<|zh|>你好世界</s>"}]
         mock_automodel.return_value = mock_model
-        mock_temp_file.return_value = "/tmp/test_audio.wav"
-        mock_exists.return_value = True
 
         # Create test audio
         audio = np.random.randn(16000).astype(np.float32)
 
         assistant = VoiceAssistant()
+        assistant.load_asr()
+        mock_model.generate.reset_mock()  # load_asr 预热时也会调用 generate
         text, language = assistant.transcribe(audio)
 
         # Verify
         assert "<|zh|>" in text or "你好世界" in text
         assert language == "zh"
         mock_model.generate.assert_called_once()
-        mock_write_wav.assert_called_once()
-        mock_remove.assert_called_once_with("/tmp/test_audio.wav")
 
     @patch("funasr.AutoModel")
-    @patch("speekium.create_secure_temp_file")
-    @patch("scipy.io.wavfile.write")
-    @patch("os.path.exists")
-    @patch("os.remove")
-    def test_transcribe_empty_result(
-        self, mock_remove, mock_exists, mock_write_wav, mock_temp_file, mock_automodel
-    ):
+    def test_transcribe_skips_short_audio(self, mock_automodel):
+        """测试过短音频直接返回，不加载也不调用模型"""
+        audio = np.zeros(int(SAMPLE_RATE * 0.1), dtype=np.float32)
+
+        assistant = VoiceAssistant()
+        text, language = assistant.transcribe(audio)
+
+        assert text == ""
+        assert language == DEFAULT_LANGUAGE
+        mock_automodel.assert_not_called()
+
+    @patch("funasr.AutoModel")
+    def test_transcribe_empty_result(self, mock_automodel):
         """测试转录结果为空的情况"""
         # Setup mocks
         mock_model = MagicMock()
         mock_model.generate.return_value = []
         mock_automodel.return_value = mock_model
-        mock_temp_file.return_value = "/tmp/test_audio.wav"
-        mock_exists.return_value = True
 
         audio = np.random.randn(16000).astype(np.float32)
 
@@ -156,46 +159,35 @@ class TestAudioTranscription:
     @patch("funasr.AutoModel")
     @patch("speekium.create_secure_temp_file")
     @patch("scipy.io.wavfile.write")
-    @patch("os.path.exists")
-    @patch("os.remove")
-    def test_transcribe_cleans_up_temp_file(
-        self, mock_remove, mock_exists, mock_write_wav, mock_temp_file, mock_automodel
+    def test_transcribe_passes_array_without_temp_file(
+        self, mock_write_wav, mock_temp_file, mock_automodel
     ):
-        """测试转录后清理临时文件"""
-        # Setup mocks
+        """测试直接传入音频数组，不写临时 WAV 文件"""
         mock_model = MagicMock()
         mock_model.generate.return_value = [{"text": "test"}]
         mock_automodel.return_value = mock_model
-        tmp_file_path = "/tmp/test_audio.wav"
-        mock_temp_file.return_value = tmp_file_path
-        mock_exists.return_value = True
 
         audio = np.random.randn(16000).astype(np.float32)
 
         assistant = VoiceAssistant()
         assistant.transcribe(audio)
 
-        # Verify temp file cleanup
-        mock_remove.assert_called_once_with(tmp_file_path)
+        passed = mock_model.generate.call_args.kwargs["input"]
+        assert isinstance(passed, np.ndarray)
+        assert passed.dtype == np.float32
+        mock_temp_file.assert_not_called()
+        mock_write_wav.assert_not_called()
 
 
 class TestLanguageDetection:
     """测试语言检测功能"""
 
     @patch("funasr.AutoModel")
-    @patch("speekium.create_secure_temp_file")
-    @patch("scipy.io.wavfile.write")
-    @patch("os.path.exists")
-    @patch("os.remove")
-    def test_detect_chinese(
-        self, mock_remove, mock_exists, mock_write_wav, mock_temp_file, mock_automodel
-    ):
+    def test_detect_chinese(self, mock_automodel):
         """测试检测中文"""
         mock_model = MagicMock()
         mock_model.generate.return_value = [{"text": "<|zh|>你好</s>"}]
         mock_automodel.return_value = mock_model
-        mock_temp_file.return_value = "/tmp/test.wav"
-        mock_exists.return_value = True
 
         audio = np.random.randn(16000).astype(np.float32)
         assistant = VoiceAssistant()
@@ -204,19 +196,11 @@ class TestLanguageDetection:
         assert language == "zh"
 
     @patch("funasr.AutoModel")
-    @patch("speekium.create_secure_temp_file")
-    @patch("scipy.io.wavfile.write")
-    @patch("os.path.exists")
-    @patch("os.remove")
-    def test_detect_english(
-        self, mock_remove, mock_exists, mock_write_wav, mock_temp_file, mock_automodel
-    ):
+    def test_detect_english(self, mock_automodel):
         """测试检测英文"""
         mock_model = MagicMock()
         mock_model.generate.return_value = [{"text": "<|en|>hello world</s>"}]
         mock_automodel.return_value = mock_model
-        mock_temp_file.return_value = "/tmp/test.wav"
-        mock_exists.return_value = True
 
         audio = np.random.randn(16000).astype(np.float32)
         assistant = VoiceAssistant()
@@ -225,19 +209,11 @@ class TestLanguageDetection:
         assert language == "en"
 
     @patch("funasr.AutoModel")
-    @patch("speekium.create_secure_temp_file")
-    @patch("scipy.io.wavfile.write")
-    @patch("os.path.exists")
-    @patch("os.remove")
-    def test_detect_japanese(
-        self, mock_remove, mock_exists, mock_write_wav, mock_temp_file, mock_automodel
-    ):
+    def test_detect_japanese(self, mock_automodel):
         """测试检测日语"""
         mock_model = MagicMock()
         mock_model.generate.return_value = [{"text": "<|ja|>こんにちは</s>"}]
         mock_automodel.return_value = mock_model
-        mock_temp_file.return_value = "/tmp/test.wav"
-        mock_exists.return_value = True
 
         audio = np.random.randn(16000).astype(np.float32)
         assistant = VoiceAssistant()
@@ -246,19 +222,11 @@ class TestLanguageDetection:
         assert language == "ja"
 
     @patch("funasr.AutoModel")
-    @patch("speekium.create_secure_temp_file")
-    @patch("scipy.io.wavfile.write")
-    @patch("os.path.exists")
-    @patch("os.remove")
-    def test_no_language_tag_uses_default(
-        self, mock_remove, mock_exists, mock_write_wav, mock_temp_file, mock_automodel
-    ):
+    def test_no_language_tag_uses_default(self, mock_automodel):
         """测试无语言标签时使用默认语言"""
         mock_model = MagicMock()
         mock_model.generate.return_value = [{"text": "no language tag"}]
         mock_automodel.return_value = mock_model
-        mock_temp_file.return_value = "/tmp/test.wav"
-        mock_exists.return_value = True
 
         audio = np.random.randn(16000).astype(np.float32)
         assistant = VoiceAssistant()
@@ -272,24 +240,18 @@ class TestAsyncTranscription:
 
     @pytest.mark.asyncio
     @patch("funasr.AutoModel")
-    @patch("speekium.create_secure_temp_file")
-    @patch("scipy.io.wavfile.write")
-    @patch("os.path.exists")
-    @patch("os.remove")
-    async def test_transcribe_async_success(
-        self, mock_remove, mock_exists, mock_write_wav, mock_temp_file, mock_automodel
-    ):
+    async def test_transcribe_async_success(self, mock_automodel):
         """测试异步转录成功"""
         # Setup mocks
         mock_model = MagicMock()
         mock_model.generate.return_value = [{"text": "<|zh|>异步测试</s>"}]
         mock_automodel.return_value = mock_model
-        mock_temp_file.return_value = "/tmp/async_test.wav"
-        mock_exists.return_value = True
 
         audio = np.random.randn(16000).astype(np.float32)
 
         assistant = VoiceAssistant()
+        assistant.load_asr()
+        mock_model.generate.reset_mock()  # load_asr 预热时也会调用 generate
         text, language = await assistant.transcribe_async(audio)
 
         # Verify
@@ -299,19 +261,11 @@ class TestAsyncTranscription:
 
     @pytest.mark.asyncio
     @patch("funasr.AutoModel")
-    @patch("speekium.create_secure_temp_file")
-    @patch("scipy.io.wavfile.write")
-    @patch("os.path.exists")
-    @patch("os.remove")
-    async def test_transcribe_async_runs_in_executor(
-        self, mock_remove, mock_exists, mock_write_wav, mock_temp_file, mock_automodel
-    ):
+    async def test_transcribe_async_runs_in_executor(self, mock_automodel):
         """测试异步转录在执行器中运行"""
         mock_model = MagicMock()
         mock_model.generate.return_value = [{"text": "test"}]
         mock_automodel.return_value = mock_model
-        mock_temp_file.return_value = "/tmp/test.wav"
-        mock_exists.return_value = True
 
         audio = np.random.randn(16000).astype(np.float32)
 
@@ -354,9 +308,30 @@ class TestSecureTempFileHandling:
             if tmp_file and os.path.exists(tmp_file):
                 os.remove(tmp_file)
 
+    def test_create_secure_temp_file_owner_only(self):
+        """测试临时文件权限为 0600"""
+        tmp_file = create_secure_temp_file(suffix=".wav")
+        try:
+            assert os.stat(tmp_file).st_mode & 0o777 == 0o600
+        finally:
+            release_temp_file(tmp_file)
+
+    def test_release_temp_file_deletes_and_untracks(self):
+        """测试释放临时文件会删除文件并停止跟踪"""
+        tmp_file = create_secure_temp_file(suffix=".mp3")
+        assert tmp_file in _temp_files
+
+        release_temp_file(tmp_file)
+
+        assert not os.path.exists(tmp_file)
+        assert tmp_file not in _temp_files
+
+        # Releasing twice is a no-op
+        release_temp_file(tmp_file)
+
     def test_temp_file_cleanup_on_error(self):
         """测试错误时临时文件清理"""
-        # This is tested implicitly in transcribe tests with mock_remove
+        # transcribe() no longer writes temp files; release_temp_file is covered above
         pass
 
 
@@ -378,33 +353,21 @@ class TestASRIntegration:
         assert DEFAULT_LANGUAGE in supported_langs
 
     @patch("funasr.AutoModel")
-    @patch("speekium.create_secure_temp_file")
-    @patch("scipy.io.wavfile.write")
-    @patch("os.path.exists")
-    @patch("os.remove")
-    def test_audio_format_conversion(
-        self, mock_remove, mock_exists, mock_write_wav, mock_temp_file, mock_automodel
-    ):
-        """测试音频格式转换"""
+    def test_audio_format_conversion(self, mock_automodel):
+        """测试非 float32 音频在送入模型前转换为 float32"""
         mock_model = MagicMock()
         mock_model.generate.return_value = [{"text": "test"}]
         mock_automodel.return_value = mock_model
-        mock_temp_file.return_value = "/tmp/test.wav"
-        mock_exists.return_value = True
 
-        # Input is float32 in range [-1, 1]
-        audio = np.random.randn(16000).astype(np.float32)
+        # Input is float64 in range [-1, 1]
+        audio = np.random.uniform(-1, 1, 16000)
 
         assistant = VoiceAssistant()
         assistant.transcribe(audio)
 
-        # Verify write_wav was called
-        mock_write_wav.assert_called_once()
-        call_args = mock_write_wav.call_args
-        written_audio = call_args[0][2]
-
-        # Audio should be converted to int16
-        assert written_audio.dtype == np.int16
+        passed = mock_model.generate.call_args.kwargs["input"]
+        assert passed.dtype == np.float32
+        np.testing.assert_allclose(passed, audio.astype(np.float32))
 
 
 class TestASRErrorHandling:
@@ -423,45 +386,32 @@ class TestASRErrorHandling:
         assert "Model load failed" in str(exc_info.value)
 
     @patch("funasr.AutoModel")
-    @patch("speekium.create_secure_temp_file")
-    @patch("scipy.io.wavfile.write")
-    def test_transcribe_write_failure(self, mock_write_wav, mock_temp_file, mock_automodel):
-        """测试写入临时文件失败"""
+    def test_transcribe_float32_input_not_copied(self, mock_automodel):
+        """测试 float32 输入直接传给模型，不做额外转换"""
         mock_model = MagicMock()
+        mock_model.generate.return_value = [{"text": "test"}]
         mock_automodel.return_value = mock_model
-        mock_temp_file.return_value = "/tmp/test.wav"
-        mock_write_wav.side_effect = OSError("Write failed")
 
         audio = np.random.randn(16000).astype(np.float32)
 
         assistant = VoiceAssistant()
-        with pytest.raises(OSError):
-            assistant.transcribe(audio)
+        assistant.transcribe(audio)
+
+        assert mock_model.generate.call_args.kwargs["input"] is audio
 
     @patch("funasr.AutoModel")
-    @patch("speekium.create_secure_temp_file")
-    @patch("scipy.io.wavfile.write")
-    @patch("os.path.exists")
-    @patch("os.remove")
-    def test_transcribe_generation_failure(
-        self, mock_remove, mock_exists, mock_write_wav, mock_temp_file, mock_automodel
-    ):
-        """测试 ASR 生成失败"""
+    def test_transcribe_generation_failure(self, mock_automodel):
+        """测试 ASR 生成失败时异常向上抛出"""
         mock_model = MagicMock()
         mock_model.generate.side_effect = RuntimeError("Generation failed")
         mock_automodel.return_value = mock_model
-        mock_temp_file.return_value = "/tmp/test.wav"
-        mock_exists.return_value = True
 
         audio = np.random.randn(16000).astype(np.float32)
 
         assistant = VoiceAssistant()
-        with pytest.raises(RuntimeError):
+        with pytest.raises(RuntimeError, match="Generation failed"):
             assistant.transcribe(audio)
 
-        # Temp file should still be cleaned up
-        mock_remove.assert_called_once_with("/tmp/test.wav")
-
 
 # Mark tests for categorization
 pytest.mark.unit
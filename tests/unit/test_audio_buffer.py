@@ -0,0 +1,98 @@
+"""
+AudioBuffer 单元测试
+
+测试预分配录音缓冲区：
+1. 写入与读取
+2. 容量上限
+3. 复用（clear）
+4. ChunkRing 环形队列
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audio_buffer import AudioBuffer, ChunkRing
+
+
+class TestAudioBuffer:
+    """测试预分配录音缓冲区"""
+
+    def test_write_and_read(self):
+        """测试写入多个音频块后按顺序读取"""
+        buf = AudioBuffer(1024)
+        buf.write(np.ones(512, dtype=np.float32))
+        buf.write(np.full(256, 0.5, dtype=np.float32))
+
+        audio = buf.to_array()
+        assert len(buf) == 768
+        assert audio.dtype == np.float32
+        assert np.all(audio[:512] == 1.0)
+        assert np.all(audio[512:] == 0.5)
+
+    def test_write_from_channel_view(self):
+        """测试直接写入 indata[:, 0] 视图"""
+        indata = np.arange(20, dtype=np.float32).reshape(10, 2)
+        buf = AudioBuffer(16)
+        buf.write(indata[:, 0])
+
+        np.testing.assert_array_equal(buf.view(), indata[:, 0])
+
+    def test_capacity_limit(self):
+        """测试超出容量时截断"""
+        buf = AudioBuffer(600)
+        assert buf.write(np.zeros(512, dtype=np.float32)) == 512
+        assert buf.write(np.zeros(512, dtype=np.float32)) == 88
+        assert buf.write(np.zeros(512, dtype=np.float32)) == 0
+        assert buf.is_full
+        assert len(buf) == buf.capacity == 600
+
+    def test_clear_reuses_storage(self):
+        """测试 clear 后复用同一块内存"""
+        buf = AudioBuffer(512)
+        buf.write(np.ones(512, dtype=np.float32))
+        copy = buf.to_array()
+        buf.clear()
+
+        assert len(buf) == 0
+        assert not buf.is_full
+        buf.write(np.zeros(128, dtype=np.float32))
+        # to_array() 返回的是独立副本，不受复用影响
+        assert np.all(copy == 1.0)
+
+
+class TestChunkRing:
+    """测试音频回调与消费线程之间的环形队列"""
+
+    def test_push_and_pop_in_order(self):
+        """测试按写入顺序取出"""
+        ring = ChunkRing(4, 8)
+        out = np.empty(8, dtype=np.float32)
+        ring.push(np.full(8, 1.0, dtype=np.float32))
+        ring.push(np.full(8, 2.0, dtype=np.float32))
+
+        assert len(ring) == 2
+        assert ring.pop_into(out) and np.all(out == 1.0)
+        assert ring.pop_into(out) and np.all(out == 2.0)
+        assert not ring.pop_into(out)
+        assert len(ring) == 0
+
+    def test_overflow_drops_oldest(self):
+        """测试消费者落后时丢弃最旧的块"""
+        ring = ChunkRing(2, 4)
+        out = np.empty(4, dtype=np.float32)
+        for value in range(5):
+            ring.push(np.full(4, value, dtype=np.float32))
+
+        assert len(ring) == 2
+        assert ring.pop_into(out) and np.all(out == 3.0)
+        assert ring.pop_into(out) and np.all(out == 4.0)
+        assert not ring.pop_into(out)
+
+
+pytestmark = pytest.mark.unit
@@ -7,14 +7,17 @@ LLM Backend 单元测试
 3. 对话历史管理
 """
 
+import sys
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from backends import (
     MAX_INPUT_LENGTH,
+    AnthropicBackend,
     ClaudeBackend,
     OllamaBackend,
+    SentenceBuffer,
     create_backend,
     validate_input,
 )
@@ -209,6 +212,112 @@ class TestClaudeBackend:
         assert len(backend.history) == 1
 
 
+class TestClaudeStreaming:
+    """测试 Claude CLI 流式调用（用 Python 脚本模拟 CLI）"""
+
+    FAKE_CLI = (
+        "import json, sys\n"
+        "req = json.loads(sys.stdin.readline())\n"
+        "text = req['message']['content'][0]['text']\n"
+        # init 帧可能超过 asyncio 默认的 64 KB 行长度限制
+        "print(json.dumps({'type': 'system', 'subtype': 'init', 'tools': ['x' * 100000]}))\n"
+        "for part in ['你说的是：', text, '。']:\n"
+        "    event = {'type': 'content_block_delta', 'delta': {'type': 'text_delta', 'text': part}}\n"
+        "    print(json.dumps({'type': 'stream_event', 'event': event}), flush=True)\n"
+    )
+
+    def _make_backend(self):
+        backend = ClaudeBackend("You are a helpful assistant")
+        backend._stream_command = lambda: [sys.executable, "-c", self.FAKE_CLI]
+        return backend
+
+    async def _drop_warm_process(self, backend):
+        process = backend._warm_process
+        if process is not None and process.returncode is None:
+            process.kill()
+            await process.wait()
+
+    async def test_chat_stream_sends_prompt_via_stdin(self):
+        """测试提示词通过 stdin 发送给 CLI"""
+        backend = self._make_backend()
+        sentences = [s async for s in backend.chat_stream("今天天气怎么样")]
+        await self._drop_warm_process(backend)
+
+        assert "".join(sentences) == "你说的是：今天天气怎么样。"
+        assert backend.history[-1]["content"] == "你说的是：今天天气怎么样。"
+
+    async def test_chat_stream_uses_prewarmed_process(self):
+        """测试复用预热的 CLI 进程，并为下一轮重新预热"""
+        backend = self._make_backend()
+        await backend.prewarm()
+        warm = backend._warm_process
+        assert warm is not None
+
+        _ = [s async for s in backend.chat_stream("你好")]
+        await self._drop_warm_process(backend)
+
+        assert warm.returncode == 0
+        assert backend._warm_process is not warm
+
+    async def test_close_terminates_prewarmed_process(self):
+        """测试 close() 终止空闲的预热进程"""
+        backend = self._make_backend()
+        await backend.prewarm()
+        warm = backend._warm_process
+
+        backend.close()
+        await warm.wait()
+
+        assert warm.returncode is not None
+        assert backend._warm_process is None
+        backend.close()  # No process left: no-op
+
+
+class TestAnthropicBackend:
+    """测试 Anthropic Messages API 后端"""
+
+    def test_create_anthropic_backend(self):
+        """测试工厂函数创建 Anthropic 后端"""
+        backend = create_backend("anthropic", "You are a helpful assistant", api_key="sk-test")
+        assert isinstance(backend, AnthropicBackend)
+        assert backend.model
+
+    async def test_chat_stream_parses_sse(self):
+        """测试解析 SSE 流并按句输出"""
+        import asyncio
+        import json
+
+        import httpx
+
+        events = [
+            {"type": "message_start", "message": {}},
+            {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "你好，"}},
+            {
+                "type": "content_block_delta",
+                "delta": {"type": "text_delta", "text": "很高兴见到你。"},
+            },
+            {"type": "message_stop"},
+        ]
+        body = "".join(f"event: {e['type']}\ndata: {json.dumps(e)}\n\n" for e in events)
+
+        def handler(request):
+            assert request.headers["x-api-key"] == "sk-test"
+            payload = json.loads(request.content)
+            assert payload["stream"] is True
+            assert payload["messages"][-1] == {"role": "user", "content": "你好"}
+            return httpx.Response(200, text=body)
+
+        backend = AnthropicBackend("You are a helpful assistant", api_key="sk-test")
+        backend._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        backend._client_loop = asyncio.get_running_loop()
+
+        sentences = [s async for s in backend.chat_stream("你好")]
+        await backend._client.aclose()
+
+        assert sentences == ["你好，很高兴见到你。"]
+        assert backend.history[-1] == {"role": "assistant", "content": "你好，很高兴见到你。"}
+
+
 class TestOllamaBackend:
     """测试 Ollama 后端"""
 
@@ -258,6 +367,60 @@ class TestOllamaBackend:
         assert len(backend.history) == 0
 
 
+class TestSentenceBuffer:
+    """测试流式输出分句（LLM → TTS 流水线）"""
+
+    def test_split_chinese_sentences(self):
+        """测试中文标点分句"""
+        buf = SentenceBuffer()
+        sentences = buf.feed("今天天气很好，适合出去散步。明天可能会下雨，记得带伞！")
+        assert sentences == ["今天天气很好，适合出去散步。", "明天可能会下雨，记得带伞！"]
+        assert buf.flush() == ""
+
+    def test_split_english_sentences_across_chunks(self):
+        """测试英文句子跨 token 分句"""
+        buf = SentenceBuffer()
+        assert buf.feed("The weather is nice today.") == []
+        assert buf.feed(" Take an umbrella") == ["The weather is nice today."]
+        assert buf.flush() == "Take an umbrella"
+
+    def test_keep_decimals_and_abbreviations(self):
+        """测试小数和缩写不被切分"""
+        buf = SentenceBuffer()
+        assert buf.feed("Dr. Smith measured 3.5 degrees. ") == ["Dr. Smith measured 3.5 degrees."]
+
+    def test_progressive_chunking(self):
+        """测试渐进分块：首句尽快输出，后续句子合并为更长的块"""
+        buf = SentenceBuffer(min_length=10, max_length=40)
+        first = buf.feed("今天天气很好，适合出去散步。")
+        assert first == ["今天天气很好，适合出去散步。"]
+        assert buf.target_length == 20
+
+        # 第二句不足 20 字，等待与下一句合并
+        assert buf.feed("明天可能会下雨，记得带伞。") == []
+        assert buf.feed("后天就会放晴了。") == ["明天可能会下雨，记得带伞。后天就会放晴了。"]
+        assert buf.target_length == 40
+
+    def test_token_by_token_feed(self):
+        """测试逐字输入时的分句结果与整段输入一致"""
+        text = "Dr. Smith said hi. 今天天气很好，适合出去散步。Version 3.5 is out! Bye"
+        buf = SentenceBuffer()
+        sentences = []
+        for ch in text:
+            sentences.extend(buf.feed(ch))
+        assert sentences == [
+            "Dr. Smith said hi.",
+            "今天天气很好，适合出去散步。",
+            "Version 3.5 is out!",
+        ]
+        assert buf.flush() == "Bye"
+
+    def test_merge_short_fragments(self):
+        """测试过短片段与下一句合并"""
+        buf = SentenceBuffer()
+        assert buf.feed("好的。我来帮你查一下明天的天气。") == ["好的。我来帮你查一下明天的天气。"]
+
+
 class TestSecurityIntegration:
     """集成安全测试 - 验证 P0 修复在实际使用中生效"""
 
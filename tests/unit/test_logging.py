@@ -42,6 +42,23 @@ class TestLoggerConfiguration:
         test_logger = get_logger("test")
         assert test_logger is not None
 
+    def test_json_format_renders_exception_on_one_line(self, capsys):
+        """测试 JSON 格式下 logger.exception 输出单行记录并包含堆栈"""
+        import json
+
+        configure_logging(level="INFO", format="json", colored=False)
+        test_logger = get_logger("test_exception")
+        try:
+            raise ValueError("boom")
+        except ValueError as e:
+            test_logger.exception("operation_failed", error=str(e))
+
+        lines = capsys.readouterr().out.strip().splitlines()
+        assert len(lines) == 1
+        record = json.loads(lines[0])
+        assert record["event"] == "operation_failed"
+        assert "ValueError: boom" in record["exception"]
+
     def test_configure_logging_auto_format(self):
         """测试自动格式选择"""
         configure_logging(level="INFO", format="auto", colored=False)
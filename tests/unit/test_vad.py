@@ -28,10 +28,15 @@ except ImportError:
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from speekium import (
+    CHUNK_SIZE,
+    MAX_RECORDING_CHUNKS,
     MAX_RECORDING_DURATION,
+    MIN_SPEECH_CHUNKS,
     MIN_SPEECH_DURATION,
+    PRE_BUFFER_CHUNKS,
     SAMPLE_RATE,
     SILENCE_AFTER_SPEECH,
+    SILENCE_CHUNKS,
     VAD_CONSECUTIVE_THRESHOLD,
     VAD_PRE_BUFFER,
     VAD_THRESHOLD,
@@ -91,6 +96,7 @@ class TestVADModelLoading:
             model="silero_vad",
             force_reload=False,
             trust_repo=True,
+            onnx=True,
         )
 
     @patch("torch.hub.load")
@@ -119,6 +125,22 @@ class TestVADModelLoading:
         # Model should have reset_states method
         assert hasattr(assistant.vad_model, "reset_states")
 
+    @patch("torch.hub.load")
+    def test_load_vad_warmup(self, mock_torch_load):
+        """测试加载后用静音块预热 VAD 模型"""
+        mock_model = MagicMock()
+        mock_torch_load.return_value = (mock_model, None)
+
+        assistant = VoiceAssistant()
+        assistant.load_vad()
+
+        # One dummy chunk, then states are reset for the real stream
+        mock_model.assert_called_once()
+        chunk, sr = mock_model.call_args[0]
+        assert len(chunk) == CHUNK_SIZE
+        assert sr == SAMPLE_RATE
+        mock_model.reset_states.assert_called_once()
+
 
 class TestDetectSpeechStart:
     """测试语音开始检测功能"""
@@ -151,6 +173,27 @@ class TestDetectSpeechStart:
         assert result is True
         mock_vad.reset_states.assert_called_once()
 
+    @patch("sounddevice.InputStream")
+    @patch.object(VoiceAssistant, "load_vad")
+    def test_detect_speech_start_keeps_audio(self, mock_load_vad, mock_input_stream):
+        """测试检测到语音时保留触发音频，供下一段录音使用"""
+        mock_vad = MagicMock()
+        mock_vad.return_value.item.return_value = 0.8
+        mock_load_vad.return_value = mock_vad
+
+        def create_mock_stream(callback, **kwargs):
+            for _ in range(VAD_CONSECUTIVE_THRESHOLD):
+                audio_data = np.random.randn(512, 1).astype(np.float32)
+                callback(audio_data, 512, None, None)
+            return MagicMock()
+
+        mock_input_stream.side_effect = create_mock_stream
+
+        assistant = VoiceAssistant()
+        assert assistant.detect_speech_start(timeout=0.5, keep_audio=True) is True
+        assert len(assistant.interrupt_audio_buffer) == VAD_CONSECUTIVE_THRESHOLD
+        assert all(len(chunk) == 512 for chunk in assistant.interrupt_audio_buffer)
+
     @patch("sounddevice.InputStream")
     @patch.object(VoiceAssistant, "load_vad")
     def test_detect_speech_start_timeout(self, mock_load_vad, mock_input_stream):
@@ -247,9 +290,7 @@ class TestRecordWithVAD:
     def test_record_with_vad_uses_correct_chunk_size(self):
         """测试 VAD 使用正确的音频块大小"""
         # Silero VAD requires 512 samples @ 16kHz
-        expected_chunk_size = 512
-        # This is implementation detail, verified through code inspection
-        assert expected_chunk_size == 512
+        assert CHUNK_SIZE == 512
 
 
 class TestVADIntegration:
@@ -264,36 +305,23 @@ class TestVADIntegration:
 
     def test_silence_detection_config(self):
         """测试静音检测配置合理性"""
-        # Calculate silence chunks needed
-        chunk_size = 512
-        max_silence_chunks = int(SILENCE_AFTER_SPEECH * SAMPLE_RATE / chunk_size)
-
         # Should require multiple chunks to confirm silence
-        assert max_silence_chunks > 5
+        assert SILENCE_CHUNKS > 5
 
     def test_min_speech_duration_config(self):
         """测试最小语音时长配置"""
-        chunk_size = 512
-        min_speech_chunks = int(MIN_SPEECH_DURATION * SAMPLE_RATE / chunk_size)
-
         # Should require multiple chunks to confirm speech
-        assert min_speech_chunks > 3
+        assert MIN_SPEECH_CHUNKS > 3
 
     def test_pre_buffer_size_calculation(self):
         """测试预缓冲大小计算"""
-        chunk_size = 512
-        pre_buffer_size = int(VAD_PRE_BUFFER * SAMPLE_RATE / chunk_size)
-
         # Pre-buffer should be reasonable
-        assert 5 <= pre_buffer_size <= 20
+        assert 5 <= PRE_BUFFER_CHUNKS <= 20
 
     def test_max_recording_chunks(self):
         """测试最大录音块数计算"""
-        chunk_size = 512
-        max_chunks = int(MAX_RECORDING_DURATION * SAMPLE_RATE / chunk_size)
-
         # Should allow reasonable recording duration
-        assert max_chunks > 100
+        assert MAX_RECORDING_CHUNKS > 100
 
 
 class TestVADAudioProcessing:
@@ -132,3 +132,21 @@ class TestAudioBuffer:
         test_audio = [np.array([1, 2, 3]), np.array([4, 5, 6])]
         pipeline.audio_buffer = test_audio
         assert len(pipeline.audio_buffer) == 2
+
+
+class TestVADRecording:
+    """测试基于 Silero VAD 的录音"""
+
+    def test_record_with_vad_requires_model(self):
+        """测试未加载 VAD 模型时不开始录音"""
+        pipeline = VoicePipeline()
+        with patch("sounddevice.InputStream") as mock_stream:
+            assert pipeline.record_with_vad() is None
+            mock_stream.assert_not_called()
+
+    def test_detect_speech_start_requires_model(self):
+        """测试未加载 VAD 模型时返回 False"""
+        pipeline = VoicePipeline()
+        with patch("sounddevice.InputStream") as mock_stream:
+            assert pipeline.detect_speech_start(timeout=0.1) is False
+            mock_stream.assert_not_called()
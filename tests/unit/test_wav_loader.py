@@ -0,0 +1,183 @@
+"""
+WAV 读取单元测试
+
+测试 read_wav_float32：
+1. 16/32 位整数与 32 位浮点 PCM（单声道、立体声）
+2. 额外 chunk（含奇数长度填充字节、data 之后的 chunk）
+3. 不支持的格式回退到 scipy 并正确归一化
+4. 非法文件
+"""
+
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from wav_loader import read_wav_float32
+
+
+def write_wav(path, pcm, sample_rate=16000, format_tag=1, extra_chunks=(), fmt_extra=b""):
+    """按给定格式手写 RIFF/WAVE 文件（pcm 为 (frames,) 或 (frames, channels) 数组）"""
+    channels = 1 if pcm.ndim == 1 else pcm.shape[1]
+    bits = pcm.dtype.itemsize * 8
+    block_align = channels * pcm.dtype.itemsize
+    fmt = struct.pack(
+        "<HHIIHH",
+        format_tag,
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        bits,
+    )
+    fmt += fmt_extra
+    body = b"WAVE" + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+    for chunk_id, payload in extra_chunks:
+        body += chunk_id + struct.pack("<I", len(payload)) + payload
+        if len(payload) & 1:
+            body += b"\x00"
+    data = pcm.astype(pcm.dtype.newbyteorder("<")).tobytes()
+    body += b"data" + struct.pack("<I", len(data)) + data
+    Path(path).write_bytes(b"RIFF" + struct.pack("<I", len(body)) + body)
+
+
+class TestReadWavFloat32:
+    """测试 PTT WAV 读取"""
+
+    def test_mono_int16(self, tmp_path):
+        """测试单声道 16 位 PCM 归一化到 [-1, 1]"""
+        pcm = np.array([0, 16384, -32768, 32767], dtype=np.int16)
+        path = tmp_path / "mono16.wav"
+        write_wav(path, pcm)
+
+        sample_rate, samples = read_wav_float32(str(path))
+
+        assert sample_rate == 16000
+        assert samples.dtype == np.float32
+        np.testing.assert_allclose(samples, pcm / 32768.0)
+
+    def test_stereo_int16_downmix(self, tmp_path):
+        """测试立体声取左右声道平均"""
+        pcm = np.array([[16384, 0], [-16384, -16384], [32767, -32768]], dtype=np.int16)
+        path = tmp_path / "stereo16.wav"
+        write_wav(path, pcm, sample_rate=44100)
+
+        sample_rate, samples = read_wav_float32(str(path))
+
+        assert sample_rate == 44100
+        assert samples.dtype == np.float32
+        np.testing.assert_allclose(samples, pcm.mean(axis=1) / 32768.0, atol=1e-6)
+
+    def test_mono_int32(self, tmp_path):
+        """测试 32 位整数 PCM"""
+        pcm = np.array([0, 1 << 30, -(1 << 31)], dtype=np.int32)
+        path = tmp_path / "mono32.wav"
+        write_wav(path, pcm)
+
+        _, samples = read_wav_float32(str(path))
+
+        np.testing.assert_allclose(samples, [0.0, 0.5, -1.0])
+
+    def test_mono_float32(self, tmp_path):
+        """测试 32 位浮点 PCM 原样读取"""
+        pcm = np.array([0.0, 0.25, -0.75], dtype=np.float32)
+        path = tmp_path / "float32.wav"
+        write_wav(path, pcm, format_tag=3)
+
+        _, samples = read_wav_float32(str(path))
+
+        np.testing.assert_array_equal(samples, pcm)
+
+    def test_skips_odd_sized_extra_chunk(self, tmp_path):
+        """测试跳过奇数长度的额外 chunk（含填充字节）"""
+        pcm = np.array([100, -100, 200], dtype=np.int16)
+        path = tmp_path / "list.wav"
+        write_wav(path, pcm, extra_chunks=[(b"LIST", b"INFOabc")])
+
+        _, samples = read_wav_float32(str(path))
+
+        np.testing.assert_allclose(samples, pcm / 32768.0)
+
+    def test_ignores_chunk_after_data(self, tmp_path):
+        """测试 data 之后的 chunk（LIST/id3）不被当作采样读取"""
+        pcm = np.array([100, -100, 200], dtype=np.int16)
+        path = tmp_path / "trailing.wav"
+        write_wav(path, pcm)
+        with open(path, "ab") as f:
+            f.write(b"LIST" + struct.pack("<I", 8) + b"INFOabcd")
+
+        _, samples = read_wav_float32(str(path))
+
+        np.testing.assert_allclose(samples, pcm / 32768.0)
+
+    def test_unfinalized_data_size_reads_to_end(self, tmp_path):
+        """测试未回填的 data 大小（0xFFFFFFFF）按文件长度读取"""
+        pcm = np.array([100, -100, 200], dtype=np.int16)
+        path = tmp_path / "unfinalized.wav"
+        write_wav(path, pcm)
+        raw = bytearray(path.read_bytes())
+        size_at = raw.index(b"data") + 4
+        raw[size_at : size_at + 4] = struct.pack("<I", 0xFFFFFFFF)
+        path.write_bytes(bytes(raw))
+
+        _, samples = read_wav_float32(str(path))
+
+        np.testing.assert_allclose(samples, pcm / 32768.0)
+
+    def test_empty_data_chunk(self, tmp_path):
+        """测试空数据返回空数组"""
+        path = tmp_path / "empty.wav"
+        write_wav(path, np.zeros(0, dtype=np.int16))
+
+        _, samples = read_wav_float32(str(path))
+
+        assert samples.dtype == np.float32
+        assert len(samples) == 0
+
+    def test_extensible_int16_falls_back_scaled(self, tmp_path):
+        """测试 WAVE_FORMAT_EXTENSIBLE 16 位回退到 scipy 后仍归一化"""
+        pytest.importorskip("scipy")
+        pcm = np.array([[16384, -16384], [-32768, 0]], dtype=np.int16)
+        # cbSize, valid bits, channel mask, KSDATAFORMAT_SUBTYPE_PCM GUID
+        fmt_extra = struct.pack("<HHI", 22, 16, 0x3) + (
+            b"\x01\x00\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71"
+        )
+        path = tmp_path / "extensible.wav"
+        write_wav(path, pcm, format_tag=0xFFFE, fmt_extra=fmt_extra)
+
+        _, samples = read_wav_float32(str(path))
+
+        assert samples.dtype == np.float32
+        np.testing.assert_allclose(samples, pcm.mean(axis=1) / 32768.0, atol=1e-6)
+
+    def test_int24_falls_back_scaled(self, tmp_path):
+        """测试 24 位 PCM 回退到 scipy 后归一化到 [-1, 1]"""
+        pytest.importorskip("scipy")
+        values = [0, 1 << 22, -(1 << 23)]
+        data = b"".join(v.to_bytes(3, "little", signed=True) for v in values)
+        fmt = struct.pack("<HHIIHH", 1, 1, 16000, 16000 * 3, 3, 24)
+        body = b"WAVE" + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+        body += b"data" + struct.pack("<I", len(data)) + data
+        path = tmp_path / "int24.wav"
+        path.write_bytes(b"RIFF" + struct.pack("<I", len(body)) + body)
+
+        _, samples = read_wav_float32(str(path))
+
+        np.testing.assert_allclose(samples, [0.0, 0.5, -1.0])
+
+    def test_rejects_non_wav(self, tmp_path):
+        """测试非 WAV 文件报错"""
+        path = tmp_path / "not.wav"
+        path.write_bytes(b"ID3\x04" + b"\x00" * 32)
+
+        with pytest.raises(ValueError, match="Not a WAV file"):
+            read_wav_float32(str(path))
+
+
+# Mark tests
+pytestmark = pytest.mark.unit
@@ -0,0 +1,135 @@
+"""
+守护进程命令输入单元测试
+
+测试 SpeekiumDaemon 的 stdin 命令处理：
+1. 非 JSON、非 UTF-8、非对象请求返回错误而不是抛出异常
+2. 超长命令行被丢弃（含其剩余部分），之后的命令照常处理
+3. get_daemon_state 的 PTT 录音计数
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+try:
+    import sounddevice  # noqa: F401
+except (ImportError, OSError) as e:  # OSError: PortAudio library not found
+    pytest.skip(f"sounddevice unavailable: {e}", allow_module_level=True)
+
+# worker_daemon 导入时会设置进程资源限制，不应作用于测试进程
+with patch("resource.setrlimit"):
+    import worker_daemon
+
+
+@pytest.fixture
+def daemon():
+    """未初始化模型的守护进程实例"""
+    return worker_daemon.SpeekiumDaemon()
+
+
+def replies(capsysbinary):
+    """读取 stdout 中输出的命令回复（跳过同样写到 stdout 的日志事件）"""
+    out = capsysbinary.readouterr().out
+    return [json.loads(line) for line in out.splitlines() if line.startswith(b'{"success"')]
+
+
+class TestOnCommandLine:
+    """测试单行命令解析"""
+
+    @pytest.mark.parametrize(
+        "line",
+        [b"[1]", b'"x"', b"1", b"null", b'{"command": "health", "args": [1]}'],
+    )
+    def test_non_object_request_answered(self, daemon, capsysbinary, line):
+        """测试非对象请求或 args 返回错误"""
+        daemon._on_command_line(line)
+
+        [reply] = replies(capsysbinary)
+        assert reply["success"] is False
+        assert reply["error"].startswith("Invalid request")
+
+    @pytest.mark.parametrize("line", [b"{not json", b"\xff\xfe{}"])
+    def test_undecodable_line_answered(self, daemon, capsysbinary, line):
+        """测试非 JSON 或非 UTF-8 的行返回错误"""
+        daemon._on_command_line(line)
+
+        [reply] = replies(capsysbinary)
+        assert reply["success"] is False
+
+    def test_blank_line_ignored(self, daemon, capsysbinary):
+        """测试空行不输出任何内容"""
+        daemon._on_command_line(b"  \n")
+
+        assert replies(capsysbinary) == []
+
+
+class TestReadCommandLines:
+    """测试 stdin 读取循环"""
+
+    def test_overlong_line_dropped(self, daemon, capsysbinary):
+        """测试超长行只回复一次错误，剩余部分不被当作新命令"""
+
+        async def run():
+            reader = asyncio.StreamReader(limit=32)
+            reader.feed_data(b'{"command": "' + b"x" * 40)
+            reader.feed_data(b"y" * 40 + b'"}\n')
+            reader.feed_data(b'{"command": "nope"}\n')
+            reader.feed_eof()
+            await daemon._read_command_lines(reader)
+            await asyncio.gather(*daemon.immediate_tasks)
+
+        asyncio.run(run())
+
+        assert replies(capsysbinary) == [
+            {"success": False, "error": "Command line too long"},
+            {"success": False, "error": "Unknown command: nope"},
+        ]
+
+    def test_last_line_without_newline(self, daemon, capsysbinary):
+        """测试 EOF 前没有换行符的最后一行仍会处理"""
+
+        async def run():
+            reader = asyncio.StreamReader()
+            reader.feed_data(b'{"command": "nope"}')
+            reader.feed_eof()
+            await daemon._read_command_lines(reader)
+            await asyncio.gather(*daemon.immediate_tasks)
+
+        asyncio.run(run())
+
+        assert replies(capsysbinary) == [{"success": False, "error": "Unknown command: nope"}]
+
+
+class TestDaemonState:
+    """测试 get_daemon_state 回复"""
+
+    def test_reports_ptt_audio_counts(self, daemon):
+        """测试同时返回 PTT 已录制的块数（audio_frames_count）和采样数"""
+        from audio_buffer import AudioBuffer
+
+        daemon.ptt_buffer = AudioBuffer(4 * worker_daemon.CAPTURE_BLOCKSIZE)
+        daemon.ptt_buffer.write(np.zeros(worker_daemon.CAPTURE_BLOCKSIZE + 1, dtype=np.float32))
+
+        state = daemon.handle_get_daemon_state()
+
+        assert state["audio_frames_count"] == 2
+        assert state["audio_samples_count"] == worker_daemon.CAPTURE_BLOCKSIZE + 1
+
+    def test_no_ptt_audio(self, daemon):
+        """测试未录音时计数为 0"""
+        state = daemon.handle_get_daemon_state()
+
+        assert state["audio_frames_count"] == 0
+        assert state["audio_samples_count"] == 0
+
+
+# Mark tests
+pytestmark = pytest.mark.unit
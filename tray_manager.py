@@ -3,6 +3,7 @@ Speekium 系统托盘管理器
 管理系统托盘图标和菜单
 """
 
+import asyncio
 import threading
 from collections.abc import Callable
 
@@ -40,6 +41,7 @@ class TrayManager:
         self.is_running = False
         self._lock = threading.Lock()
         self.language = language  # "zh" or "en"
+        self._loop: asyncio.AbstractEventLoop | None = None  # 宿主事件循环（可选）
 
         # 回调函数
         self.on_show_window: Callable | None = None
@@ -54,6 +56,10 @@ class TrayManager:
         self.current_mode = "continuous"  # "push_to_talk" or "continuous"
         self.is_listening = False
 
+        # 预生成的图标（在 start() 中创建，切换状态时直接替换引用）
+        self._icon_idle = None
+        self._icon_active = None
+
     def create_icon_image(self, color="blue", with_indicator=False):
         """
         创建托盘图标图像
@@ -91,6 +97,7 @@ class TrayManager:
         on_clear_history: Callable | None = None,
         on_open_settings: Callable | None = None,
         on_quit: Callable | None = None,
+        loop: asyncio.AbstractEventLoop | None = None,
     ):
         """
         启动系统托盘
@@ -103,6 +110,8 @@ class TrayManager:
             on_clear_history: 清空历史回调
             on_open_settings: 打开设置回调
             on_quit: 退出应用回调
+            loop: 宿主 asyncio 事件循环。提供时托盘在该循环的默认线程池中运行，
+                  回调可以是协程函数（会被调度回该循环执行）
         """
         if self.is_running:
             print("⚠️ 系统托盘已经在运行")
@@ -120,8 +129,10 @@ class TrayManager:
         try:
             from pystray import Icon, Menu, MenuItem
 
-            # 创建图标
-            icon_image = self.create_icon_image()
+            # 创建图标（两种状态只绘制一次）
+            self._icon_idle = self.create_icon_image(with_indicator=False)
+            self._icon_active = self.create_icon_image(with_indicator=True)
+            icon_image = self._icon_active if self.is_listening else self._icon_idle
 
             # 选择翻译
             menu_text = self.TRAY_MENU_ZH if self.language == "zh" else self.TRAY_MENU_EN
@@ -170,14 +181,19 @@ class TrayManager:
                 name="Speekium", icon=icon_image, title=title, menu=menu
             )
 
-            # 在新线程中运行（非daemon，保持应用运行）
             def run_icon():
-                self.is_running = True
                 print("📌 系统托盘已启动")
                 self.icon.run()
 
-            tray_thread = threading.Thread(target=run_icon, daemon=False)
-            tray_thread.start()
+            self.is_running = True
+            if loop is not None:
+                # 复用宿主事件循环的线程池，不再单独创建非 daemon 线程
+                self._loop = loop
+                loop.run_in_executor(None, run_icon)
+            else:
+                # 在新线程中运行（非daemon，保持应用运行）
+                tray_thread = threading.Thread(target=run_icon, daemon=False)
+                tray_thread.start()
 
         except ImportError:
             print("❌ pystray 未安装，无法使用系统托盘")
@@ -211,8 +227,7 @@ class TrayManager:
         # 更新图标（添加/移除指示器）
         if self.icon:
             try:
-                icon_image = self.create_icon_image(with_indicator=is_listening)
-                self.icon.icon = icon_image
+                self.icon.icon = self._icon_active if is_listening else self._icon_idle
             except Exception as e:
                 print(f"⚠️ 更新托盘图标失败: {e}")
 
@@ -230,48 +245,58 @@ class TrayManager:
         self.language = language
         print(f"🌐 托盘菜单语言已切换到: {'中文' if language == 'zh' else 'English'}")
 
+    def _dispatch(self, callback: Callable | None, *args):
+        """
+        在托盘线程中调用回调；协程回调会被调度回宿主事件循环
+
+        Args:
+            callback: 回调函数（普通函数或协程函数）
+            *args: 回调参数
+        """
+        if callback is None:
+            return
+        result = callback(*args)
+        if asyncio.iscoroutine(result):
+            if self._loop is not None and not self._loop.is_closed():
+                asyncio.run_coroutine_threadsafe(result, self._loop)
+            else:
+                result.close()
+                print("⚠️ 未提供事件循环，无法执行异步托盘回调")
+
     # 菜单项处理函数
     def _handle_show_window(self, icon, item):
         """显示主窗口"""
-        if self.on_show_window:
-            self.on_show_window()
+        self._dispatch(self.on_show_window)
 
     def _handle_push_to_talk_mode(self, icon, item):
         """切换到按键录音模式"""
         self.current_mode = "push_to_talk"
-        if self.on_toggle_mode:
-            self.on_toggle_mode("push_to_talk")
+        self._dispatch(self.on_toggle_mode, "push_to_talk")
 
     def _handle_continuous_mode(self, icon, item):
         """切换到自由对话模式"""
         self.current_mode = "continuous"
-        if self.on_toggle_mode:
-            self.on_toggle_mode("continuous")
+        self._dispatch(self.on_toggle_mode, "continuous")
 
     def _handle_start_listening(self, icon, item):
         """开始监听"""
-        if self.on_start_listening:
-            self.on_start_listening()
+        self._dispatch(self.on_start_listening)
         self.update_listening_status(True)
 
     def _handle_stop_listening(self, icon, item):
         """停止监听"""
-        if self.on_stop_listening:
-            self.on_stop_listening()
+        self._dispatch(self.on_stop_listening)
         self.update_listening_status(False)
 
     def _handle_clear_history(self, icon, item):
         """清空对话历史"""
-        if self.on_clear_history:
-            self.on_clear_history()
+        self._dispatch(self.on_clear_history)
 
     def _handle_open_settings(self, icon, item):
         """打开设置"""
-        if self.on_open_settings:
-            self.on_open_settings()
+        self._dispatch(self.on_open_settings)
 
     def _handle_quit(self, icon, item):
         """退出应用"""
-        if self.on_quit:
-            self.on_quit()
+        self._dispatch(self.on_quit)
         self.stop()
@@ -6,12 +6,12 @@ Handles voice recording, VAD detection, ASR, TTS, and audio playback
 import asyncio
 import os
 import tempfile
+from collections import deque
 from pathlib import Path
 from typing import AsyncIterator, Optional
 
 import numpy as np
 import sounddevice as sd
-from scipy.io.wavfile import write as write_wav
 
 from logger import get_logger
 
@@ -28,6 +28,7 @@ DEFAULT_VAD_SILENCE_DURATION = 0.8
 DEFAULT_VAD_PRE_BUFFER = 0.3
 DEFAULT_MIN_SPEECH_DURATION = 0.4
 DEFAULT_MAX_RECORDING_DURATION = 30
+VAD_CHUNK_SIZE = 512  # Silero VAD requires 512 samples @ 16kHz
 
 # Edge TTS voices - comprehensive list
 EDGE_TTS_VOICES = {
@@ -217,80 +218,88 @@ class VoicePipeline:
         Returns:
             Audio array or None if no speech detected
         """
-        import librosa
-        from scipy.signal import filtfilt, butter
+        import torch
+
+        if self.vad_model is None:
+            logger.warning("vad_model_not_loaded")
+            return None
 
         logger.info("recording_started", vad_threshold=vad_threshold)
+        self.vad_model.reset_states()
 
-        # Pre-buffer for capturing speech start
-        pre_buffer_frames = int(vad_pre_buffer * self.sample_rate)
-        pre_buffer = []
+        max_silence_chunks = int(vad_silence_duration * self.sample_rate / VAD_CHUNK_SIZE)
+        pre_buffer = deque(maxlen=max(1, int(vad_pre_buffer * self.sample_rate / VAD_CHUNK_SIZE)))
         is_speaking = speech_already_started
         consecutive_speech = 0
-        consecutive_silence = 0
-        speech_started = False
+        silence_chunks = 0
+        recording_done = False
 
-        # Audio callback
+        # Audio callback: Silero VAD speech probability drives the state machine
         def callback(indata, frame_count, time_info, status):
-            nonlocal is_speaking, consecutive_speech, consecutive_silence, speech_started
+            nonlocal is_speaking, consecutive_speech, silence_chunks, recording_done
+
+            if recording_done:
+                return
 
             if status:
                 logger.warning("audio_status", status=str(status))
 
-            audio_data = indata[:, 0]  # Mono
+            try:
+                audio_chunk = indata[:, 0].copy()  # Mono
+                speech_prob = self.vad_model(torch.from_numpy(audio_chunk), self.sample_rate).item()
+            except Exception as e:
+                logger.error("vad_error", error=str(e))
+                recording_done = True
+                return
 
             if not is_speaking:
-                # Add to pre-buffer
-                pre_buffer.append(audio_data.copy())
-
-                # Check for speech
-                if len(audio_data) > 0:
-                    rms = np.sqrt(np.mean(audio_data**2))
-                    if rms > vad_threshold:
-                        consecutive_speech += 1
-                        if consecutive_speech >= vad_consecutive_threshold:
-                            is_speaking = True
-                            speech_started = True
-                            logger.info("speech_detected")
-
-                            if on_speech_detected:
-                                on_speech_detected()
-
-                            # Keep pre-buffer audio
-                            self.audio_buffer.extend(pre_buffer)
-                            pre_buffer = []
-                    else:
-                        consecutive_speech = 0
+                # Keep recent audio to capture speech start
+                pre_buffer.append(audio_chunk)
+
+                if speech_prob > vad_threshold:
+                    consecutive_speech += 1
+                    if consecutive_speech >= vad_consecutive_threshold:
+                        is_speaking = True
+                        logger.info("speech_detected")
+
+                        if on_speech_detected:
+                            on_speech_detected()
+
+                        # Keep pre-buffer audio
+                        self.audio_buffer.extend(pre_buffer)
+                        pre_buffer.clear()
+                else:
+                    consecutive_speech = 0
             else:
                 # Recording speech
-                self.audio_buffer.append(audio_data.copy())
+                self.audio_buffer.append(audio_chunk)
 
-                # Check for silence
-                rms = np.sqrt(np.mean(audio_data**2))
-                if rms < vad_threshold:
-                    consecutive_silence += 1
+                if speech_prob > vad_threshold:
+                    silence_chunks = 0
                 else:
-                    consecutive_silence = 0
+                    silence_chunks += 1
 
                 # Stop if silence for too long
-                if consecutive_silence > vad_silence_duration * self.sample_rate / 1024:
+                if silence_chunks >= max_silence_chunks:
                     logger.info("silence_detected", duration=vad_silence_duration)
-                    raise sd.CallbackStop
+                    recording_done = True
 
         try:
             with sd.InputStream(
                 channels=1,
                 samplerate=self.sample_rate,
-                blocksize=1024,
+                dtype="float32",
+                blocksize=VAD_CHUNK_SIZE,
                 callback=callback,
             ):
-                sd.sleep(int(max_duration * 1000))
-
-        except sd.CallbackStop:
-            pass
+                elapsed_ms = 0
+                while not recording_done and elapsed_ms < max_duration * 1000:
+                    sd.sleep(50)
+                    elapsed_ms += 50
 
         except Exception as e:
             logger.error("recording_error", error=str(e))
+            self.audio_buffer = []
             return None
 
         # Combine audio
@@ -363,6 +372,11 @@ class VoicePipeline:
             logger.warning("asr_model_not_loaded")
             return None
 
+        # SenseVoice input requirements (checked before any conversion pass)
+        if len(audio) < 1600:  # Minimum 100ms
+            logger.warning("audio_too_short")
+            return None
+
         try:
             # Ensure audio is in correct format
             if audio.dtype != np.float32:
@@ -375,11 +389,6 @@ class VoicePipeline:
             # Transcribe
             logger.info("transcribing", audio_duration=len(audio) / self.sample_rate)
 
-            # SenseVoice input requirements
-            if len(audio) < 1600:  # Minimum 100ms
-                logger.warning("audio_too_short")
-                return None
-
             input_features = self.asr_model.processor(
                 audio, sampling_rate=self.sample_rate, return_tensors="pt"
             )
@@ -404,44 +413,70 @@ class VoicePipeline:
 
     # ==================== VAD (Voice Activity Detection) ====================
 
-    def detect_speech_start(self, timeout: float = 1.5) -> bool:
+    def detect_speech_start(
+        self,
+        timeout: float = 1.5,
+        vad_threshold: float = DEFAULT_VAD_THRESHOLD,
+        vad_consecutive_threshold: int = DEFAULT_VAD_CONSECUTIVE_THRESHOLD,
+    ) -> bool:
         """
         Detect when speech starts.
 
         Args:
             timeout: Maximum time to wait for speech
+            vad_threshold: VAD threshold (0-1)
+            vad_consecutive_threshold: Consecutive detections to confirm speech
 
         Returns:
             True if speech detected
         """
         import torch
 
+        if self.vad_model is None:
+            logger.warning("vad_model_not_loaded")
+            return False
+
         logger.info("detecting_speech_start", timeout=timeout)
+        self.vad_model.reset_states()
 
-        audio_buffer = []
         speech_started = False
+        consecutive_speech = 0
+
+        # Preallocated VAD input shared with its tensor (no allocation per chunk)
+        vad_input = np.empty(VAD_CHUNK_SIZE, dtype=np.float32)
+        vad_tensor = torch.from_numpy(vad_input)
 
         def callback(indata, frame_count, time_info, status):
-            nonlocal speech_started
-            audio_data = indata[:, 0]
+            nonlocal speech_started, consecutive_speech
+
+            if speech_started:
+                return
+
+            try:
+                np.copyto(vad_input, indata[:, 0])
+                speech_prob = self.vad_model(vad_tensor, self.sample_rate).item()
+            except Exception:
+                return
 
-            if len(audio_data) > 0:
-                rms = np.sqrt(np.mean(audio_data**2))
-                if rms > vad_threshold:
+            if speech_prob > vad_threshold:
+                consecutive_speech += 1
+                if consecutive_speech >= vad_consecutive_threshold:
                     speech_started = True
-                    raise sd.CallbackStop
+            else:
+                consecutive_speech = 0
 
         try:
             with sd.InputStream(
                 channels=1,
                 samplerate=self.sample_rate,
-                blocksize=1024,
+                dtype="float32",
+                blocksize=VAD_CHUNK_SIZE,
                 callback=callback,
             ):
-                sd.sleep(int(timeout * 1000))
-
-        except sd.CallbackStop:
-            pass
+                elapsed_ms = 0
+                while not speech_started and elapsed_ms < timeout * 1000:
+                    sd.sleep(50)
+                    elapsed_ms += 50
 
         except Exception as e:
             logger.warning("vad_detection_error", error=str(e))
@@ -701,11 +736,13 @@ class VoicePipeline:
 
     @staticmethod
     def save_audio_file(audio: np.ndarray, file_path: str) -> bool:
-        """Save audio array to WAV file."""
+        """Save audio array to WAV file (16-bit PCM)."""
         try:
-            # Convert float32 to int16
-            audio_int16 = (audio * 32767).astype(np.int16)
-            write_wav(file_path, DEFAULT_SAMPLE_RATE, audio_int16)
+            # libsndfile (a librosa dependency) scales float32 to int16 in C,
+            # without a full-size intermediate array on the Python side
+            import soundfile as sf
+
+            sf.write(file_path, audio, DEFAULT_SAMPLE_RATE, subtype="PCM_16")
             logger.info("audio_saved", path=file_path)
             return True
         except Exception as e:
@@ -0,0 +1,101 @@
+"""
+Speekium WAV 读取
+把 Rust 端写出的 PTT 录音读成单声道 float32（内存映射，避免中间整数数组拷贝）
+"""
+
+import os
+import struct
+
+import numpy as np
+
+# (format tag, bits per sample) -> (dtype, scale to [-1, 1])
+WAV_PCM_TYPES = {
+    (1, 16): ("<i2", 1.0 / 32768.0),
+    (1, 32): ("<i4", 1.0 / 2147483648.0),
+    (3, 32): ("<f4", 1.0),
+}
+
+
+def _scale_to_float32(samples: np.ndarray) -> np.ndarray:
+    """Convert scipy's integer PCM to float32 in [-1, 1] (float data is only cast)
+
+    scipy returns 24-bit PCM left-aligned in int32, so it scales like 32-bit.
+    """
+    if samples.dtype.kind == "u":  # 8-bit PCM is unsigned, centred on 128
+        return (samples.astype(np.float32) - 128.0) / 128.0
+    if samples.dtype.kind == "i":
+        return samples.astype(np.float32) / float(np.iinfo(samples.dtype).max + 1)
+    return samples.astype(np.float32)
+
+
+def read_wav_float32(path: str):
+    """Read a PCM WAV file as mono float32 without an intermediate int array copy
+
+    The sample payload is memory-mapped and scaled into a single float32 output
+    array. Formats not in WAV_PCM_TYPES fall back to scipy.
+
+    Returns:
+        (sample_rate, samples)
+    """
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            raise ValueError(f"Not a WAV file: {path}")
+
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f"WAV file has no data chunk: {path}")
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk)
+            if chunk_id == b"fmt ":
+                fmt = struct.unpack("<HHIIHH", f.read(16))
+                f.seek(chunk_size - 16 + (chunk_size & 1), os.SEEK_CUR)
+            elif chunk_id == b"data":
+                data_offset = f.tell()
+                data_size = chunk_size
+                break
+            else:
+                f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+    if fmt is None:
+        raise ValueError(f"WAV file has no fmt chunk: {path}")
+    format_tag, channels, sample_rate, _, _, bits = fmt
+
+    pcm_type = WAV_PCM_TYPES.get((format_tag, bits))
+    if pcm_type is None:
+        from scipy.io import wavfile
+
+        sample_rate, samples = wavfile.read(path)
+        samples = _scale_to_float32(samples)
+        return sample_rate, samples.mean(axis=1) if samples.ndim > 1 else samples
+
+    dtype, scale = pcm_type
+    item_size = np.dtype(dtype).itemsize
+    # Chunks after data (LIST, id3) are not samples, so stop at the header size. A
+    # streaming writer that never finalized the header leaves 0 or 0xFFFFFFFF there;
+    # then the data runs to the end of the file.
+    data_bytes = os.path.getsize(path) - data_offset
+    if data_size not in (0, 0xFFFFFFFF):
+        data_bytes = min(data_size, data_bytes)
+    count = data_bytes // (item_size * channels) * channels
+    if count == 0:
+        return sample_rate, np.zeros(0, dtype=np.float32)
+
+    raw = np.memmap(path, dtype=dtype, mode="r", offset=data_offset, shape=(count,))
+    try:
+        # One pass: read PCM, write scaled float32
+        samples = np.empty(count, dtype=np.float32)
+        np.multiply(raw, np.float32(scale), out=samples, casting="unsafe")
+    finally:
+        # Release the mapping so the file can be deleted (required on Windows)
+        del raw
+
+    if channels > 1:
+        # Sum channels in float32 and scale in place (mean() would accumulate into a new array)
+        frames = samples.reshape(-1, channels)
+        samples = np.add(frames[:, 0], frames[:, 1])
+        for ch in range(2, channels):
+            np.add(samples, frames[:, ch], out=samples)
+        samples *= np.float32(1.0 / channels)
+    return sample_rate, samples
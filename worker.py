@@ -8,14 +8,117 @@ Usage:
     python3 worker.py record '{"mode":"push-to-talk","duration":3.0}'
     python3 worker.py chat '{"text":"hello"}'
     python3 worker.py tts '{"text":"hello"}'
+
+多个命令一次执行（"$prev.<字段>" 引用上一步结果中的字段）:
+    python3 worker.py pipeline '{"steps":[{"command":"record","args":{}},
+        {"command":"chat","args":{"text":"$prev.text"}},
+        {"command":"tts","args":{"text":"$prev.content"}}]}'
+
+常驻模式（进程只启动一次，逐行读取 stdin 中的 JSON 请求，每个结果输出一行 JSON）:
+    python3 worker.py serve
+    {"command": "chat", "args": {"text": "hello"}}
+    （设置 SPEEKIUM_PREHEAT=1 时，启动后立即在后台加载并预热模型）
 """
 
 import json
+import os
 import sys
+import threading
+import traceback
+
+from config_manager import ConfigManager
+
+# sounddevice（PortAudio）和 speekium 在需要它们的处理函数内再导入，
+# config 命令和错误路径不必加载音频/模型相关的重量级模块
+
+# 进度提示输出到 stderr；WORKER_VERBOSE=false 时关闭（serve 模式下省去每条提示的写入）
+VERBOSE = os.getenv("WORKER_VERBOSE", "true").lower() == "true"
+
+
+def _progress(message):
+    """输出进度提示到 stderr"""
+    if VERBOSE:
+        print(message, file=sys.stderr, flush=True)
+
+
+# 只有 LOG_LEVEL=DEBUG 时才输出完整堆栈（格式化堆栈需要逐帧读取源码行）
+TRACEBACKS = os.getenv("LOG_LEVEL", "INFO").upper() == "DEBUG"
+
+
+def _report_error(error):
+    """输出处理函数的异常到 stderr"""
+    if TRACEBACKS:
+        traceback.print_exc(file=sys.stderr)
+    else:
+        print(f"❌ {type(error).__name__}: {error}", file=sys.stderr, flush=True)
+
+
+# 进程内复用的 VoiceAssistant（模型只加载一次，serve 模式下跨命令复用）
+_ASSISTANT = None
+
+
+def _get_assistant():
+    """获取（必要时创建）共享的 VoiceAssistant 实例"""
+    global _ASSISTANT
+    if _ASSISTANT is None:
+        from speekium import VoiceAssistant
+
+        _ASSISTANT = VoiceAssistant()
+    return _ASSISTANT
+
+
+# 后台常驻事件循环（首次需要时启动，只查询 config 时不创建）
+_LOOP = None
+
+
+def _get_loop():
+    """获取（必要时在守护线程中启动）共享的 asyncio 事件循环"""
+    global _LOOP
+    if _LOOP is None:
+        import asyncio
+
+        _LOOP = asyncio.new_event_loop()
+        threading.Thread(target=_LOOP.run_forever, name="worker-loop", daemon=True).start()
+    return _LOOP
+
+
+# 按键录音复用的预分配缓冲区（按最长一次录音扩容）
+_REC_BUFFER = None
+
+
+def _record_fixed_duration(duration):
+    """录制固定时长的单声道音频，回调直接写入复用的缓冲区
+
+    麦克风流只在录音期间打开（常开会让系统一直显示麦克风占用）。
+    返回的是缓冲区的一维连续视图（不复制），下一次录音前有效。
+    """
+    global _REC_BUFFER
+    import sounddevice as sd
+
+    from audio_buffer import AudioBuffer
 
-import sounddevice as sd
+    samples = int(duration * 16000)
+    if _REC_BUFFER is None or _REC_BUFFER.capacity < samples:
+        _REC_BUFFER = AudioBuffer(samples)
+    buffer = _REC_BUFFER
+    buffer.clear()
 
-from speekium import VoiceAssistant
+    def callback(indata, frame_count, time_info, status):
+        buffer.write(indata[:, 0])
+
+    with sd.InputStream(
+        samplerate=16000, channels=1, dtype="float32", blocksize=1600, callback=callback
+    ):
+        sd.sleep(int(duration * 1000))
+
+    return buffer.view()[:samples]
+
+
+def _run_async(coro):
+    """在共享事件循环中执行协程并等待结果"""
+    import asyncio
+
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
 
 
 def record_audio(mode="push-to-talk", duration=3.0):
@@ -29,30 +132,26 @@ def record_audio(mode="push-to-talk", duration=3.0):
         dict: {"success": bool, "text": str, "language": str, "error": str}
     """
     try:
-        assistant = VoiceAssistant()
+        assistant = _get_assistant()
 
-        print(f"🎤 开始录音 (mode={mode}, duration={duration}s)...", file=sys.stderr, flush=True)
+        _progress(f"🎤 开始录音 (mode={mode}, duration={duration}s)...")
 
         if mode == "continuous":
             audio = assistant.record_with_vad()
         else:  # push-to-talk
-            audio = sd.rec(int(duration * 16000), samplerate=16000, channels=1, dtype="float32")
-            sd.wait()
-            audio = audio[:, 0]  # 转为 1D 数组
+            audio = _record_fixed_duration(duration)
 
         if audio is None or len(audio) == 0:
             return {"success": False, "error": "No audio recorded"}
 
-        print("🔄 识别中...", file=sys.stderr, flush=True)
+        _progress("🔄 识别中...")
         text, language = assistant.transcribe(audio)
-        print(f"✅ 识别完成: '{text}' ({language})", file=sys.stderr, flush=True)
+        _progress(f"✅ 识别完成: '{text}' ({language})")
 
         return {"success": True, "text": text, "language": language}
 
     except Exception as e:
-        import traceback
-
-        traceback.print_exc(file=sys.stderr)
+        _report_error(e)
         return {"success": False, "error": str(e)}
 
 
@@ -66,20 +165,18 @@ def chat_llm(text):
         dict: {"success": bool, "content": str, "error": str}
     """
     try:
-        print(f"💬 LLM 对话: {text}", file=sys.stderr, flush=True)
+        _progress(f"💬 LLM 对话: {text}")
 
-        assistant = VoiceAssistant()
+        assistant = _get_assistant()
         backend = assistant.load_llm()
         response = backend.chat(text)
 
-        print(f"✅ LLM 响应: {response[:50]}...", file=sys.stderr, flush=True)
+        _progress(f"✅ LLM 响应: {response[:50]}...")
 
         return {"success": True, "content": response}
 
     except Exception as e:
-        import traceback
-
-        traceback.print_exc(file=sys.stderr)
+        _report_error(e)
         return {"success": False, "error": str(e)}
 
 
@@ -93,26 +190,19 @@ def generate_tts(text):
         dict: {"success": bool, "audio_path": str, "error": str}
     """
     try:
-        import asyncio
+        _progress(f"🔊 TTS 生成: {text}")
 
-        print(f"🔊 TTS 生成: {text}", file=sys.stderr, flush=True)
-
-        assistant = VoiceAssistant()
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        audio_path = loop.run_until_complete(assistant.generate_audio(text))
-        loop.close()
+        assistant = _get_assistant()
+        audio_path = _run_async(assistant.generate_audio(text))
 
         if audio_path:
-            print(f"✅ TTS 完成: {audio_path}", file=sys.stderr, flush=True)
+            _progress(f"✅ TTS 完成: {audio_path}")
             return {"success": True, "audio_path": audio_path}
         else:
             return {"success": False, "error": "Failed to generate audio"}
 
     except Exception as e:
-        import traceback
-
-        traceback.print_exc(file=sys.stderr)
+        _report_error(e)
         return {"success": False, "error": str(e)}
 
 
@@ -123,39 +213,151 @@ def get_config():
         dict: {"success": bool, "config": dict, "error": str}
     """
     try:
-        from config_manager import ConfigManager
-
         config = ConfigManager.load()
         return {"success": True, "config": config}
 
     except Exception as e:
-        import traceback
-
-        traceback.print_exc(file=sys.stderr)
+        _report_error(e)
         return {"success": False, "error": str(e)}
 
 
+def _run_pipeline(steps):
+    """在同一进程中依次执行多个命令（一次调用完成 录音 → 对话 → TTS）
+
+    Args:
+        steps: [{"command": str, "args": dict}, ...]，字符串参数 "$prev.<字段>"
+               会被替换为上一步结果中的对应字段
+
+    Returns:
+        dict: {"success": bool, "results": list}，遇到失败的步骤即停止
+    """
+    # 先检查全部步骤，格式不对时一步都不执行
+    if not isinstance(steps, list):
+        return {"success": False, "error": "steps must be a JSON array"}
+    for i, step in enumerate(steps):
+        if not isinstance(step, dict):
+            return {"success": False, "error": f"step {i} must be a JSON object"}
+        if not isinstance(step.get("command", ""), str):
+            return {"success": False, "error": f"step {i}: command must be a string"}
+        if not isinstance(step.get("args") or {}, dict):
+            return {"success": False, "error": f"step {i}: args must be a JSON object"}
+
+    results = []
+    prev = {}
+    for step in steps:
+        args = {
+            key: prev.get(value[len("$prev.") :], "")
+            if isinstance(value, str) and value.startswith("$prev.")
+            else value
+            for key, value in (step.get("args") or {}).items()
+        }
+        prev = handle_command(step.get("command", ""), args)
+        results.append(prev)
+        if not prev.get("success"):
+            return {"success": False, "results": results, "error": prev.get("error")}
+
+    return {"success": True, "results": results}
+
+
+HANDLERS = {
+    "record": lambda args: record_audio(
+        mode=args.get("mode", "push-to-talk"), duration=args.get("duration", 3.0)
+    ),
+    "chat": lambda args: chat_llm(args.get("text", "")),
+    "tts": lambda args: generate_tts(args.get("text", "")),
+    "config": lambda args: get_config(),
+    "pipeline": lambda args: _run_pipeline(args.get("steps", [])),
+}
+
+
+def handle_command(command, args):
+    """路由到相应的处理函数"""
+    handler = HANDLERS.get(command)
+    if handler is None:
+        return {"success": False, "error": f"Unknown command: {command}"}
+    return handler(args)
+
+
+def _emit(result):
+    """输出一行 JSON 结果（UTF-8 字节直写，中文不转义成 \\uXXXX）"""
+    sys.stdout.buffer.write(json.dumps(result, ensure_ascii=False).encode("utf-8") + b"\n")
+    sys.stdout.buffer.flush()
+
+
+# 预热线程（SPEEKIUM_PREHEAT=1 时在 serve 启动后运行）
+_PREHEAT_THREAD = None
+
+
+def _preheat():
+    """加载并预热 VAD/ASR/LLM/TTS，让第一条真实命令不再承担冷启动"""
+    try:
+        assistant = _get_assistant()
+        assistant.load_vad()
+        assistant.load_asr()  # 含一次静音推理预热
+        _run_async(assistant.warm_llm())
+        _run_async(assistant.warm_tts())
+        _progress("🔥 预热完成")
+    except Exception as e:
+        _report_error(e)
+
+
+def _wait_for_preheat(command):
+    """除 config 外的命令等待预热结束，避免与预热线程并发加载同一个模型"""
+    if _PREHEAT_THREAD is not None and command != "config":
+        _PREHEAT_THREAD.join()
+
+
+def _parse_request(line):
+    """解析一行请求，返回 (command, args)；格式不对时抛出 ValueError"""
+    request = json.loads(line)
+    if not isinstance(request, dict):
+        raise ValueError("request must be a JSON object")
+    command = request.get("command", "")
+    args = request.get("args") or {}
+    if not isinstance(command, str):
+        raise ValueError("command must be a string")
+    if not isinstance(args, dict):
+        raise ValueError("args must be a JSON object")
+    return command, args
+
+
+def serve():
+    """常驻模式：避免每个命令都重新启动解释器并导入 speekium/sounddevice"""
+    global _PREHEAT_THREAD
+    if os.getenv("SPEEKIUM_PREHEAT") == "1":
+        _PREHEAT_THREAD = threading.Thread(target=_preheat, name="worker-preheat", daemon=True)
+        _PREHEAT_THREAD.start()
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            command, args = _parse_request(line)
+        except json.JSONDecodeError as e:
+            result = {"success": False, "error": f"Invalid JSON: {e}"}
+        except ValueError as e:
+            result = {"success": False, "error": f"Invalid request: {e}"}
+        else:
+            _wait_for_preheat(command)
+            result = handle_command(command, args)
+
+        _emit(result)
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print(json.dumps({"success": False, "error": "No command specified"}))
+        _emit({"success": False, "error": "No command specified"})
         sys.exit(1)
 
     command = sys.argv[1]
-    args = json.loads(sys.argv[2]) if len(sys.argv) > 2 else {}
+    if command == "serve":
+        serve()
+        sys.exit(0)
 
-    # 路由到相应的函数
-    if command == "record":
-        result = record_audio(
-            mode=args.get("mode", "push-to-talk"), duration=args.get("duration", 3.0)
-        )
-    elif command == "chat":
-        result = chat_llm(args.get("text", ""))
-    elif command == "tts":
-        result = generate_tts(args.get("text", ""))
-    elif command == "config":
-        result = get_config()
-    else:
-        result = {"success": False, "error": f"Unknown command: {command}"}
+    args = json.loads(sys.argv[2]) if len(sys.argv) > 2 else {}
+    result = handle_command(command, args)
 
     # 输出 JSON 结果到 stdout
-    print(json.dumps(result))
+    _emit(result)
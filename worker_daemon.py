@@ -18,17 +18,26 @@ Speekium Daemon Worker - 守护进程模式
 """
 
 import asyncio
+import contextlib
+import functools
 import json
+import os
+import platform
 import resource  # NEW: For resource limits
+import shutil
 import signal  # NEW: For signal handling
 import sys
+import threading
 import time
-import traceback
 from typing import Optional
 
+import numpy as np
 import sounddevice as sd
 
+from audio_buffer import AudioBuffer
+from config_manager import ConfigManager
 from logger import configure_logging, get_logger
+from wav_loader import read_wav_float32
 
 # Configure logging for daemon (JSON format)
 configure_logging(level="INFO", format="json", colored=False)
@@ -83,6 +92,145 @@ signal.signal(signal.SIGXCPU, handle_timeout)
 set_resource_limits()
 
 
+# ===== Output =====
+try:
+    import orjson
+except ImportError:  # Optional speed-up; the stdlib json module is the fallback
+    orjson = None
+
+if orjson is not None:
+    _ORJSON_OPTIONS = (
+        orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+    def dumps_line(obj) -> bytes:
+        """Encode obj as one newline-terminated JSON line"""
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the latter
+    loads = orjson.loads
+else:
+
+    def dumps_line(obj) -> bytes:
+        """Encode obj as one newline-terminated JSON line"""
+        return (json.dumps(obj) + "\n").encode("utf-8")
+
+    loads = json.loads
+
+
+def write_line(line: bytes, stream=None) -> None:
+    """Write an already encoded line (stdout by default) and flush it
+
+    Bytes go straight to the binary buffer in a single write; the text layer is
+    line-buffered, so nothing is left pending in it between lines.
+    """
+    buffer = (stream or sys.stdout).buffer
+    buffer.write(line)
+    buffer.flush()
+
+
+def emit(obj, stream=None) -> None:
+    """Write obj as one JSON line (stdout by default) and flush it"""
+    write_line(dumps_line(obj), stream)
+
+
+# ===== Command Input =====
+STDIN_READ_LIMIT = 1 << 20  # Max command line length (save_config carries the whole config)
+
+# Dispatched as soon as they are read, even while another command is still running
+IMMEDIATE_COMMANDS = frozenset({"interrupt"})
+
+# Encoded once: a flood of malformed lines (e.g. garbage during a reconnect) should
+# cost one write each. The parser's message goes to the log instead.
+INVALID_JSON_REPLY = dumps_line({"success": False, "error": "Invalid JSON"})
+LINE_TOO_LONG_REPLY = dumps_line({"success": False, "error": "Command line too long"})
+
+# Read-only queries that run alongside the serial queue instead of waiting behind
+# a long chat/TTS command; at most MAX_CONCURRENT_COMMANDS of them at a time
+CONCURRENT_COMMANDS = frozenset({"health", "model_status", "get_daemon_state"})
+MAX_CONCURRENT_COMMANDS = 8
+
+
+def parse_command_line(line: bytes) -> tuple:
+    """Decode one stdin line into (command, args)
+
+    Raises json.JSONDecodeError if the line is not JSON, and ValueError if it is not
+    UTF-8 or not a {"command": ..., "args": {...}} object.
+    """
+    request = loads(line)
+    if not isinstance(request, dict):
+        raise ValueError("request must be a JSON object")
+    args = request.get("args") or {}
+    if not isinstance(args, dict):
+        raise ValueError("args must be a JSON object")
+    return request.get("command"), args
+
+
+# ===== Audio Capture =====
+# Samples per input callback for whole-clip recording (64 ms @ 16 kHz). Nothing runs
+# per block, so larger blocks only mean fewer callbacks; latency="low" is requested
+# separately so PortAudio does not fall back to the host's conservative default.
+CAPTURE_BLOCKSIZE = 1024
+
+
+# ===== Audio Playback =====
+PLATFORM = platform.system()
+
+# Synthesized sentences buffered ahead of playback while streaming a reply
+PLAYBACK_QUEUE_SIZE = 3
+
+# Command-line players per platform, tried in order (first found on PATH wins)
+AUDIO_PLAYERS = {
+    "Darwin": [["afplay"]],
+    "Linux": [["mpg123", "-q"], ["ffplay", "-nodisp", "-autoexit"]],
+}
+
+
+@functools.cache
+def find_audio_player() -> Optional[tuple]:
+    """Resolve the player command prefix once (avoids a failed spawn per sentence)
+
+    The executable is returned as an absolute path so each spawn execs it
+    directly instead of searching PATH again.
+    """
+    for cmd in AUDIO_PLAYERS.get(PLATFORM, []):
+        path = shutil.which(cmd[0])
+        if path:
+            return (path, *cmd[1:])
+    return None
+
+
+@functools.cache
+def find_powershell() -> str:
+    """Absolute path of powershell.exe (falls back to the bare name)"""
+    return shutil.which("powershell") or "powershell"
+
+
+def player_command(audio_path: str) -> Optional[list]:
+    """Build the command that plays audio_path to completion, or None if unavailable"""
+    if PLATFORM == "Windows":
+        # Windows Media Player with duration detection (escape quotes for PowerShell)
+        win_path = os.path.abspath(audio_path).replace("/", "\\").replace("'", "''")
+        ps_script = (
+            f"Add-Type -AssemblyName presentationCore; "
+            f"$mediaPlayer = New-Object System.Windows.Media.MediaPlayer; "
+            f"$mediaPlayer.Open([uri]::new('{win_path}')); "
+            f"$mediaPlayer.Play(); "
+            # Wait for NaturalDuration to be available
+            f"while ($mediaPlayer.NaturalDuration.HasTimeSpan -eq $false) {{ Start-Sleep -Milliseconds 100 }}; "
+            # Get duration in seconds and add 0.5s buffer
+            f"$duration = $mediaPlayer.NaturalDuration.TimeSpan.TotalSeconds + 0.5; "
+            f"Start-Sleep -Seconds $duration; "
+            f"$mediaPlayer.Close()"
+        )
+        return [find_powershell(), "-c", ps_script]
+
+    player = find_audio_player()
+    if player is None:
+        return None
+    return [*player, audio_path]
+
+
 class SpeekiumDaemon:
     """Speekium daemon core class"""
 
@@ -93,18 +241,53 @@ class SpeekiumDaemon:
 
         # PTT (Push-to-Talk) state
         self.ptt_recording = False
-        self.ptt_audio_frames = []
+        self.ptt_buffer = None  # Preallocated AudioBuffer, created on first PTT start
         self.ptt_stream = None
 
         # Interrupt flag for LLM/TTS operations
-        import threading
-
         self.interrupt_event = threading.Event()
+        # asyncio mirror of interrupt_event, so playback can await it instead of polling
+        self.interrupt_aio_event = asyncio.Event()
 
         # Note: PTT hotkey is handled by Tauri/Rust side via ptt_press/ptt_release commands
 
         # Event loop reference (set during initialization)
         self.loop = None
+        self.command_queue = None  # (command, args) waiting to run, created in run_daemon
+        self.stdin_task = None
+        self.immediate_tasks = set()
+        self.concurrent_semaphore = asyncio.Semaphore(MAX_CONCURRENT_COMMANDS)
+        self.pending_ptt_events = []  # Encoded PTT event lines waiting for _flush_ptt_events
+
+        # Command name -> function taking the command's args dict (see handle_command)
+        self.command_handlers = {
+            "record": lambda a: self.handle_record(**a),
+            "record_start": lambda a: self.handle_record_start(),
+            "record_stop": lambda a: self.handle_record_stop(
+                a.get("auto_chat", True), a.get("use_tts", True)
+            ),
+            "ptt_press": self._cmd_ptt_press,
+            "ptt_release": self._cmd_ptt_release,
+            "ptt_audio": self._cmd_ptt_audio,
+            "chat": lambda a: self.handle_chat(a.get("text", "")),
+            "chat_stream": self._cmd_chat_stream,
+            "chat_tts_stream": self._cmd_chat_tts_stream,
+            "tts": lambda a: self.handle_tts(a.get("text", ""), a.get("language")),
+            "config": lambda a: self.handle_config(),
+            # args is directly the config object (Rust side has processed it)
+            "save_config": self.handle_save_config,
+            "update_hotkey": self.handle_update_hotkey,
+            "health": lambda a: self.handle_health(),
+            "model_status": lambda a: self.handle_model_status(),
+            "interrupt": lambda a: self.handle_interrupt(a.get("priority", 1)),
+            "get_daemon_state": lambda a: self.handle_get_daemon_state(),
+            "set_recording_mode": self._cmd_set_recording_mode,
+            "exit": self._cmd_exit,
+        }
+
+        # Parsed config.json and its mtime (see _load_config)
+        self.config_cache = None
+        self.config_mtime = None
 
         # Health monitoring task
         self.health_monitor_task = None
@@ -114,61 +297,97 @@ class SpeekiumDaemon:
         # Output startup log
         logger.info("daemon_initializing")
 
-    def _log(self, message: str):
-        """Legacy logging method - deprecated, use logger directly"""
-        # Parse common emoji patterns for structured logging
-        if "🔄" in message:
-            logger.info("daemon_processing", message=message.replace("🔄 ", ""))
-        elif "✅" in message:
-            logger.info("daemon_success", message=message.replace("✅ ", ""))
-        elif "❌" in message:
-            logger.error("daemon_error", message=message.replace("❌ ", ""))
-        elif "⚠️" in message:
-            logger.warning("daemon_warning", message=message.replace("⚠️ ", ""))
-        elif "🎤" in message:
-            logger.info("daemon_recording", message=message.replace("🎤 ", ""))
-        elif "💬" in message:
-            logger.info("daemon_chat", message=message.replace("💬 ", ""))
-        else:
-            logger.info("daemon_log", message=message)
+    def _load_config(self) -> dict:
+        """ConfigManager.load(), re-read only when config.json changes on disk
+
+        Returns a shallow copy so callers can modify top-level keys freely.
+        """
+        try:
+            mtime = os.stat(ConfigManager.get_path()).st_mtime_ns
+        except OSError:
+            mtime = None
+        if self.config_cache is None or mtime is None or mtime != self.config_mtime:
+            self.config_cache = ConfigManager.load()
+            self.config_mtime = mtime
+        return dict(self.config_cache)
+
+    def _get_llm(self):
+        """Return the current LLM backend, resolving it only when none is cached
+
+        save_config and the health monitor clear assistant.llm_backend, so the
+        next turn still picks up a changed provider.
+        """
+        backend = self.assistant.llm_backend
+        if backend is None:
+            backend = self.assistant.load_llm()
+        return backend
 
     def _emit_ptt_event(self, event_type: str, data: dict = None):
         """Emit PTT event to stderr for Tauri to capture (stdout is for command responses)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Called from a worker thread (e.g. the VAD speech callback): hand over to the
+            # loop so events keep their order; write directly if there is no loop yet
+            if self.loop is not None:
+                self.loop.call_soon_threadsafe(self._emit_ptt_event, event_type, data)
+            else:
+                self.pending_ptt_events.append(self._ptt_event_line(event_type, data))
+                self._flush_ptt_events()
+            return
+
+        # Events emitted in the same loop iteration go out in one stderr write
+        self.pending_ptt_events.append(self._ptt_event_line(event_type, data))
+        if len(self.pending_ptt_events) == 1:
+            loop.call_soon(self._flush_ptt_events)
+
+    @staticmethod
+    def _ptt_event_line(event_type: str, data: Optional[dict]) -> bytes:
         event = {"ptt_event": event_type}
         if data:
             event.update(data)
-        # Use stderr to avoid interfering with command responses on stdout
-        print(json.dumps(event), file=sys.stderr, flush=True)
+        return dumps_line(event)
+
+    def _flush_ptt_events(self) -> None:
+        """Write all pending PTT events to stderr at once"""
+        if self.pending_ptt_events:
+            # Use stderr to avoid interfering with command responses on stdout
+            write_line(b"".join(self.pending_ptt_events), sys.stderr)
+            self.pending_ptt_events.clear()
 
     def _cleanup(self):
         """Clean up resources before exit"""
-        self._log("🧹 正在清理资源...")
+        logger.info("daemon_log", message="🧹 正在清理资源...")
 
         # Stop PTT recording if active
         if self.ptt_recording:
-            self._log("🧹 停止 PTT 录音...")
+            logger.info("daemon_log", message="🧹 停止 PTT 录音...")
             self.ptt_recording = False
 
         # Close audio stream if open
         if self.ptt_stream:
             try:
-                self._log("🧹 关闭音频流...")
+                logger.info("daemon_log", message="🧹 关闭音频流...")
                 self.ptt_stream.stop()
                 self.ptt_stream.close()
             except Exception as e:
-                self._log(f"⚠️ 关闭音频流失败: {e}")
+                logger.warning("daemon_warning", message=f"关闭音频流失败: {e}")
             finally:
                 self.ptt_stream = None
 
+        # Stop any prewarmed LLM CLI process
+        if self.assistant and hasattr(self.assistant.llm_backend, "close"):
+            self.assistant.llm_backend.close()
+
         # Stop health monitoring
         if self.health_monitor_task and not self.health_monitor_task.done():
-            self._log("🧹 停止健康监控...")
+            logger.info("daemon_log", message="🧹 停止健康监控...")
             self.health_monitor_task.cancel()
             # Note: cancellation will be handled by the task itself
 
         # Note: PTT hotkey is now handled by Tauri, no pynput cleanup needed
 
-        self._log("✅ 资源清理完成")
+        logger.info("daemon_success", message="资源清理完成")
 
     async def initialize(self):
         """Preload all models (only executed once at startup)"""
@@ -190,34 +409,32 @@ class SpeekiumDaemon:
             async def load_asr_async():
                 return await self.loop.run_in_executor(None, self.assistant.load_asr)
 
-            # Load VAD and ASR concurrently
+            # Load VAD and ASR concurrently (and warm up TTS and the LLM backend while they load)
             vad_task = asyncio.create_task(load_vad_async())
             asr_task = asyncio.create_task(load_asr_async())
+            tts_task = asyncio.create_task(self.assistant.warm_tts())
+            llm_task = asyncio.create_task(self.assistant.warm_llm())
 
-            # Wait for both to complete
-            await asyncio.gather(vad_task, asr_task)
+            # Wait for all to complete
+            await asyncio.gather(vad_task, asr_task, tts_task, llm_task)
 
             logger.info("vad_and_asr_models_loaded")
 
-            self._log("🔄 预加载 LLM 后端...")
-            self.assistant.load_llm()
-
             # Note: PTT hotkey is now handled by Tauri global shortcuts (Rust side)
             # The pynput hotkey manager is no longer needed
             # PTT commands (ptt_press, ptt_release) are sent from Rust via stdin
 
-            self._log("✅ 所有模型加载完成，进入待命状态")
+            logger.info("daemon_success", message="所有模型加载完成，进入待命状态")
             return True
 
         except Exception as e:
-            self._log(f"❌ 初始化失败: {e}")
-            traceback.print_exc(file=sys.stderr)
+            logger.exception("daemon_init_failed", error=str(e))
             return False
 
     async def handle_record(self, mode: str = "push-to-talk", duration: float = 3.0) -> dict:
         """Handle recording command"""
         try:
-            self._log(f"🎤 开始录音 (mode={mode}, duration={duration}s)...")
+            logger.info("daemon_recording", message=f"开始录音 (mode={mode}, duration={duration}s)...")
 
             # 🔧 Fix: Clear interrupt flag before starting new recording
             self.assistant.recording_interrupt_event.clear()
@@ -225,57 +442,87 @@ class SpeekiumDaemon:
             if mode == "continuous":
                 # Send "listening" event when entering continuous mode
                 self._emit_ptt_event("listening")
-                self._log("🎤 正在监听...")
+                logger.info("daemon_recording", message="正在监听...")
 
                 # Use VAD auto-detection - send recording event when voice detected
                 def on_speech():
                     # Send "detected" event when speech is first detected
                     self._emit_ptt_event("detected")
-                    self._log("🎤 检测到声音，开始录音...")
+                    logger.info("daemon_recording", message="检测到声音，开始录音...")
 
-                audio = self.assistant.record_with_vad(on_speech_detected=on_speech)
+                audio = await asyncio.to_thread(
+                    self.assistant.record_with_vad, on_speech_detected=on_speech
+                )
             else:
                 # Push-to-talk recording mode - send recording event
                 self._emit_ptt_event("recording")
-                audio = sd.rec(int(duration * 16000), samplerate=16000, channels=1, dtype="float32")
-                sd.wait()
-                audio = audio[:, 0]  # Convert to 1D array
+                audio = await asyncio.to_thread(self._record_fixed_duration, duration)
 
             if audio is None or len(audio) == 0:
                 self._emit_ptt_event("idle")
                 return {"success": False, "error": "No audio recorded"}
 
-            self._log("🔄 识别中...")
+            logger.info("daemon_processing", message="识别中...")
             self._emit_ptt_event("processing")
-            text, language = self.assistant.transcribe(audio)
+            text, language = await asyncio.to_thread(self.assistant.transcribe, audio)
 
-            self._log(f"✅ 识别完成: '{text}' ({language})")
+            logger.info("daemon_success", message=f"识别完成: '{text}' ({language})")
             self._emit_ptt_event("idle")
 
             return {"success": True, "text": text, "language": language}
 
         except Exception as e:
-            self._log(f"❌ 录音失败: {e}")
+            logger.exception("record_failed", error=str(e))
             self._emit_ptt_event("idle")
-            traceback.print_exc(file=sys.stderr)
             return {"success": False, "error": str(e)}
 
+    def _record_fixed_duration(self, duration: float):
+        """Record a fixed-length clip (blocking, run via to_thread)
+
+        Stops early when recording_interrupt_event is set; returns what was captured.
+        """
+        buffer = AudioBuffer(int(duration * 16000))
+
+        def audio_callback(indata, frames, time_info, status):
+            buffer.write(indata[:, 0])
+            if buffer.is_full:
+                raise sd.CallbackStop
+
+        with sd.InputStream(
+            samplerate=16000,
+            channels=1,
+            dtype="float32",
+            callback=audio_callback,
+            blocksize=CAPTURE_BLOCKSIZE,
+            latency="low",
+        ) as stream:
+            while stream.active:
+                if self.assistant.recording_interrupt_event.wait(0.05):
+                    logger.info("daemon_log", message="🚫 Recording interrupted")
+                    break
+
+        return buffer.view()
+
     async def handle_record_start(self) -> dict:
         """Start PTT recording - called when hotkey is pressed"""
         try:
             if self.ptt_recording:
                 return {"success": False, "error": "Already recording"}
 
-            self._log("🎤 PTT: Starting recording...")
+            logger.info("daemon_recording", message="PTT: Starting recording...")
 
-            # Clear previous audio frames
-            self.ptt_audio_frames = []
+            # Reuse one preallocated buffer: the callback copies into it without allocating
+            if self.ptt_buffer is None:
+                from speekium import PTT_MAX_DURATION, SAMPLE_RATE
+
+                self.ptt_buffer = AudioBuffer(PTT_MAX_DURATION * SAMPLE_RATE)
+            self.ptt_buffer.clear()
             self.ptt_recording = True
 
             # Audio callback to collect frames
             def audio_callback(indata, frames, time_info, status):
                 if self.ptt_recording:
-                    self.ptt_audio_frames.append(indata.copy())
+                    self.ptt_buffer.write(indata[:, 0])
 
             # Start audio stream
             self.ptt_stream = sd.InputStream(
@@ -283,17 +530,17 @@ class SpeekiumDaemon:
                 channels=1,
                 dtype="float32",
                 callback=audio_callback,
-                blocksize=512,
+                blocksize=CAPTURE_BLOCKSIZE,
+                latency="low",
             )
             self.ptt_stream.start()
 
-            self._log("🎤 PTT: Recording started")
+            logger.info("daemon_recording", message="PTT: Recording started")
             return {"success": True, "message": "Recording started"}
 
         except Exception as e:
-            self._log(f"❌ PTT start failed: {e}")
+            logger.exception("ptt_start_failed", error=str(e))
             self.ptt_recording = False
-            traceback.print_exc(file=sys.stderr)
             return {"success": False, "error": str(e)}
 
     async def handle_ptt_audio(
@@ -305,50 +552,38 @@ class SpeekiumDaemon:
         use_tts: bool = True,
     ) -> dict:
         """Handle PTT audio from Rust - receives WAV file path, performs ASR + chat"""
-        import os
-        import numpy as np
-        from scipy.io import wavfile
-
         try:
             t0 = time.time()
-            self._log(f"🎤 PTT Audio: Loading file ({duration:.2f}s): {audio_path}")
+            logger.info(
+                "daemon_recording",
+                message=f"PTT Audio: Loading file ({duration:.2f}s): {audio_path}",
+            )
 
             # Check file exists
             if not os.path.exists(audio_path):
                 return {"success": False, "error": f"Audio file not found: {audio_path}"}
 
-            # Load WAV file using scipy (simple and reliable)
+            # Memory-map the PCM payload and convert to mono float32 in one pass
             t1 = time.time()
-            wav_sample_rate, samples = wavfile.read(audio_path)
+            wav_sample_rate, samples = read_wav_float32(audio_path)
             t2 = time.time()
             logger.debug("ptt_timing", step="load_wav_file", ms=int((t2 - t1) * 1000))
 
-            # Convert to float32 if needed
-            t3 = time.time()
-            if samples.dtype == np.int16:
-                samples = samples.astype(np.float32) / 32768.0
-            elif samples.dtype == np.int32:
-                samples = samples.astype(np.float32) / 2147483648.0
-            elif samples.dtype != np.float32:
-                samples = samples.astype(np.float32)
-
-            # Convert to mono if stereo
-            if len(samples.shape) > 1 and samples.shape[1] == 2:
-                samples = samples.mean(axis=1)
-            t4 = time.time()
-            logger.debug("ptt_timing", step="convert_format", ms=int((t4 - t3) * 1000))
-
             actual_duration = len(samples) / wav_sample_rate
-            self._log(
-                f"🎵 WAV info: {wav_sample_rate}Hz, {len(samples)} samples ({actual_duration:.2f}s)"
+            logger.info(
+                "daemon_log",
+                message=(
+                    f"🎵 WAV info: {wav_sample_rate}Hz, "
+                    f"{len(samples)} samples ({actual_duration:.2f}s)"
+                ),
             )
 
             # Delete temp file after loading
             try:
                 os.remove(audio_path)
-                self._log(f"🗑️ Deleted temp file: {audio_path}")
+                logger.info("daemon_log", message=f"🗑️ Deleted temp file: {audio_path}")
             except Exception as e:
-                self._log(f"⚠️ Failed to delete temp file: {e}")
+                logger.warning("daemon_warning", message=f"Failed to delete temp file: {e}")
 
             if actual_duration < 0.3:
                 self._emit_ptt_event("idle")
@@ -356,12 +591,12 @@ class SpeekiumDaemon:
 
             # ASR
             t5 = time.time()
-            self._log("🔄 识别中...")
-            text, language = self.assistant.transcribe(samples)
+            logger.info("daemon_processing", message="识别中...")
+            text, language = await asyncio.to_thread(self.assistant.transcribe, samples)
             t6 = time.time()
             asr_ms = int((t6 - t5) * 1000)
             logger.debug("ptt_timing", step="asr_total", ms=asr_ms)
-            self._log(f"✅ 识别完成: '{text}' ({language})")
+            logger.info("daemon_success", message=f"识别完成: '{text}' ({language})")
 
             if not text or not text.strip():
                 self._emit_ptt_event("idle")
@@ -377,16 +612,15 @@ class SpeekiumDaemon:
 
             # Auto chat with TTS if enabled
             if auto_chat and text.strip():
-                self._log(f"💬 PTT: Auto chat with TTS...")
+                logger.info("daemon_chat", message=f"PTT: Auto chat with TTS...")
                 await self._handle_ptt_chat_tts(text, use_tts)
 
             self._emit_ptt_event("idle")
             return {"success": True, "text": text, "language": language}
 
         except Exception as e:
-            self._log(f"❌ PTT Audio processing failed: {e}")
+            logger.exception("ptt_audio_failed", error=str(e))
             self._emit_ptt_event("error", {"error": str(e)})
-            traceback.print_exc(file=sys.stderr)
             return {"success": False, "error": str(e)}
 
     async def handle_record_stop(self, auto_chat: bool = True, use_tts: bool = True) -> dict:
@@ -395,7 +629,7 @@ class SpeekiumDaemon:
             if not self.ptt_recording:
                 return {"success": False, "error": "Not recording"}
 
-            self._log("🎤 PTT: Stopping recording...")
+            logger.info("daemon_recording", message="PTT: Stopping recording...")
 
             # Stop recording
             self.ptt_recording = False
@@ -405,25 +639,22 @@ class SpeekiumDaemon:
                 self.ptt_stream.close()
                 self.ptt_stream = None
 
-            # Combine audio frames
-            if not self.ptt_audio_frames:
+            if self.ptt_buffer is None or len(self.ptt_buffer) == 0:
                 return {"success": False, "error": "No audio recorded"}
 
-            import numpy as np
-
-            audio = np.concatenate(self.ptt_audio_frames, axis=0)
-            audio = audio[:, 0]  # Convert to 1D array
+            # View into the recording buffer (no copy); it is only rewritten on the next start
+            audio = self.ptt_buffer.view()
 
             duration = len(audio) / 16000
-            self._log(f"🎤 PTT: Recorded {duration:.2f}s of audio")
+            logger.info("daemon_recording", message=f"PTT: Recorded {duration:.2f}s of audio")
 
             if duration < 0.3:
                 return {"success": False, "error": "Recording too short"}
 
             # ASR
-            self._log("🔄 识别中...")
-            text, language = self.assistant.transcribe(audio)
-            self._log(f"✅ 识别完成: '{text}' ({language})")
+            logger.info("daemon_processing", message="识别中...")
+            text, language = await asyncio.to_thread(self.assistant.transcribe, audio)
+            logger.info("daemon_success", message=f"识别完成: '{text}' ({language})")
 
             if not text or not text.strip():
                 return {
@@ -438,13 +669,13 @@ class SpeekiumDaemon:
 
             # Auto chat with TTS if enabled
             if auto_chat and text.strip():
-                self._log(f"💬 PTT: Auto chat with TTS...")
+                logger.info("daemon_chat", message=f"PTT: Auto chat with TTS...")
                 await self._handle_ptt_chat_tts(text, use_tts)
 
             return {"success": True, "text": text, "language": language}
 
         except Exception as e:
-            self._log(f"❌ PTT stop failed: {e}")
+            logger.exception("ptt_stop_failed", error=str(e))
             self.ptt_recording = False
             if self.ptt_stream:
                 try:
@@ -453,15 +684,14 @@ class SpeekiumDaemon:
                 except Exception:
                     pass
                 self.ptt_stream = None
-            traceback.print_exc(file=sys.stderr)
             return {"success": False, "error": str(e)}
 
     async def _handle_ptt_chat_tts(self, text: str, use_tts: bool = True) -> None:
         """Handle LLM streaming chat + TTS for PTT mode (emits via stderr for Rust capture)"""
         try:
-            self._log(f"💬🔊 PTT LLM+TTS: {text[:50]}...")
+            logger.info("daemon_chat", message=f"💬🔊 PTT LLM+TTS: {text[:50]}...")
 
-            backend = self.assistant.load_llm()
+            backend = self._get_llm()
             full_response = ""
 
             # Check if streaming is supported
@@ -478,54 +708,69 @@ class SpeekiumDaemon:
                         self._emit_ptt_event(
                             "audio_chunk", {"audio_path": audio_path, "text": response}
                         )
-                        await self._play_audio(audio_path)
+                        await self._play_audio(audio_path, response)
             else:
-                # Stream LLM + TTS generation
-                async for sentence in backend.chat_stream(text):
-                    if sentence and sentence.strip():
-                        full_response += sentence
-                        self._log(f"📤 PTT streaming: {sentence[:30]}...")
-
-                        # Send text chunk via stderr
-                        self._emit_ptt_event("assistant_chunk", {"content": sentence})
+                # Stream LLM + TTS generation; sentence N plays while N+1 is synthesized
+                play_queue = asyncio.Queue(maxsize=PLAYBACK_QUEUE_SIZE)
+                player = asyncio.create_task(self._playback_worker(play_queue))
+                try:
+                    async for sentence in backend.chat_stream(text):
+                        if sentence and sentence.strip():
+                            full_response += sentence
+                            logger.info(
+                                "daemon_log",
+                                message=f"📤 PTT streaming: {sentence[:30]}...",
+                            )
 
-                        # Generate TTS immediately
-                        if use_tts:
-                            try:
-                                audio_path = await self.assistant.generate_audio(sentence)
-                                if audio_path:
-                                    self._log(f"🔊 TTS completed: {audio_path}")
-                                    self._emit_ptt_event(
-                                        "audio_chunk", {"audio_path": audio_path, "text": sentence}
+                            # Send text chunk via stderr
+                            self._emit_ptt_event("assistant_chunk", {"content": sentence})
+
+                            # Generate TTS immediately
+                            if use_tts:
+                                try:
+                                    audio_path = await self.assistant.generate_audio(sentence)
+                                    if audio_path:
+                                        logger.info(
+                                            "daemon_log",
+                                            message=f"🔊 TTS completed: {audio_path}",
+                                        )
+                                        self._emit_ptt_event(
+                                            "audio_chunk",
+                                            {"audio_path": audio_path, "text": sentence},
+                                        )
+                                        await play_queue.put((audio_path, sentence))
+                                except Exception as tts_error:
+                                    logger.warning(
+                                        "daemon_warning",
+                                        message=f"TTS generation failed: {tts_error}",
                                     )
-                                    await self._play_audio(audio_path)
-                            except Exception as tts_error:
-                                self._log(f"⚠️ TTS generation failed: {tts_error}")
+                finally:
+                    # Let queued sentences finish playing before reporting completion
+                    await play_queue.put(None)
+                    await player
 
             # Send completion marker
             self._emit_ptt_event("assistant_done", {"content": full_response})
-            self._log("✅ PTT LLM+TTS completed")
+            logger.info("daemon_success", message="PTT LLM+TTS completed")
 
         except Exception as e:
-            self._log(f"❌ PTT LLM+TTS failed: {e}")
-            traceback.print_exc(file=sys.stderr)
+            logger.exception("ptt_chat_tts_failed", error=str(e))
             self._emit_ptt_event("error", {"error": str(e)})
 
     async def handle_chat(self, text: str) -> dict:
         """Handle LLM chat command (non-streaming)"""
         try:
-            self._log(f"💬 LLM 对话: {text[:50]}...")
+            logger.info("daemon_chat", message=f"LLM 对话: {text[:50]}...")
 
-            backend = self.assistant.load_llm()
+            backend = self._get_llm()
             response = backend.chat(text)
 
-            self._log(f"✅ LLM 响应: {response[:50]}...")
+            logger.info("daemon_success", message=f"LLM 响应: {response[:50]}...")
 
             return {"success": True, "content": response}
 
         except Exception as e:
-            self._log(f"❌ LLM 对话失败: {e}")
-            traceback.print_exc(file=sys.stderr)
+            logger.exception("chat_failed", error=str(e))
             return {"success": False, "error": str(e)}
 
     async def handle_chat_stream(self, text: str) -> None:
@@ -537,32 +782,31 @@ class SpeekiumDaemon:
         - 错误标记：{"type": "error", "error": "错误信息"}
         """
         try:
-            self._log(f"💬 LLM 流式对话: {text[:50]}...")
+            logger.info("daemon_chat", message=f"LLM 流式对话: {text[:50]}...")
 
-            backend = self.assistant.load_llm()
+            backend = self._get_llm()
 
             # Check if streaming is supported
             if not hasattr(backend, "chat_stream"):
                 # Streaming not supported, return complete response
                 response = backend.chat(text)
-                print(json.dumps({"type": "chunk", "content": response}), flush=True)
-                print(json.dumps({"type": "done"}), flush=True)
+                emit({"type": "chunk", "content": response})
+                emit({"type": "done"})
                 return
 
             # Stream generation
             async for sentence in backend.chat_stream(text):
                 if sentence:
-                    self._log(f"📤 流式输出: {sentence[:30]}...")
-                    print(json.dumps({"type": "chunk", "content": sentence}), flush=True)
+                    logger.info("daemon_log", message=f"📤 流式输出: {sentence[:30]}...")
+                    emit({"type": "chunk", "content": sentence})
 
             # Send completion marker
-            print(json.dumps({"type": "done"}), flush=True)
-            self._log("✅ 流式对话完成")
+            emit({"type": "done"})
+            logger.info("daemon_success", message="流式对话完成")
 
         except Exception as e:
-            self._log(f"❌ 流式对话失败: {e}")
-            traceback.print_exc(file=sys.stderr)
-            print(json.dumps({"type": "error", "error": str(e)}), flush=True)
+            logger.exception("chat_stream_failed", error=str(e))
+            emit({"type": "error", "error": str(e)})
 
     async def handle_chat_tts_stream(self, text: str, auto_play: bool = True) -> None:
         """Handle LLM streaming chat + TTS streaming generation
@@ -573,19 +817,16 @@ class SpeekiumDaemon:
         - Done marker: {"type": "done"}
         - Error marker: {"type": "error", "error": "error message"}
         """
-        import asyncio
-        import platform
-
         try:
-            self._log(f"💬🔊 LLM+TTS streaming: {text[:50]}...")
+            logger.info("daemon_chat", message=f"💬🔊 LLM+TTS streaming: {text[:50]}...")
 
             # Set TTS generation state to pause VAD
             self.assistant.is_generating_tts = True
 
-            backend = self.assistant.load_llm()
+            backend = self._get_llm()
 
             # Clear interrupt flag at start
-            self.interrupt_event.clear()
+            self._clear_interrupt()
 
             # Check if streaming is supported
             if not hasattr(backend, "chat_stream"):
@@ -594,303 +835,274 @@ class SpeekiumDaemon:
 
                 # Check for interrupt before TTS generation
                 if self.interrupt_event.is_set():
-                    self._log("🚫 LLM response interrupted (before TTS)")
-                    print(
-                        json.dumps({"type": "interrupted", "reason": "Interrupted before TTS"}),
-                        flush=True,
-                    )
+                    logger.info("daemon_log", message="🚫 LLM response interrupted (before TTS)")
+                    emit({"type": "interrupted", "reason": "Interrupted before TTS"})
                     # Clear TTS generation state to resume VAD
                     self.assistant.is_generating_tts = False
                     return
 
-                print(json.dumps({"type": "text_chunk", "content": response}), flush=True)
+                emit({"type": "text_chunk", "content": response})
 
                 # Generate TTS
                 audio_path = await self.assistant.generate_audio(response)
 
                 # Check for interrupt before playback
                 if self.interrupt_event.is_set():
-                    self._log("🚫 TTS generation interrupted (before playback)")
-                    print(
-                        json.dumps(
-                            {"type": "interrupted", "reason": "Interrupted before playback"}
-                        ),
-                        flush=True,
+                    logger.info(
+                        "daemon_log",
+                        message="🚫 TTS generation interrupted (before playback)",
                     )
+                    emit({"type": "interrupted", "reason": "Interrupted before playback"})
                     # Clear TTS generation state to resume VAD
                     self.assistant.is_generating_tts = False
                     return
 
                 if audio_path and auto_play:
-                    print(
-                        json.dumps(
-                            {"type": "audio_chunk", "audio_path": audio_path, "text": response}
-                        ),
-                        flush=True,
-                    )
+                    emit({"type": "audio_chunk", "audio_path": audio_path, "text": response})
                     # Play audio immediately
-                    await self._play_audio(audio_path)
+                    await self._play_audio(audio_path, response)
 
                     # Clear TTS generation state to resume VAD
                     self.assistant.is_generating_tts = False
                     return
 
-                print(json.dumps({"type": "done"}), flush=True)
+                emit({"type": "done"})
                 return
 
-            # Stream LLM + TTS generation
-            async for sentence in backend.chat_stream(text):
-                # Check for interrupt in streaming loop
-                if self.interrupt_event.is_set():
-                    self._log("🚫 LLM streaming interrupted")
-                    print(
-                        json.dumps({"type": "interrupted", "reason": "LLM streaming interrupted"}),
-                        flush=True,
-                    )
-                    # Clear TTS generation state to resume VAD
-                    self.assistant.is_generating_tts = False
-                    break
-
-                if sentence and sentence.strip():
-                    self._log(f"📤 Streaming output: {sentence[:30]}...")
-
-                    # Send text chunk
-                    print(json.dumps({"type": "text_chunk", "content": sentence}), flush=True)
-
-                    # Check for interrupt before TTS generation
-                    if self.interrupt_event.is_set():
-                        self._log("🚫 Interrupted before TTS generation")
-                        break
-
-                    # Generate TTS immediately
-                    try:
-                        audio_path = await self.assistant.generate_audio(sentence)
-                        if audio_path:
-                            self._log(f"🔊 TTS completed: {audio_path}")
-                            print(
-                                json.dumps(
-                                    {
-                                        "type": "audio_chunk",
-                                        "audio_path": audio_path,
-                                        "text": sentence,
-                                    }
-                                ),
-                                flush=True,
+            # Stream LLM + TTS generation; sentence N plays while N+1 is synthesized
+            play_queue = asyncio.Queue(maxsize=PLAYBACK_QUEUE_SIZE)
+            player = asyncio.create_task(self._playback_worker(play_queue))
+            try:
+                # Ends as soon as an interrupt arrives, even while waiting on the LLM.
+                # aclosing: a break below still cancels the watcher and closes the LLM stream
+                async with contextlib.aclosing(
+                    self._until_interrupted(backend.chat_stream(text))
+                ) as sentences:
+                    async for sentence in sentences:
+                        if sentence and sentence.strip():
+                            logger.info(
+                                "daemon_log", message=f"📤 Streaming output: {sentence[:30]}..."
                             )
-                            # Play audio immediately if auto_play is enabled
-                            if auto_play:
-                                # Check for interrupt before playback
-                                if self.interrupt_event.is_set():
-                                    self._log("🚫 Interrupted before audio playback")
-                                    break
-                                await self._play_audio(audio_path)
-                    except Exception as tts_error:
-                        self._log(f"⚠️ TTS generation failed: {tts_error}")
-                        # TTS failure should not interrupt streaming chat
+
+                            # Send text chunk
+                            emit({"type": "text_chunk", "content": sentence})
+
+                            # Check for interrupt before TTS generation
+                            if self.interrupt_event.is_set():
+                                logger.info(
+                                    "daemon_log", message="🚫 Interrupted before TTS generation"
+                                )
+                                break
+
+                            # Generate TTS immediately
+                            try:
+                                audio_path = await self.assistant.generate_audio(sentence)
+                                if audio_path:
+                                    logger.info(
+                                        "daemon_log", message=f"🔊 TTS completed: {audio_path}"
+                                    )
+                                    emit(
+                                        {
+                                            "type": "audio_chunk",
+                                            "audio_path": audio_path,
+                                            "text": sentence,
+                                        }
+                                    )
+                                    # Queue for playback if auto_play is enabled
+                                    if auto_play:
+                                        await play_queue.put((audio_path, sentence))
+                            except Exception as tts_error:
+                                logger.warning(
+                                    "daemon_warning",
+                                    message=f"TTS generation failed: {tts_error}",
+                                )
+                                # TTS failure should not interrupt streaming chat
+
+                if self.interrupt_event.is_set():
+                    logger.info("daemon_log", message="🚫 LLM streaming interrupted")
+                    emit({"type": "interrupted", "reason": "LLM streaming interrupted"})
+            finally:
+                # Let queued sentences finish playing (skipped once interrupted)
+                await play_queue.put(None)
+                await player
 
             # Send completion marker
-            print(json.dumps({"type": "done"}), flush=True)
-            self._log("✅ Streaming chat+TTS completed")
+            emit({"type": "done"})
+            logger.info("daemon_success", message="Streaming chat+TTS completed")
 
             # Clear TTS generation state to resume VAD
             self.assistant.is_generating_tts = False
 
         except Exception as e:
-            self._log(f"❌ Streaming chat+TTS failed: {e}")
-            traceback.print_exc(file=sys.stderr)
-            print(json.dumps({"type": "error", "error": str(e)}), flush=True)
+            logger.exception("chat_tts_stream_failed", error=str(e))
+            emit({"type": "error", "error": str(e)})
 
             # Clear TTS generation state to resume VAD
             self.assistant.is_generating_tts = False
 
-    async def _play_audio(self, audio_path: str) -> None:
-        """Play audio file (cross-platform) with interrupt support (P0-4)"""
-        import asyncio
-        import os
-        import platform
-        import subprocess
+    async def _until_interrupted(self, stream):
+        """Yield items from an async iterator until the interrupt event is set
 
+        Each __anext__ is raced against interrupt_aio_event, so an interrupt is
+        honoured immediately instead of after the next sentence arrives.
+        """
+        iterator = stream.__aiter__()
+        interrupt_task = asyncio.create_task(self.interrupt_aio_event.wait())
         try:
-            system = platform.system()
-            self._log(f"🔊 Playing audio on {system}: {audio_path}")
-
-            if system == "Darwin":  # macOS
-                # Check if audio file exists
-                if not os.path.exists(audio_path):
-                    self._log(f"⚠️ Audio file not found: {audio_path}")
+            while True:
+                next_task = asyncio.ensure_future(iterator.__anext__())
+                await asyncio.wait({next_task, interrupt_task}, return_when=asyncio.FIRST_COMPLETED)
+                if interrupt_task.done():
+                    next_task.cancel()
+                    await asyncio.wait({next_task})
+                    return
+                try:
+                    item = next_task.result()
+                except StopAsyncIteration:
                     return
+                yield item
+        finally:
+            interrupt_task.cancel()
+            if hasattr(iterator, "aclose"):
+                await iterator.aclose()
 
-                # Use afplay (built-in macOS command)
-                self._log(f"🔊 Playing audio")
-                process = await asyncio.create_subprocess_exec(
-                    "afplay",
-                    audio_path,
-                    stdout=asyncio.subprocess.DEVNULL,
-                    stderr=asyncio.subprocess.DEVNULL,
-                )
+    async def _playback_worker(self, queue: asyncio.Queue) -> None:
+        """Play queued (audio_path, text) items in order until a None sentinel arrives
 
-                # Wait for playback with interrupt checking
-                while True:
-                    if self.interrupt_event.is_set():
-                        self._log("🚫 Audio playback interrupted")
-                        process.terminate()
-                        try:
-                            await asyncio.wait_for(process.wait(), timeout=1.0)
-                        except asyncio.TimeoutError:
-                            process.kill()
-                        return
-                    if process.returncode is not None:
-                        break  # Process finished
-                    await asyncio.sleep(0.1)  # Check every 100ms
-
-            elif system == "Linux":
-                # Try mpg123 or ffplay
-                try:
-                    process = await asyncio.create_subprocess_exec(
-                        "mpg123",
-                        "-q",
-                        audio_path,
-                        stdout=asyncio.subprocess.DEVNULL,
-                        stderr=asyncio.subprocess.DEVNULL,
-                    )
-                    self._log(f"🔊 Playing audio: {audio_path}")
+        Files still queued after an interrupt are drained without playing.
+        """
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            if self.interrupt_event.is_set():
+                continue
+            await self._play_audio(*item)
 
-                    # Wait for playback with interrupt checking
-                    while True:
-                        if self.interrupt_event.is_set():
-                            self._log("🚫 Audio playback interrupted")
-                            process.terminate()
-                            try:
-                                await asyncio.wait_for(process.wait(), timeout=1.0)
-                            except asyncio.TimeoutError:
-                                process.kill()
-                            return
-                        if process.returncode is not None:
-                            break
-                        await asyncio.sleep(0.1)
-
-                except FileNotFoundError:
-                    # Fallback to ffplay if mpg123 is not available
-                    process = await asyncio.create_subprocess_exec(
-                        "ffplay",
-                        "-nodisp",
-                        "-autoexit",
-                        audio_path,
-                        stdout=asyncio.subprocess.DEVNULL,
-                        stderr=asyncio.subprocess.DEVNULL,
-                    )
-                    self._log(f"🔊 Playing audio: {audio_path}")
+    def _set_interrupt(self) -> None:
+        """Set the interrupt flag and wake async waiters (safe from any thread)"""
+        self.interrupt_event.set()
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.interrupt_aio_event.set)
 
-                    # Wait for playback with interrupt checking
-                    while True:
-                        if self.interrupt_event.is_set():
-                            self._log("🚫 Audio playback interrupted")
-                            process.terminate()
-                            try:
-                                await asyncio.wait_for(process.wait(), timeout=1.0)
-                            except asyncio.TimeoutError:
-                                process.kill()
-                            return
-                        if process.returncode is not None:
-                            break
-                        await asyncio.sleep(0.1)
-
-            elif system == "Windows":
-                # Use Windows Media Player with duration detection
-                # Convert Unix path to Windows path if needed
-                win_path = os.path.abspath(audio_path).replace("/", "\\")
-
-                # PowerShell script to play audio and wait for completion
-                ps_script = (
-                    f"Add-Type -AssemblyName presentationCore; "
-                    f"$mediaPlayer = New-Object System.Windows.Media.MediaPlayer; "
-                    f"$mediaPlayer.Open([uri]::new('{win_path}')); "
-                    f"$mediaPlayer.Play(); "
-                    # Wait for NaturalDuration to be available
-                    f"while ($mediaPlayer.NaturalDuration.HasTimeSpan -eq $false) {{ Start-Sleep -Milliseconds 100 }}; "
-                    # Get duration in seconds and add 0.5s buffer
-                    f"$duration = $mediaPlayer.NaturalDuration.TimeSpan.TotalSeconds + 0.5; "
-                    f"Start-Sleep -Seconds $duration; "
-                    f"$mediaPlayer.Close()"
-                )
+    def _clear_interrupt(self) -> None:
+        """Clear the interrupt flag (called on the event loop thread)"""
+        self.interrupt_event.clear()
+        self.interrupt_aio_event.clear()
+
+    async def _await_process_or_interrupt(self, process) -> bool:
+        """Wait for a player process to exit, terminating it early on interrupt
+
+        Returns:
+            True if playback was interrupted
+        """
+        wait_task = asyncio.create_task(process.wait())
+        interrupt_task = asyncio.create_task(self.interrupt_aio_event.wait())
+        try:
+            await asyncio.wait({wait_task, interrupt_task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            interrupt_task.cancel()
+
+        if wait_task.done():
+            return False
+
+        logger.info("daemon_log", message="🚫 Audio playback interrupted")
+        process.terminate()
+        try:
+            await asyncio.wait_for(wait_task, timeout=1.0)
+        except asyncio.TimeoutError:
+            process.kill()
+        return True
+
+    async def _play_audio(self, audio_path: str, text: Optional[str] = None) -> None:
+        """Play audio file (cross-platform) with interrupt support (P0-4)
 
-                process = await asyncio.create_subprocess_exec(
-                    "powershell",
-                    "-c",
-                    ps_script,
-                    stdout=asyncio.subprocess.DEVNULL,
-                    stderr=asyncio.subprocess.DEVNULL,
+        When text is given, the decoded PCM is cached under it so a repeated
+        sentence skips decoding.
+        """
+        try:
+            logger.info("daemon_log", message=f"🔊 Playing audio on {PLATFORM}: {audio_path}")
+
+            if not os.path.exists(audio_path):
+                logger.warning("daemon_warning", message=f"Audio file not found: {audio_path}")
+                return
+
+            # Persistent output stream (WASAPI / CoreAudio / ALSA via PortAudio):
+            # no per-clip process spawn, interrupt checked between blocks
+            try:
+                cache_key = self.assistant.pcm_cache_key(text) if text else None
+                interrupted = await asyncio.to_thread(
+                    self.assistant.play_file_on_stream,
+                    audio_path,
+                    self.interrupt_event,
+                    cache_key,
+                )
+                if interrupted:
+                    logger.info("daemon_log", message="🚫 Audio playback interrupted")
+                return
+            except Exception as e:
+                logger.warning(
+                    "daemon_warning",
+                    message=f"Stream playback failed, falling back to player: {e}",
                 )
-                self._log(f"🔊 Playing audio: {audio_path}")
-
-                # Wait for playback with interrupt checking (Windows)
-                while True:
-                    if self.interrupt_event.is_set():
-                        self._log("🚫 Audio playback interrupted")
-                        process.terminate()
-                        try:
-                            await asyncio.wait_for(process.wait(), timeout=1.0)
-                        except asyncio.TimeoutError:
-                            process.kill()
-                        return
-                    if process.returncode is not None:
-                        break
-                    await asyncio.sleep(0.1)
 
-            else:
-                self._log(f"⚠️ Unsupported operating system: {system}")
+            cmd = player_command(audio_path)
+            if cmd is None:
+                logger.warning("daemon_warning", message=f"No audio player available on {PLATFORM}")
+                return
 
-        except Exception as e:
-            import traceback
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            await self._await_process_or_interrupt(process)
 
-            self._log(f"⚠️ Audio playback failed: {e}")
-            traceback.print_exc(file=sys.stderr)
+        except Exception as e:
+            logger.exception("audio_playback_failed", error=str(e))
 
     async def handle_tts(self, text: str, language: Optional[str] = None) -> dict:
         """Handle TTS generation command"""
         try:
-            self._log(f"🔊 TTS 生成: {text[:50]}...")
+            logger.info("daemon_log", message=f"🔊 TTS 生成: {text[:50]}...")
 
             audio_path = await self.assistant.generate_audio(text, language)
 
             if audio_path:
-                self._log(f"✅ TTS 完成: {audio_path}")
+                logger.info("daemon_success", message=f"TTS 完成: {audio_path}")
                 return {"success": True, "audio_path": audio_path}
             else:
                 return {"success": False, "error": "Failed to generate audio"}
 
         except Exception as e:
-            self._log(f"❌ TTS 失败: {e}")
-            traceback.print_exc(file=sys.stderr)
+            logger.exception("tts_failed", error=str(e))
             return {"success": False, "error": str(e)}
 
     async def handle_config(self) -> dict:
         """Handle get config command"""
         try:
-            from config_manager import ConfigManager
-
-            config = ConfigManager.load()
+            config = self._load_config()
             return {"success": True, "config": config}
         except Exception as e:
-            self._log(f"❌ 配置加载失败: {e}")
+            logger.error("daemon_error", message=f"配置加载失败: {e}")
             return {"success": False, "error": str(e)}
 
     async def handle_save_config(self, config: dict) -> dict:
         """Save configuration"""
         try:
-            from config_manager import ConfigManager
-
             # Log what changed
             llm_provider = config.get("llm_provider", "未指定")
-            self._log(f"📥 收到保存配置请求 (AI 服务商: {llm_provider})")
+            logger.info("daemon_log", message=f"📥 收到保存配置请求 (AI 服务商: {llm_provider})")
 
             # CRITICAL: Load existing config and merge to preserve all fields
             # This prevents losing fields that aren't in the settings UI
             # ConfigManager.load() will clean up old fields automatically
-            existing_config = ConfigManager.load()
+            existing_config = self._load_config()
             merged_config = {**existing_config, **config}
-            ConfigManager.save(merged_config)
-            self._log("✅ 配置已保存到文件")
+            # Disk write off the event loop so concurrent commands are not stalled
+            await asyncio.to_thread(ConfigManager.save, merged_config)
+            self.config_cache = None
+            logger.info("daemon_success", message="配置已保存到文件")
 
             # CRITICAL: Reload all configuration immediately
             # This ensures all changes take effect without needing to track what changed
@@ -910,35 +1122,61 @@ class SpeekiumDaemon:
                 # Reset backend so it will be recreated with new config
                 old_backend = self.assistant.llm_backend
                 self.assistant.llm_backend = None
+                if hasattr(old_backend, "close"):
+                    old_backend.close()
 
                 # Log the change
                 backend_name = old_backend.__class__.__name__ if old_backend else "None"
-                self._log(f"✅ 所有配置已重新加载 (VAD, TTS, LLM)")
-                self._log(
-                    f"🔄 LLM backend 已重置: {backend_name} → 将在下次对话时使用新配置 ({llm_provider})"
+                logger.info("daemon_success", message=f"所有配置已重新加载 (VAD, TTS, LLM)")
+                logger.info(
+                    "daemon_processing",
+                    message=f"LLM backend 已重置: {backend_name} → 将在下次对话时使用新配置 ({llm_provider})",
                 )
 
             return {"success": True}
         except Exception as e:
-            self._log(f"❌ 配置保存失败: {e}")
+            logger.error("daemon_error", message=f"配置保存失败: {e}")
             return {"success": False, "error": str(e)}
 
-    async def handle_update_hotkey(self, hotkey_config: dict) -> dict:
+    def handle_update_hotkey(self, hotkey_config: dict) -> dict:
         """Update hotkey configuration
         Note: Actual hotkey registration is handled by Tauri/Rust side.
         This just acknowledges the config update.
         """
         try:
             display_name = hotkey_config.get("displayName", "unknown")
-            self._log(f"📥 收到热键更新请求: {display_name}")
+            logger.info("daemon_log", message=f"📥 收到热键更新请求: {display_name}")
             # Config is saved via set_config command from Rust
             # Tauri handles the actual hotkey re-registration
-            self._log(f"✅ 热键配置已确认: {display_name}")
+            logger.info("daemon_success", message=f"热键配置已确认: {display_name}")
             return {"success": True}
         except Exception as e:
-            self._log(f"❌ 热键更新失败: {e}")
+            logger.error("daemon_error", message=f"热键更新失败: {e}")
             return {"success": False, "error": str(e)}
 
+    def _models_loaded(self, include_tts: bool = False) -> dict:
+        """Which models are currently loaded (shared by health and get_daemon_state)
+
+        Computed on each call rather than cached: models are loaded lazily and reset
+        from several places in both the daemon and SpeekiumAssistant.
+        """
+        assistant = self.assistant
+        if assistant is None:
+            loaded = {"vad": False, "asr": False, "llm": False}
+            if include_tts:
+                loaded["tts"] = False
+            return loaded
+
+        loaded = {
+            "vad": assistant.vad_model is not None,
+            "asr": assistant.asr_model is not None,
+            "llm": assistant.llm_backend is not None,
+        }
+        if include_tts:
+            # TTS has no persistent model; report whether a TTS backend is configured
+            loaded["tts"] = assistant.tts_backend is not None
+        return loaded
+
     async def handle_health(self) -> dict:
         """Health check"""
         # Check LLM backend health
@@ -946,17 +1184,14 @@ class SpeekiumDaemon:
         if self.assistant and self.assistant.llm_backend:
             backend = self.assistant.llm_backend
             if hasattr(backend, "health_check"):
-                llm_health = backend.health_check()
+                # May be an HTTP round trip (Ollama): keep it off the event loop
+                llm_health = await asyncio.to_thread(backend.health_check)
 
         return {
             "success": True,
             "status": "healthy",
             "command_count": self.command_count,
-            "models_loaded": {
-                "vad": self.assistant.vad_model is not None if self.assistant else False,
-                "asr": self.assistant.asr_model is not None if self.assistant else False,
-                "llm": self.assistant.llm_backend is not None if self.assistant else False,
-            },
+            "models_loaded": self._models_loaded(),
             "llm_health": llm_health,
             "health_monitor_active": self.health_monitor_task is not None and not self.health_monitor_task.done() if self.health_monitor_task else False,
         }
@@ -998,7 +1233,7 @@ class SpeekiumDaemon:
                 "error": str(e),
             }
 
-    async def handle_interrupt(self, priority: int = 1) -> dict:
+    def handle_interrupt(self, priority: int = 1) -> dict:
         """P0-4: Handle interrupt request from Rust backend
 
         Args:
@@ -1007,21 +1242,21 @@ class SpeekiumDaemon:
         Returns:
             dict with success status and message
         """
-        self._log(f"🚫 Interrupt request received (priority {priority})")
+        logger.info("daemon_log", message=f"🚫 Interrupt request received (priority {priority})")
 
         # Set the interrupt flags
-        self.interrupt_event.set()
+        self._set_interrupt()
 
         # 🔧 Fix: Also set VAD recording interrupt flag for continuous mode
         self.assistant.recording_interrupt_event.set()
-        self._log("🛑 VAD recording interrupt flag set")
+        logger.info("daemon_log", message="🛑 VAD recording interrupt flag set")
 
         return {
             "success": True,
             "message": f"Interrupt signal sent (priority {priority})",
         }
 
-    async def handle_get_daemon_state(self) -> dict:
+    def handle_get_daemon_state(self) -> dict:
         """P2-10: Get current daemon state
 
         Returns comprehensive state information including:
@@ -1033,140 +1268,117 @@ class SpeekiumDaemon:
         """
         try:
             # Get current state
+            ptt_samples = len(self.ptt_buffer) if self.ptt_buffer is not None else 0
             state = {
                 "success": True,
                 "running": self.running,
                 "command_count": self.command_count,
                 "ptt_recording": self.ptt_recording,
                 "interrupt_flag_set": self.interrupt_event.is_set(),
-                "models_loaded": {
-                    "vad": self.assistant.vad_model is not None,
-                    "asr": self.assistant.asr_model is not None,
-                    "llm": self.assistant.llm_backend is not None,
-                    "tts": self.assistant.tts_backend is not None,
-                },
-                "audio_frames_count": len(self.ptt_audio_frames) if self.ptt_audio_frames else 0,
+                "models_loaded": self._models_loaded(include_tts=True),
+                # Captured input blocks, as when each block was kept as a separate frame
+                "audio_frames_count": -(-ptt_samples // CAPTURE_BLOCKSIZE),
+                "audio_samples_count": ptt_samples,
                 "ptt_stream_active": self.ptt_stream is not None,
             }
 
-            self._log(
-                f"📊 Daemon state requested: running={state['running']}, "
-                f"ptt_recording={state['ptt_recording']}, "
-                f"commands={state['command_count']}"
+            logger.info(
+                "daemon_log",
+                message=(
+                    f"📊 Daemon state requested: running={state['running']}, "
+                    f"ptt_recording={state['ptt_recording']}, "
+                    f"commands={state['command_count']}"
+                ),
             )
 
             return state
 
         except Exception as e:
-            self._log(f"❌ Failed to get daemon state: {e}")
-            traceback.print_exc(file=sys.stderr)
+            logger.exception("daemon_state_failed", error=str(e))
             return {"success": False, "error": str(e)}
 
     async def handle_command(self, command: str, args: dict) -> dict:
         """Route commands to corresponding handler functions
 
+        Handlers that never wait (interrupt, update_hotkey, get_daemon_state) are plain
+        functions and return their dict directly; the rest return a coroutine.
+
         注意：chat_stream 是特殊命令，不返回 dict，而是直接输出流式数据
         """
         self.command_count += 1
 
-        if command == "record":
-            return await self.handle_record(**args)
-        elif command == "record_start":
-            return await self.handle_record_start()
-        elif command == "record_stop":
-            return await self.handle_record_stop(
-                args.get("auto_chat", True), args.get("use_tts", True)
-            )
-        elif command == "ptt_press":
-            # PTT key pressed - just emit event (Rust handles recording now)
-            self._emit_ptt_event("recording")
-            return {"success": True, "message": "PTT recording started (Rust side)"}
-        elif command == "ptt_release":
-            # PTT key released - emit event and stop recording (called from Rust, legacy mode)
-            self._emit_ptt_event("processing")
-            # Read config to determine auto_chat mode
-            from config_manager import ConfigManager
-
-            config = ConfigManager.load()
-            work_mode = config.get("work_mode", "conversation")
-            auto_chat = work_mode == "conversation"
-            result = await self.handle_record_stop(auto_chat=auto_chat, use_tts=True)
-            if result and result.get("success"):
-                self._emit_ptt_event("idle", {"text": result.get("text", "")})
-            else:
-                self._emit_ptt_event(
-                    "error",
-                    {"error": result.get("error", "Unknown error") if result else "No result"},
-                )
-            return result
-        elif command == "ptt_audio":
-            # PTT audio file from Rust (Rust handles recording, Python handles ASR)
-            from config_manager import ConfigManager
-
-            config = ConfigManager.load()
-            work_mode = config.get("work_mode", "conversation")
-            auto_chat = work_mode == "conversation"
-            return await self.handle_ptt_audio(
-                audio_path=args.get("audio_path", ""),
-                sample_rate=args.get("sample_rate", 16000),
-                duration=args.get("duration", 0),
-                auto_chat=auto_chat,
-                use_tts=True,
+        handler = self.command_handlers.get(command) if isinstance(command, str) else None
+        if handler is None:
+            return {"success": False, "error": f"Unknown command: {command}"}
+        result = handler(args)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+    def _auto_chat_enabled(self) -> bool:
+        """Whether recognized PTT speech should be sent to the LLM (conversation mode)"""
+        return self._load_config().get("work_mode", "conversation") == "conversation"
+
+    async def _cmd_ptt_press(self, args: dict) -> dict:
+        # PTT key pressed - just emit event (Rust handles recording now)
+        self._emit_ptt_event("recording")
+        return {"success": True, "message": "PTT recording started (Rust side)"}
+
+    async def _cmd_ptt_release(self, args: dict) -> dict:
+        # PTT key released - emit event and stop recording (called from Rust, legacy mode)
+        self._emit_ptt_event("processing")
+        result = await self.handle_record_stop(auto_chat=self._auto_chat_enabled(), use_tts=True)
+        if result and result.get("success"):
+            self._emit_ptt_event("idle", {"text": result.get("text", "")})
+        else:
+            self._emit_ptt_event(
+                "error",
+                {"error": result.get("error", "Unknown error") if result else "No result"},
             )
-        elif command == "chat":
-            return await self.handle_chat(args.get("text", ""))
-        elif command == "chat_stream":
-            # Streaming command: output directly to stdout, do not return dict
-            await self.handle_chat_stream(args.get("text", ""))
-            return None  # Indicates processed but no return value
-        elif command == "chat_tts_stream":
-            # Streaming chat + TTS: output directly to stdout, do not return dict
-            await self.handle_chat_tts_stream(args.get("text", ""), args.get("auto_play", True))
-            return None
-        elif command == "tts":
-            return await self.handle_tts(args.get("text", ""), args.get("language"))
-        elif command == "config":
-            return await self.handle_config()
-        elif command == "save_config":
-            # args is directly the config object (Rust side has processed it)
-            return await self.handle_save_config(args)
-        elif command == "update_hotkey":
-            return await self.handle_update_hotkey(args)
-        elif command == "health":
-            return await self.handle_health()
-        elif command == "model_status":
-            return await self.handle_model_status()
-        elif command == "interrupt":
-            # Handle interrupt request
-            priority = args.get("priority", 1)
-            return await self.handle_interrupt(priority)
-        elif command == "get_daemon_state":
-            # Get current daemon state
-            return await self.handle_get_daemon_state()
-        elif command == "set_recording_mode":
-            # Set recording mode (push-to-talk or continuous)
-            mode = args.get("mode", "push-to-talk")
-            self._log(f"🎛️ Recording mode set to: {mode}")
-
-            # Save to config file so VAD loop can detect the change
-            try:
-                from config_manager import ConfigManager
+        return result
+
+    async def _cmd_ptt_audio(self, args: dict) -> dict:
+        # PTT audio file from Rust (Rust handles recording, Python handles ASR)
+        return await self.handle_ptt_audio(
+            audio_path=args.get("audio_path", ""),
+            sample_rate=args.get("sample_rate", 16000),
+            duration=args.get("duration", 0),
+            auto_chat=self._auto_chat_enabled(),
+            use_tts=True,
+        )
 
-                config = ConfigManager.load()
-                config["recording_mode"] = mode
-                ConfigManager.save(config)
-                self._log(f"💾 Saved recording_mode to config: {mode}")
-            except Exception as e:
-                self._log(f"⚠️ Failed to save recording_mode: {e}")
-
-            return {"success": True, "mode": mode}
-        elif command == "exit":
-            self._log("👋 收到退出命令")
-            self._cleanup()
-            self.running = False
-            return {"success": True, "message": "Daemon shutting down"}
-        else:
-            return {"success": False, "error": f"Unknown command: {command}"}
+    async def _cmd_chat_stream(self, args: dict) -> None:
+        # Streaming command: output directly to stdout, do not return dict
+        await self.handle_chat_stream(args.get("text", ""))
+        return None  # Indicates processed but no return value
+
+    async def _cmd_chat_tts_stream(self, args: dict) -> None:
+        # Streaming chat + TTS: output directly to stdout, do not return dict
+        await self.handle_chat_tts_stream(args.get("text", ""), args.get("auto_play", True))
+        return None
+
+    async def _cmd_set_recording_mode(self, args: dict) -> dict:
+        # Set recording mode (push-to-talk or continuous)
+        mode = args.get("mode", "push-to-talk")
+        logger.info("daemon_log", message=f"🎛️ Recording mode set to: {mode}")
+
+        # Save to config file so VAD loop can detect the change
+        try:
+            config = self._load_config()
+            config["recording_mode"] = mode
+            await asyncio.to_thread(ConfigManager.save, config)
+            self.config_cache = None
+            logger.info("daemon_log", message=f"💾 Saved recording_mode to config: {mode}")
+        except Exception as e:
+            logger.warning("daemon_warning", message=f"Failed to save recording_mode: {e}")
+
+        return {"success": True, "mode": mode}
+
+    async def _cmd_exit(self, args: dict) -> dict:
+        logger.info("daemon_log", message="👋 收到退出命令")
+        self._cleanup()
+        self.running = False
+        return {"success": True, "message": "Daemon shutting down"}
 
     async def _health_monitor_loop(self):
         """Background health monitoring loop for Ollama/LLM processes"""
@@ -1185,7 +1397,7 @@ class SpeekiumDaemon:
 
                     # Check if backend has health_check method
                     if hasattr(backend, "health_check"):
-                        health_result = backend.health_check()
+                        health_result = await asyncio.to_thread(backend.health_check)
 
                         logger.info(
                             "llm_health_check",
@@ -1197,7 +1409,10 @@ class SpeekiumDaemon:
 
                         # If unhealthy, try to reload the LLM backend
                         if not health_result.get("healthy"):
-                            self._log(f"⚠️ LLM backend unhealthy: {health_result.get('message')}")
+                            logger.warning(
+                                "daemon_warning",
+                                message=f"LLM backend unhealthy: {health_result.get('message')}",
+                            )
                             logger.warning(
                                 "llm_backend_unhealthy",
                                 message=health_result.get("message"),
@@ -1205,9 +1420,11 @@ class SpeekiumDaemon:
 
                             # Reload LLM backend
                             try:
-                                self._log("🔄 尝试重新加载 LLM 后端...")
+                                logger.info("daemon_processing", message="尝试重新加载 LLM 后端...")
                                 old_backend = self.assistant.llm_backend
                                 self.assistant.llm_backend = None
+                                if hasattr(old_backend, "close"):
+                                    old_backend.close()
 
                                 # Clear history to avoid stale context
                                 if hasattr(old_backend, "history"):
@@ -1218,22 +1435,30 @@ class SpeekiumDaemon:
 
                                 # Verify reload
                                 if self.assistant.llm_backend:
-                                    new_health = self.assistant.llm_backend.health_check()
+                                    new_health = await asyncio.to_thread(
+                                        self.assistant.llm_backend.health_check
+                                    )
                                     if new_health.get("healthy"):
-                                        self._log("✅ LLM 后端重新加载成功")
+                                        logger.info("daemon_success", message="LLM 后端重新加载成功")
                                         logger.info("llm_backend_reloaded_success")
                                     else:
-                                        self._log(f"⚠️ LLM 后端重新加载后仍不健康: {new_health.get('message')}")
+                                        logger.warning(
+                                            "daemon_warning",
+                                            message=f"LLM 后端重新加载后仍不健康: {new_health.get('message')}",
+                                        )
                                         logger.warning(
                                             "llm_backend_reload_partial",
                                             message=new_health.get("message"),
                                         )
                                 else:
-                                    self._log("❌ LLM 后端重新加载失败")
+                                    logger.error("daemon_error", message="LLM 后端重新加载失败")
                                     logger.error("llm_backend_reload_failed")
 
                             except Exception as reload_error:
-                                self._log(f"❌ LLM 后端重新加载异常: {reload_error}")
+                                logger.error(
+                                    "daemon_error",
+                                    message=f"LLM 后端重新加载异常: {reload_error}",
+                                )
                                 logger.error(
                                     "llm_backend_reload_error",
                                     error=str(reload_error),
@@ -1254,14 +1479,128 @@ class SpeekiumDaemon:
 
         logger.info("health_monitor_stopped")
 
+    async def _start_stdin_reader(self) -> None:
+        """Start feeding stdin lines to _on_command_line
+
+        stdin is registered with the event loop as a pipe; where that is not supported
+        (Windows, regular files) a daemon thread reads it instead.
+        """
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=STDIN_READ_LIMIT)
+        try:
+            await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        except (NotImplementedError, ValueError, OSError) as e:
+            logger.info("stdin_reader_thread_fallback", error=str(e))
+
+            def read_stdin():
+                for line in iter(sys.stdin.buffer.readline, b""):
+                    loop.call_soon_threadsafe(self._on_command_line, line)
+                loop.call_soon_threadsafe(self._on_command_line, None)
+
+            threading.Thread(target=read_stdin, name="stdin-reader", daemon=True).start()
+            return
+
+        self.stdin_task = asyncio.create_task(self._read_command_lines(reader))
+
+    async def _read_command_lines(self, reader: asyncio.StreamReader) -> None:
+        """Feed lines from reader to _on_command_line until EOF
+
+        A line longer than the reader's limit is answered with an error and dropped
+        up to its newline, so its tail is not parsed as another command.
+        """
+        while True:
+            try:
+                line = await reader.readuntil(b"\n")
+            except asyncio.IncompleteReadError as e:
+                line = e.partial  # EOF: a last line without newline is still a command
+            except asyncio.LimitOverrunError:
+                logger.warning("daemon_warning", message="命令过长，已丢弃")
+                write_line(LINE_TOO_LONG_REPLY)
+                await self._skip_line(reader)
+                continue
+
+            self._on_command_line(line or None)
+            if not line:
+                return
+
+    @staticmethod
+    async def _skip_line(reader: asyncio.StreamReader) -> None:
+        """Discard input up to and including the next newline (or EOF)"""
+        while True:
+            try:
+                await reader.readuntil(b"\n")
+                return
+            except asyncio.LimitOverrunError as e:
+                # readuntil leaves the data buffered; drop what it has scanned so far
+                await reader.readexactly(e.consumed)
+            except asyncio.IncompleteReadError:
+                return
+
+    def _on_command_line(self, line: Optional[bytes]) -> None:
+        """Parse one stdin line and dispatch or queue the command (runs on the loop thread)"""
+        if line is None:
+            # stdin closed: keep serving already queued commands until Rust stops the process
+            logger.info("daemon_log", message="📪 stdin 关闭，等待重新连接...")
+            return
+
+        line = line.strip()
+        if not line:
+            return
+
+        try:
+            command, args = parse_command_line(line)
+        except json.JSONDecodeError as e:
+            logger.warning("daemon_warning", message=f"JSON 解析错误: {e}")
+            write_line(INVALID_JSON_REPLY)
+            return
+        except ValueError as e:
+            logger.warning("daemon_warning", message=f"无效请求: {e}")
+            emit({"success": False, "error": f"Invalid request: {e}"})
+            return
+
+        logger.info("daemon_log", message=f"📥 收到命令: {command}")
+
+        if not isinstance(command, str) or command not in self.command_handlers:
+            # Unknown commands are answered right away instead of queueing behind a long command
+            self._spawn_command(self._run_command(command, args))
+        elif command in IMMEDIATE_COMMANDS:
+            self._spawn_command(self._run_command(command, args))
+        elif command in CONCURRENT_COMMANDS:
+            self._spawn_command(self._run_concurrent_command(command, args))
+        else:
+            self.command_queue.put_nowait((command, args))
+
+    def _spawn_command(self, coro) -> None:
+        """Run a command outside the serial queue"""
+        task = asyncio.create_task(coro)
+        # Keep a reference until done so the task is not garbage-collected mid-run
+        self.immediate_tasks.add(task)
+        task.add_done_callback(self.immediate_tasks.discard)
+
+    async def _run_concurrent_command(self, command: str, args: dict) -> None:
+        async with self.concurrent_semaphore:
+            await self._run_command(command, args)
+
+    async def _run_command(self, command: str, args: dict) -> None:
+        """Run one command and write its result to stdout"""
+        try:
+            result = await self.handle_command(command, args)
+        except Exception as e:
+            logger.exception("main_loop_error", error=str(e))
+            result = {"success": False, "error": f"Internal error: {str(e)}"}
+
+        # Note: streaming commands (chat_stream) return None because they already output directly
+        if result is not None:
+            emit(result)
+
     async def run_daemon(self):
         """Daemon main loop"""
         # Initialize
         if not await self.initialize():
-            self._log("❌ 初始化失败，退出")
+            logger.error("daemon_error", message="初始化失败，退出")
             return
 
-        self._log("✅ Daemon ready, waiting for commands...")
+        logger.info("daemon_success", message="Daemon ready, waiting for commands...")
         logger.info("daemon_success", message="Daemon ready, waiting for commands")
 
         # Start background health monitoring task
@@ -1270,59 +1609,21 @@ class SpeekiumDaemon:
             logger.info("health_monitor_task_started")
 
         # Send ready signal to stdout (Rust expects JSON with "event" field)
-        print(
-            json.dumps({"event": "daemon_success", "message": "就绪，守护进程已准备好接受命令"}),
-            flush=True,
-        )
+        emit({"event": "daemon_success", "message": "就绪，守护进程已准备好接受命令"})
 
-        # Main loop: listen for stdin commands
-        loop = asyncio.get_event_loop()
+        # Main loop: stdin is read continuously in the background so immediate commands
+        # (interrupt) and read-only queries are handled mid-command; everything else,
+        # including the streaming commands, runs in arrival order
+        self.command_queue = asyncio.Queue()
+        await self._start_stdin_reader()
 
         while self.running:
-            try:
-                # Read one line from stdin (blocking operation, must run in executor)
-                line = await loop.run_in_executor(None, sys.stdin.readline)
-
-                if not line:
-                    # stdin closed, wait and retry (don't exit - might be reopened)
-                    self._log("📪 stdin 关闭，等待重新连接...")
-                    await asyncio.sleep(1)
-                    continue
-
-                line = line.strip()
-                if not line:
-                    continue
-
-                # Parse JSON command
-                try:
-                    request = json.loads(line)
-                    command = request.get("command")
-                    args = request.get("args", {})
-
-                    self._log(f"📥 收到命令: {command}")
-
-                    # Handle command
-                    result = await self.handle_command(command, args)
-
-                    # Output result to stdout
-                    # Note: streaming commands (chat_stream) return None because they already output directly
-                    if result is not None:
-                        print(json.dumps(result), flush=True)
-
-                except json.JSONDecodeError as e:
-                    self._log(f"⚠️ JSON 解析错误: {e}")
-                    error_result = {"success": False, "error": f"Invalid JSON: {str(e)}"}
-                    print(json.dumps(error_result), flush=True)
-
-            except Exception as e:
-                self._log(f"❌ 主循环错误: {e}")
-                traceback.print_exc(file=sys.stderr)
-                error_result = {"success": False, "error": f"Internal error: {str(e)}"}
-                print(json.dumps(error_result), flush=True)
+            command, args = await self.command_queue.get()
+            await self._run_command(command, args)
 
         # Clean up resources before exit
         self._cleanup()
-        self._log("👋 守护进程正常退出")
+        logger.info("daemon_log", message="👋 守护进程正常退出")
 
 
 def main():
@@ -16,19 +16,19 @@ a = Analysis(
 )
 pyz = PYZ(a.pure)
 
+# onedir build: the onefile bootloader unpacks the whole bundle (torch, funasr, ...)
+# into a temp dir on every launch, which dominated daemon cold start.
+# tauri.conf.json bundles sidecar_dist/worker_daemon/ as a directory.
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='worker_daemon',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
     upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
     console=True,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -36,3 +36,12 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
 )
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=True,
+    upx_exclude=[],
+    name='worker_daemon',
+)